@@ -25,7 +25,8 @@ project_structure = {
         'tests': {
             'unit': {},
             'integration': {},
-            'e2e': {}
+            'e2e': {},
+            'benchmarks': {}
         },
         'templates': {},
         'config': {},
@@ -63,7 +64,13 @@ package_json = {
         "electron-pack": "electron-builder",
         "test": "jest",
         "test:watch": "jest --watch",
-        "test:coverage": "jest --coverage"
+        "test:coverage": "jest --coverage",
+        "bench:sqlite": "node tests/benchmarks/sqlite-insert.bench.js",
+        "bench:pdf": "node tests/benchmarks/pdf-ticket.bench.js",
+        "bench:qr": "node tests/benchmarks/qr-verify.bench.js",
+        "bench:qr-payload": "node tests/benchmarks/qr-payload.bench.js",
+        "bench:sqlite-profiles": "node tests/benchmarks/sqlite-profiles.bench.js",
+        "bench:redeem-stress": "node tests/benchmarks/redeem-stress.bench.js"
     },
     "dependencies": {
         "react": "^18.2.0",
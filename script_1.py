@@ -35,14 +35,45 @@ module.exports = {
   // Configuración de impresión
   PRINTER_CONFIG: {
     NAME: 'TM-T20II',
-    TIMEOUT: 30000
+    TIMEOUT: 30000,
+    BACKEND: 'pdf',       // 'pdf' (spooler del sistema) | 'escpos' (bytes directos)
+    DEVICE: null,         // Ruta del dispositivo ESC/POS, p. ej. /dev/usb/lp0
+    HOST: null,           // Impresora ESC/POS en red (tiene prioridad sobre DEVICE)
+    PORT: 9100,
+    LINE_WIDTH: 48,       // Caracteres por línea (80 mm, fuente A)
+    QR_MODULE_SIZE: 6,    // Puntos por módulo del QR (1-16)
+    QUEUE_MAX_DEPTH: 20,  // Trabajos sin imprimir antes de rechazar nuevos tickets
+    QUEUE_MAX_ATTEMPTS: 5,
+    QUEUE_RETRY_BASE_MS: 2000,
+    QUEUE_RETRY_MAX_MS: 60000
   },
 
   // Configuración de sincronización
   SYNC_CONFIG: {
     INTERVAL_MS: 5 * 60 * 1000, // 5 minutos
     RETRY_ATTEMPTS: 3,
-    RETRY_DELAY_MS: 5000
+    RETRY_DELAY_MS: 5000,
+    PAGE_SIZE: 200,   // Tickets leídos de SQLite por página
+    BATCH_SIZE: 10,   // Tickets por upsert a Supabase
+    CONCURRENCY: 3,   // Lotes enviados en paralelo
+    PULL_INTERVAL_MS: 30 * 1000,  // Descarga de tickets de otras estaciones
+    PULL_PAGE_SIZE: 500,
+    PULL_OVERLAP_MS: 60 * 1000    // Relectura al iniciar cada pasada (commits tardíos en el servidor)
+  },
+
+  // Archivo de tickets cerrados (tabla tickets pequeña en tablets con poca memoria)
+  ARCHIVE_CONFIG: {
+    AFTER_DAYS: 7,                 // Días sin cambios (tras canje/anulación y sincronización)
+    CHUNK_SIZE: 500,               // Tickets movidos por llamada
+    INTERVAL_MS: 60 * 60 * 1000    // 1 hora
+  },
+
+  // Canje coordinado con el servidor central (varias cajas)
+  REDEMPTION_CONFIG: {
+    TIMEOUT_MS: 2000,        // Espera máxima del canje central antes de aplicar la política sin conexión
+    LEASE_MS: 30 * 1000,     // Vida de la decisión central en caché local
+    OFFLINE_POLICY: 'deny',  // 'deny' (no pagar) | 'local' (pagar con el canje local, admite pagos dobles)
+    OFFLINE_MAX_VALOR: null  // Con 'local': valor máximo pagable sin conexión (null = sin límite)
   }
 };
 '''
@@ -91,6 +122,36 @@ module.exports = {};
 with open('tito-casino-system/src/shared/types.js', 'w') as f:
     f.write(types_js)
 
+# Formatos de QR compartidos (proceso principal y renderer)
+qr_format_js = '''// src/shared/qr-format.js
+// Códigos QR TITO que se aceptan como escaneo completo. Lo usan el lector HID
+// (proceso principal) y el input de la caja en modo teclado (renderer).
+
+// Compacto: 'TC' + versión + 33 caracteres base45 (ver utils/qr-generator)
+const COMPACT_QR_PATTERN = /^TC1[0-9A-Z $%*+.\\/:-]{33}$/;
+
+// Legacy: id|valor|moneda|fecha ISO|hash (16 hex)
+const LEGACY_QR_PATTERN = /^T[A-Z0-9]+\\|[0-9.]+\\|[A-Z]{3}\\|[0-9TZ:.-]+\\|[a-f0-9]{16}$/;
+
+/**
+ * Indica si un texto es un código QR TITO completo (compacto o legacy)
+ * @param {string} data - Texto escaneado
+ * @returns {boolean} True si tiene alguno de los dos formatos
+ */
+function isTitoQrString(data) {
+  return COMPACT_QR_PATTERN.test(data) || LEGACY_QR_PATTERN.test(data);
+}
+
+module.exports = {
+  COMPACT_QR_PATTERN,
+  LEGACY_QR_PATTERN,
+  isTitoQrString
+};
+'''
+
+with open('tito-casino-system/src/shared/qr-format.js', 'w') as f:
+    f.write(qr_format_js)
+
 # Crear archivo de configuración de entorno
 env_example = '''# .env.example
 # Configuración de Supabase
@@ -99,15 +160,37 @@ SUPABASE_ANON_KEY=your-anon-key
 
 # Clave secreta para hash de QR
 QR_SECRET=your-secret-key-for-qr-hashing
+# Formato del QR emitido: compact (TC1 + base45) | legacy (id|valor|moneda|fecha|hash)
+QR_FORMAT=compact
 
 # Entorno
 NODE_ENV=development
 
 # Configuración de impresora
 PRINTER_NAME=TM-T20II
+# pdf (spooler del sistema) | escpos (bytes directos a PRINTER_DEVICE o PRINTER_HOST:PRINTER_PORT)
+PRINTER_BACKEND=pdf
+PRINTER_DEVICE=/dev/usb/lp0
+# PRINTER_HOST=192.168.1.50
+# PRINTER_PORT=9100
 
 # Configuración de base de datos local
 SQLITE_DB_PATH=./data/tito.db
+# Perfil de almacenamiento: durable (synchronous=FULL) | balanced | fast-read
+SQLITE_PROFILE=durable
+# Archivo de tickets cerrados (por defecto: <SQLITE_DB_PATH>-archive.db)
+# SQLITE_ARCHIVE_PATH=./data/tito-archive.db
+
+# Identificador único de este equipo (entero 0-1023). Obligatorio para emitir:
+# forma parte del número de ticket. También identifica los canjes de esta caja
+# (sin él, el canje coordinado usa el nombre del equipo)
+# STATION_ID=1
+
+# Canje coordinado entre cajas
+# Sin conexión con Supabase: deny (no pagar) | local (pagar solo con la base local)
+REDEMPTION_OFFLINE_POLICY=deny
+# Con la política local, valor máximo pagable sin conexión
+# REDEMPTION_OFFLINE_MAX_VALOR=500
 '''
 
 with open('tito-casino-system/.env.example', 'w') as f:
@@ -9,6 +9,13 @@ const { createClient } = require('@supabase/supabase-js');
  */
 class SupabaseSync {
   constructor() {
+    // Configuración de reintentos
+    this.retryConfig = {
+      maxRetries: 3,
+      retryDelay: 2000,
+      backoffMultiplier: 2
+    };
+
     // Configuración de Supabase
     this.supabaseUrl = process.env.SUPABASE_URL;
     this.supabaseKey = process.env.SUPABASE_ANON_KEY;
@@ -26,13 +33,6 @@ class SupabaseSync {
       console.error('Error inicializando Supabase:', error.message);
       this.supabase = null;
     }
-    
-    // Configuración de reintentos
-    this.retryConfig = {
-      maxRetries: 3,
-      retryDelay: 2000,
-      backoffMultiplier: 2
-    };
   }
 
   /**
@@ -76,15 +76,16 @@ class SupabaseSync {
   /**
    * Sincroniza tickets locales con Supabase
    * @param {Array} tickets - Lista de tickets a sincronizar
-   * @returns {Promise<Object>} Resultado de la sincronización
+   * @param {Object} options - { batchSize, concurrency }
+   * @returns {Promise<Object>} Resultado con IDs exitosos (syncedIds) y fallidos (failedIds)
    */
-  async syncTickets(tickets) {
+  async syncTickets(tickets, options = {}) {
     if (!this.isAvailable()) {
       throw new Error('Supabase no está disponible');
     }
 
     if (!Array.isArray(tickets) || tickets.length === 0) {
-      return { synced: 0, errors: [] };
+      return { synced: 0, errors: [], total: 0, syncedIds: [], failedIds: [] };
     }
 
     console.log(`Iniciando sincronización de ${tickets.length} tickets...`);
@@ -92,27 +93,44 @@ class SupabaseSync {
     const results = {
       synced: 0,
       errors: [],
-      total: tickets.length
+      total: tickets.length,
+      syncedIds: [],
+      failedIds: []
     };
 
     // Procesar tickets en lotes para evitar timeouts
-    const batchSize = 10;
+    const batchSize = options.batchSize || 10;
+    const concurrency = options.concurrency || 1;
+    const batches = [];
     for (let i = 0; i < tickets.length; i += batchSize) {
-      const batch = tickets.slice(i, i + batchSize);
-      
-      try {
-        await this.syncTicketBatch(batch);
-        results.synced += batch.length;
+      batches.push(tickets.slice(i, i + batchSize));
+    }
+
+    let next = 0;
+    const worker = async () => {
+      while (next < batches.length) {
+        const batchNumber = next + 1;
+        const batch = batches[next++];
+        const ids = batch.map(t => t.id);
         
-      } catch (error) {
-        console.error(`Error sincronizando lote ${i / batchSize + 1}:`, error.message);
-        results.errors.push({
-          batch: i / batchSize + 1,
-          error: error.message,
-          tickets: batch.map(t => t.ticket_number)
-        });
+        try {
+          await this.executeWithRetry(() => this.syncTicketBatch(batch));
+          results.syncedIds.push(...ids);
+          
+        } catch (error) {
+          console.error(`Error sincronizando lote ${batchNumber}:`, error.message);
+          results.failedIds.push(...ids);
+          results.errors.push({
+            batch: batchNumber,
+            error: error.message,
+            tickets: batch.map(t => t.ticket_number)
+          });
+        }
       }
-    }
+    };
+
+    await Promise.all(Array.from({ length: Math.min(concurrency, batches.length) }, worker));
+    results.synced = results.syncedIds.length;
 
     console.log(`Sincronización completada: ${results.synced}/${results.total} tickets`);
     return results;
@@ -124,7 +142,29 @@ class SupabaseSync {
    * @returns {Promise<void>}
    */
   async syncTicketBatch(ticketBatch) {
-    const ticketsToSync = ticketBatch.map(ticket => ({
+    const ticketsToSync = ticketBatch.map(ticket => this.toRemoteTicket(ticket));
+
+    const { data, error } = await this.supabase
+      .from('tickets')
+      .upsert(ticketsToSync, { 
+        onConflict: 'ticket_number',
+        ignoreDuplicates: false 
+      });
+
+    if (error) {
+      throw new Error(`Error en upsert: ${error.message}`);
+    }
+
+    return data;
+  }
+
+  /**
+   * Columnas de un ticket local que se guardan en Supabase
+   * @param {Object} ticket - Ticket de SQLite
+   * @returns {Object} Fila para la tabla tickets remota
+   */
+  toRemoteTicket(ticket) {
+    return {
       ticket_number: ticket.ticket_number,
       valor: ticket.valor,
       moneda: ticket.moneda,
@@ -136,20 +176,92 @@ class SupabaseSync {
       usuario_emision: ticket.usuario_emision,
       usuario_canje: ticket.usuario_canje,
       hash_seguridad: ticket.hash_seguridad
-    }));
+    };
+  }
+
+  /**
+   * Canjea un ticket en la tabla central con un compare-and-set: solo una
+   * estación obtiene la fila. Usa la función RPC redeem_ticket (una sola
+   * petición, crea la fila si el ticket aún no se sincronizó) y, si no está
+   * instalada, una actualización condicional seguida de un INSERT.
+   * Repetir la llamada con el mismo redemptionId devuelve la fila otra vez
+   * (reintento de un canje cuya respuesta se perdió).
+   * @param {Object} ticket - Ticket local (estado 'emitido')
+   * @param {string} usuarioCanje - Usuario que canjea
+   * @param {string} redemptionId - Identificador del canje (estación + ticket)
+   * @returns {Promise<Object|null>} Fila canjeada, o null si ya estaba cerrada
+   */
+  async redeemTicket(ticket, usuarioCanje, redemptionId) {
+    if (!this.isAvailable()) {
+      throw new Error('Supabase no está disponible');
+    }
+
+    if (this.redeemRpcAvailable !== false) {
+      const { data, error } = await this.supabase.rpc('redeem_ticket', {
+        p_ticket: this.toRemoteTicket(ticket),
+        p_usuario_canje: usuarioCanje,
+        p_redemption_id: redemptionId
+      });
+
+      if (!error) {
+        this.redeemRpcAvailable = true;
+        return (data && data[0]) || null;
+      }
+
+      if (!this.isMissingFunctionError(error)) {
+        throw error;
+      }
+
+      console.warn('RPC redeem_ticket no disponible, usando actualización condicional');
+      this.redeemRpcAvailable = false;
+    }
+
+    return this.redeemTicketConditional(ticket, usuarioCanje, redemptionId);
+  }
+
+  /**
+   * Canje central sin la función RPC: PATCH condicional sobre la fila y,
+   * si el ticket no existe en el servidor, INSERT ya canjeado. La clave única
+   * de ticket_number hace del INSERT otro compare-and-set (23505 si otra
+   * estación lo creó antes).
+   * @returns {Promise<Object|null>} Fila canjeada, o null si ya estaba cerrada
+   */
+  async redeemTicketConditional(ticket, usuarioCanje, redemptionId) {
+    const redemption = {
+      estado: 'canjeado',
+      fecha_canje: new Date().toISOString(),
+      usuario_canje: usuarioCanje,
+      redemption_id: redemptionId
+    };
 
     const { data, error } = await this.supabase
       .from('tickets')
-      .upsert(ticketsToSync, { 
-        onConflict: 'ticket_number',
-        ignoreDuplicates: false 
-      });
+      .update(redemption)
+      .eq('ticket_number', ticket.ticket_number)
+      .or(`estado.eq.emitido,redemption_id.eq."${redemptionId}"`)
+      .select();
 
     if (error) {
-      throw new Error(`Error en upsert: ${error.message}`);
+      throw error;
     }
 
-    return data;
+    if (data && data.length > 0) {
+      return data[0];
+    }
+
+    const { data: inserted, error: insertError } = await this.supabase
+      .from('tickets')
+      .insert({ ...this.toRemoteTicket(ticket), ...redemption })
+      .select();
+
+    if (insertError) {
+      if (insertError.code === '23505') {
+        return null;
+      }
+      throw insertError;
+    }
+
+    return inserted[0];
   }
 
   /**
@@ -182,7 +294,9 @@ class SupabaseSync {
   }
 
   /**
-   * Obtiene estadísticas de tickets desde Supabase
+   * Obtiene estadísticas de tickets desde Supabase.
+   * Usa la función RPC ticket_stats (agregación en el servidor) y, si no está
+   * instalada, agrega en el cliente recorriendo los tickets por páginas.
    * @param {string} dateFrom - Fecha desde
    * @param {string} dateTo - Fecha hasta
    * @returns {Promise<Object>} Estadísticas calculadas
@@ -192,10 +306,63 @@ class SupabaseSync {
       throw new Error('Supabase no está disponible');
     }
 
+    const hasRange = !!(dateFrom && dateTo);
+
     try {
+      if (this.statsRpcAvailable !== false) {
+        const { data, error } = await this.supabase.rpc('ticket_stats', {
+          date_from: hasRange ? dateFrom : null,
+          date_to: hasRange ? dateTo : null
+        });
+
+        if (!error) {
+          this.statsRpcAvailable = true;
+          return this.calculateStatsFromGroups(data || []);
+        }
+
+        if (!this.isMissingFunctionError(error)) {
+          throw error;
+        }
+
+        console.warn('RPC ticket_stats no disponible, usando agregación paginada');
+        this.statsRpcAvailable = false;
+      }
+
+      return await this.aggregateStatsPaginated(hasRange ? dateFrom : null, hasRange ? dateTo : null);
+
+    } catch (error) {
+      console.error('Error obteniendo estadísticas desde Supabase:', error.message);
+      throw error;
+    }
+  }
+
+  /**
+   * Indica si un error de PostgREST corresponde a una función RPC inexistente
+   * @param {Object} error - Error devuelto por supabase-js
+   * @returns {boolean} True si la función no existe
+   */
+  isMissingFunctionError(error) {
+    return error.code === 'PGRST202' || error.code === '42883';
+  }
+
+  /**
+   * Agrega estadísticas recorriendo los tickets por páginas (keyset por id),
+   * sin mantener en memoria más de una página
+   * @param {string|null} dateFrom - Fecha desde
+   * @param {string|null} dateTo - Fecha hasta
+   * @param {number} pageSize - Tickets por página
+   * @returns {Promise<Object>} Estadísticas calculadas
+   */
+  async aggregateStatsPaginated(dateFrom, dateTo, pageSize = 1000) {
+    const stats = this.createEmptyStats();
+    let lastId = null;
+
+    while (true) {
       let query = this.supabase
         .from('tickets')
-        .select('valor, moneda, estado, fecha_emision');
+        .select('id, valor, moneda, estado')
+        .order('id', { ascending: true })
+        .limit(pageSize);
 
       if (dateFrom && dateTo) {
         query = query
@@ -203,28 +370,37 @@ class SupabaseSync {
           .lte('fecha_emision', dateTo);
       }
 
+      if (lastId !== null) {
+        query = query.gt('id', lastId);
+      }
+
       const { data, error } = await query;
 
       if (error) {
         throw error;
       }
 
-      return this.calculateStats(data);
+      // Terminar solo con una página vacía: el servidor puede limitar filas por debajo de pageSize
+      if (!data || data.length === 0) {
+        break;
+      }
 
-    } catch (error) {
-      console.error('Error obteniendo estadísticas desde Supabase:', error.message);
-      throw error;
+      data.forEach(ticket => {
+        this.accumulateStats(stats, ticket.estado, ticket.moneda, 1, ticket.valor);
+      });
+      lastId = data[data.length - 1].id;
     }
+
+    return stats;
   }
 
   /**
-   * Calcula estadísticas de tickets
-   * @param {Array} tickets - Lista de tickets
-   * @returns {Object} Estadísticas calculadas
+   * Crea un objeto de estadísticas vacío
+   * @returns {Object} Estadísticas en cero
    */
-  calculateStats(tickets) {
-    const stats = {
-      total_tickets: tickets.length,
+  createEmptyStats() {
+    return {
+      total_tickets: 0,
       total_emitidos: 0,
       total_canjeados: 0,
       total_anulados: 0,
@@ -235,56 +411,113 @@ class SupabaseSync {
       valor_pendiente_dop: 0,
       valor_pendiente_usd: 0
     };
+  }
 
-    tickets.forEach(ticket => {
-      const { estado, moneda, valor } = ticket;
-
-      // Contadores por estado
-      switch (estado) {
-        case 'emitido':
-          stats.total_emitidos++;
-          if (moneda === 'DOP') {
-            stats.valor_pendiente_dop += valor;
-          } else {
-            stats.valor_pendiente_usd += valor;
-          }
-          break;
-        case 'canjeado':
-          stats.total_canjeados++;
-          if (moneda === 'DOP') {
-            stats.valor_canjeado_dop += valor;
-          } else {
-            stats.valor_canjeado_usd += valor;
-          }
-          break;
-        case 'anulado':
-          stats.total_anulados++;
-          break;
-      }
+  /**
+   * Suma un grupo (estado, moneda) a las estadísticas
+   * @param {Object} stats - Estadísticas acumuladas
+   * @param {string} estado - Estado del grupo
+   * @param {string} moneda - Moneda del grupo
+   * @param {number} count - Cantidad de tickets
+   * @param {number} total - Suma de valores
+   */
+  accumulateStats(stats, estado, moneda, count, total) {
+    stats.total_tickets += count;
 
-      // Valor total por moneda
-      if (moneda === 'DOP') {
-        stats.valor_total_dop += valor;
-      } else {
-        stats.valor_total_usd += valor;
-      }
+    // Contadores por estado
+    switch (estado) {
+      case 'emitido':
+        stats.total_emitidos += count;
+        if (moneda === 'DOP') {
+          stats.valor_pendiente_dop += total;
+        } else {
+          stats.valor_pendiente_usd += total;
+        }
+        break;
+      case 'canjeado':
+        stats.total_canjeados += count;
+        if (moneda === 'DOP') {
+          stats.valor_canjeado_dop += total;
+        } else {
+          stats.valor_canjeado_usd += total;
+        }
+        break;
+      case 'anulado':
+        stats.total_anulados += count;
+        break;
+    }
+
+    // Valor total por moneda
+    if (moneda === 'DOP') {
+      stats.valor_total_dop += total;
+    } else {
+      stats.valor_total_usd += total;
+    }
+  }
+
+  /**
+   * Calcula estadísticas a partir de filas agregadas por la RPC ticket_stats
+   * @param {Array} groups - Filas { estado, moneda, cantidad, total }
+   * @returns {Object} Estadísticas calculadas
+   */
+  calculateStatsFromGroups(groups) {
+    const stats = this.createEmptyStats();
+
+    groups.forEach(group => {
+      this.accumulateStats(stats, group.estado, group.moneda, Number(group.cantidad), Number(group.total));
+    });
+
+    return stats;
+  }
+
+  /**
+   * Calcula estadísticas de tickets
+   * @param {Array} tickets - Lista de tickets
+   * @returns {Object} Estadísticas calculadas
+   */
+  calculateStats(tickets) {
+    const stats = this.createEmptyStats();
+
+    tickets.forEach(ticket => {
+      this.accumulateStats(stats, ticket.estado, ticket.moneda, 1, ticket.valor);
     });
 
     return stats;
   }
 
   /**
-   * Obtiene tickets por rango de fechas desde Supabase
+   * Obtiene tickets por rango de fechas desde Supabase.
+   * Recorre todas las páginas, por lo que no se trunca al límite de filas del servidor.
    * @param {string} dateFrom - Fecha desde
    * @param {string} dateTo - Fecha hasta
    * @param {string} estado - Estado específico (opcional)
    * @returns {Promise<Array>} Lista de tickets
    */
   async getTicketsByDateRange(dateFrom, dateTo, estado = null) {
+    const tickets = [];
+
+    for await (const page of this.iterateTicketsByDateRange(dateFrom, dateTo, { estado, order: 'desc' })) {
+      tickets.push(...page);
+    }
+
+    return tickets;
+  }
+
+  /**
+   * Obtiene una página de tickets por rango de fechas (keyset por fecha_emision, id)
+   * @param {string} dateFrom - Fecha desde
+   * @param {string} dateTo - Fecha hasta
+   * @param {Object} options - { estado, cursor, pageSize, order: 'asc'|'desc' }
+   * @returns {Promise<Array>} Tickets de la página (vacía al terminar)
+   */
+  async getTicketsPageByDateRange(dateFrom, dateTo, options = {}) {
     if (!this.isAvailable()) {
       throw new Error('Supabase no está disponible');
     }
 
+    const { estado = null, cursor = null, pageSize = 1000, order = 'asc' } = options;
+    const ascending = order !== 'desc';
+
     try {
       let query = this.supabase
         .from('tickets')
@@ -296,9 +529,16 @@ class SupabaseSync {
         query = query.eq('estado', estado);
       }
 
-      query = query.order('fecha_emision', { ascending: false });
+      if (cursor) {
+        const op = ascending ? 'gt' : 'lt';
+        const fecha = `"${cursor.fecha_emision}"`;
+        query = query.or(`fecha_emision.${op}.${fecha},and(fecha_emision.eq.${fecha},id.${op}.${cursor.id})`);
+      }
 
-      const { data, error } = await query;
+      const { data, error } = await query
+        .order('fecha_emision', { ascending })
+        .order('id', { ascending })
+        .limit(pageSize);
 
       if (error) {
         throw error;
@@ -312,6 +552,69 @@ class SupabaseSync {
     }
   }
 
+  /**
+   * Obtiene tickets modificados después de un cursor (descarga incremental)
+   * @param {Object|null} cursor - Último { updated_at, id } aplicado
+   * @param {number} pageSize - Tamaño máximo de la página
+   * @returns {Promise<Array>} Tickets ordenados por (updated_at, id)
+   */
+  async getTicketsChangedSince(cursor = null, pageSize = 500) {
+    if (!this.isAvailable()) {
+      throw new Error('Supabase no está disponible');
+    }
+
+    try {
+      let query = this.supabase
+        .from('tickets')
+        .select('*');
+
+      if (cursor) {
+        const updatedAt = `"${cursor.updated_at}"`;
+        query = query.or(`updated_at.gt.${updatedAt},and(updated_at.eq.${updatedAt},id.gt.${cursor.id})`);
+      }
+
+      const { data, error } = await query
+        .order('updated_at', { ascending: true })
+        .order('id', { ascending: true })
+        .limit(pageSize);
+
+      if (error) {
+        throw error;
+      }
+
+      return data || [];
+
+    } catch (error) {
+      console.error('Error descargando tickets modificados:', error.message);
+      throw error;
+    }
+  }
+
+  /**
+   * Recorre tickets por rango de fechas página por página.
+   * Termina con la primera página vacía, así que un límite de filas del
+   * servidor menor que pageSize no deja el resultado incompleto.
+   * @param {string} dateFrom - Fecha desde
+   * @param {string} dateTo - Fecha hasta
+   * @param {Object} options - { estado, pageSize, order }
+   * @returns {AsyncGenerator<Array>} Páginas de tickets
+   */
+  async *iterateTicketsByDateRange(dateFrom, dateTo, options = {}) {
+    let cursor = null;
+
+    while (true) {
+      const page = await this.getTicketsPageByDateRange(dateFrom, dateTo, { ...options, cursor });
+      if (page.length === 0) {
+        break;
+      }
+
+      yield page;
+
+      const last = page[page.length - 1];
+      cursor = { fecha_emision: last.fecha_emision, id: last.id };
+    }
+  }
+
   /**
    * Ejecuta sincronización con reintentos
    * @param {Function} operation - Operación a ejecutar
@@ -374,4 +677,1473 @@ module.exports = SupabaseSync;
 with open('tito-casino-system/src/main/database/supabase.js', 'w') as f:
     f.write(supabase_service_js)
 
+# Motor de sincronización incremental por páginas
+sync_engine_js = '''// src/main/database/sync-engine.js
+const { SYNC_CONFIG } = require('../../shared/constants');
+
+const CURSOR_KEY = 'push_tickets_cursor';
+
+/**
+ * Motor de sincronización incremental SQLite -> Supabase.
+ * Lee tickets no sincronizados por páginas a partir de un cursor persistente
+ * (updated_at, id), envía lotes acotados en paralelo y confirma cada página
+ * de forma atómica, de modo que la memoria no depende del tamaño del backlog
+ * y una caída retoma desde la última página confirmada.
+ */
+class SyncEngine {
+  constructor(db, supabaseSync, options = {}) {
+    this.db = db;
+    this.supabaseSync = supabaseSync;
+    this.pageSize = options.pageSize || SYNC_CONFIG.PAGE_SIZE;
+    this.batchSize = options.batchSize || SYNC_CONFIG.BATCH_SIZE;
+    this.concurrency = options.concurrency || SYNC_CONFIG.CONCURRENCY;
+    this.cursorKey = options.cursorKey || CURSOR_KEY;
+    this.currentRun = null;
+  }
+
+  /**
+   * Ejecuta una pasada completa de sincronización.
+   * Si ya hay una pasada en curso, devuelve la misma promesa.
+   * @returns {Promise<Object>} { synced, failed, pages }
+   */
+  run() {
+    if (!this.currentRun) {
+      this.currentRun = this.runPass().finally(() => {
+        this.currentRun = null;
+      });
+    }
+    return this.currentRun;
+  }
+
+  /**
+   * Recorre el backlog página por página desde el cursor persistido
+   * @returns {Promise<Object>} Resumen de la pasada
+   */
+  async runPass() {
+    const summary = { synced: 0, failed: 0, pages: 0 };
+    let cursor = await this.db.getSyncState(this.cursorKey);
+
+    while (true) {
+      const page = await this.db.getUnsyncedTicketsPage(cursor, this.pageSize);
+      if (page.length === 0) {
+        break;
+      }
+
+      const { syncedIds, failedIds } = await this.pushPage(page);
+      const last = page[page.length - 1];
+      cursor = { updated_at: last.updated_at, id: last.id };
+
+      // Marcar la página y avanzar el cursor en una sola transacción. Se envían las
+      // filas tal como se leyeron: las que cambiaron durante el envío quedan pendientes
+      const synced = new Set(syncedIds);
+      summary.synced += await this.db.commitSyncPage(page.filter(ticket => synced.has(ticket.id)), this.cursorKey, cursor);
+      summary.failed += failedIds.length;
+      summary.pages++;
+
+      if (page.length < this.pageSize) {
+        break;
+      }
+    }
+
+    // Pasada completa: reiniciar cursor para reintentar los fallidos en el próximo ciclo
+    await this.db.setSyncState(this.cursorKey, null);
+
+    return summary;
+  }
+
+  /**
+   * Envía una página a Supabase en lotes paralelos acotados
+   * @param {Array} page - Tickets de la página
+   * @returns {Promise<Object>} { syncedIds, failedIds }
+   */
+  async pushPage(page) {
+    const { syncedIds, failedIds } = await this.supabaseSync.syncTickets(page, {
+      batchSize: this.batchSize,
+      concurrency: this.concurrency
+    });
+
+    return { syncedIds, failedIds };
+  }
+}
+
+module.exports = SyncEngine;
+'''
+
+with open('tito-casino-system/src/main/database/sync-engine.js', 'w') as f:
+    f.write(sync_engine_js)
+
+# Descarga incremental Supabase -> SQLite
+pull_engine_js = '''// src/main/database/pull-engine.js
+const { SYNC_CONFIG } = require('../../shared/constants');
+
+const CURSOR_KEY = 'pull_tickets_cursor';
+const MIN_UUID = '00000000-0000-0000-0000-000000000000';
+
+/**
+ * Motor de descarga incremental Supabase -> SQLite.
+ * Trae los tickets modificados desde el cursor persistente (updated_at, id)
+ * por páginas y aplica cada página junto con el cursor en una transacción,
+ * de modo que la Caja valida tickets de otras estaciones sin ir a la red.
+ */
+class PullEngine {
+  /**
+   * @param {SQLiteDB} db - Base de datos local
+   * @param {SupabaseSync} supabaseSync - Cliente de Supabase
+   * @param {Object} options - { pageSize, overlapMs, cursorKey, onChanges }
+   */
+  constructor(db, supabaseSync, options = {}) {
+    this.db = db;
+    this.supabaseSync = supabaseSync;
+    this.pageSize = options.pageSize || SYNC_CONFIG.PULL_PAGE_SIZE;
+    this.overlapMs = options.overlapMs !== undefined ? options.overlapMs : SYNC_CONFIG.PULL_OVERLAP_MS;
+    this.cursorKey = options.cursorKey || CURSOR_KEY;
+    this.onChanges = options.onChanges || null;
+    this.currentRun = null;
+  }
+
+  /**
+   * Ejecuta una pasada de descarga.
+   * Si ya hay una pasada en curso, devuelve la misma promesa.
+   * @returns {Promise<Object>} { pulled, applied, pages }
+   */
+  run() {
+    if (!this.currentRun) {
+      this.currentRun = this.runPass().finally(() => {
+        this.currentRun = null;
+      });
+    }
+    return this.currentRun;
+  }
+
+  /**
+   * Descarga páginas hasta recibir una vacía (un límite de filas del servidor
+   * menor que pageSize no corta la pasada)
+   * @returns {Promise<Object>} Resumen de la pasada
+   */
+  async runPass() {
+    const summary = { pulled: 0, applied: 0, pages: 0 };
+    let cursor = this.rewind(await this.db.getSyncState(this.cursorKey));
+
+    while (true) {
+      const page = await this.supabaseSync.getTicketsChangedSince(cursor, this.pageSize);
+      if (page.length === 0) {
+        break;
+      }
+
+      const last = page[page.length - 1];
+      cursor = { updated_at: last.updated_at, id: last.id };
+
+      // Página y cursor en una sola transacción
+      const changes = await this.db.applyRemoteTicketsPage(page, this.cursorKey, cursor);
+      if (this.onChanges && changes.length > 0) {
+        this.onChanges(changes);
+      }
+
+      summary.pulled += page.length;
+      summary.applied += changes.length;
+      summary.pages++;
+    }
+
+    return summary;
+  }
+
+  /**
+   * Retrocede el cursor overlapMs: una fila confirmada tarde en el servidor puede
+   * tener updated_at anterior al último visto. Reaplicar una fila no tiene efecto.
+   * @param {Object|null} cursor - Cursor persistido
+   * @returns {Object|null} Cursor de inicio de la pasada
+   */
+  rewind(cursor) {
+    if (!cursor || !this.overlapMs) {
+      return cursor;
+    }
+
+    const updatedAt = Date.parse(cursor.updated_at);
+    if (Number.isNaN(updatedAt)) {
+      return cursor;
+    }
+
+    return { updated_at: new Date(updatedAt - this.overlapMs).toISOString(), id: MIN_UUID };
+  }
+}
+
+module.exports = PullEngine;
+'''
+
+with open('tito-casino-system/src/main/database/pull-engine.js', 'w') as f:
+    f.write(pull_engine_js)
+
+# Test del motor de sincronización
+sync_engine_test = '''// tests/unit/sync-engine.test.js
+const SQLiteDB = require('../../src/main/database/sqlite');
+const SupabaseSync = require('../../src/main/database/supabase');
+const SyncEngine = require('../../src/main/database/sync-engine');
+
+describe('SyncEngine', () => {
+  let db;
+  let supabaseSync;
+
+  beforeEach(async () => {
+    db = new SQLiteDB(':memory:');
+    
+    for (let i = 1; i <= 25; i++) {
+      await db.createTicket({
+        ticket_number: `TS${String(i).padStart(3, '0')}`,
+        valor: i,
+        moneda: 'DOP',
+        qr_data: `qr-${i}`
+      });
+    }
+
+    // Cliente real con el upsert sustituido y sin esperas entre reintentos
+    supabaseSync = new SupabaseSync();
+    supabaseSync.supabase = {};
+    supabaseSync.retryConfig.maxRetries = 1;
+    supabaseSync.syncTicketBatch = jest.fn().mockResolvedValue([]);
+  });
+
+  afterEach(() => {
+    db.close();
+  });
+
+  test('should sync the whole backlog in bounded pages and batches', async () => {
+    const engine = new SyncEngine(db, supabaseSync, { pageSize: 10, batchSize: 4, concurrency: 2 });
+    
+    const result = await engine.run();
+    
+    expect(result).toEqual({ synced: 25, failed: 0, pages: 3 });
+    expect(db.getUnsyncedTickets()).toHaveLength(0);
+    
+    const batchSizes = supabaseSync.syncTicketBatch.mock.calls.map(([batch]) => batch.length);
+    expect(Math.max(...batchSizes)).toBeLessThanOrEqual(4);
+  });
+
+  test('should leave failed batches unsynced and retry them next pass', async () => {
+    supabaseSync.syncTicketBatch.mockImplementation(async (batch) => {
+      if (batch.some(ticket => ticket.ticket_number === 'TS007')) {
+        throw new Error('network down');
+      }
+      return [];
+    });
+
+    const engine = new SyncEngine(db, supabaseSync, { pageSize: 10, batchSize: 5, concurrency: 2 });
+    const result = await engine.run();
+    
+    expect(result.failed).toBe(5);
+    expect(db.getUnsyncedTickets().map(t => t.ticket_number)).toContain('TS007');
+    expect(db.getSyncState('push_tickets_cursor')).toBeNull();
+    
+    supabaseSync.syncTicketBatch.mockResolvedValue([]);
+    const retry = await engine.run();
+    expect(retry.synced).toBe(5);
+    expect(db.getUnsyncedTickets()).toHaveLength(0);
+  });
+
+  test('should report exactly which tickets failed when a middle batch fails', async () => {
+    supabaseSync.syncTicketBatch.mockImplementation(async (batch) => {
+      if (batch[0].ticket_number === 'TS011') {
+        throw new Error('timeout');
+      }
+      return [];
+    });
+
+    const tickets = db.getUnsyncedTickets();
+    const result = await supabaseSync.syncTickets(tickets, { batchSize: 5, concurrency: 3 });
+    
+    const failedNumbers = tickets
+      .filter(t => result.failedIds.includes(t.id))
+      .map(t => t.ticket_number);
+    expect(failedNumbers).toEqual(['TS011', 'TS012', 'TS013', 'TS014', 'TS015']);
+    expect(result.synced).toBe(20);
+    expect(result.syncedIds).toHaveLength(20);
+    
+    expect(db.markAsSynced(result.syncedIds)).toBe(20);
+    expect(db.getUnsyncedTickets().map(t => t.ticket_number)).toEqual(failedNumbers);
+  });
+
+  test('should keep a ticket unsynced when it changes while its page is pushed', async () => {
+    let redeemed = false;
+    supabaseSync.syncTicketBatch.mockImplementation(async (batch) => {
+      // Canje en caja mientras se sube la emisión
+      if (!redeemed && batch.some(ticket => ticket.ticket_number === 'TS003')) {
+        redeemed = true;
+        db.updateTicketStatus('TS003', 'canjeado', 'Caja1');
+      }
+      return [];
+    });
+
+    // Una sola página: el ticket no se vuelve a leer en la misma pasada
+    const engine = new SyncEngine(db, supabaseSync, { pageSize: 30, batchSize: 5 });
+    const result = await engine.run();
+
+    // Se informa solo lo marcado: TS003 se subió pero sigue pendiente
+    expect(result.synced).toBe(24);
+    expect(db.getUnsyncedTickets()).toEqual([expect.objectContaining({ ticket_number: 'TS003', estado: 'canjeado' })]);
+
+    await engine.run();
+    const pushed = supabaseSync.syncTicketBatch.mock.calls.flatMap(([batch]) => batch);
+    expect(pushed.filter(t => t.ticket_number === 'TS003').map(t => t.estado)).toEqual(['emitido', 'canjeado']);
+    expect(db.getUnsyncedTickets()).toHaveLength(0);
+  });
+
+  test('should resume from the persisted cursor', async () => {
+    const firstPage = db.getUnsyncedTicketsPage(null, 10);
+    const last = firstPage[firstPage.length - 1];
+    db.setSyncState('push_tickets_cursor', { updated_at: last.updated_at, id: last.id });
+
+    const engine = new SyncEngine(db, supabaseSync, { pageSize: 10, batchSize: 10 });
+    const result = await engine.run();
+    
+    expect(result.synced).toBe(15);
+  });
+});
+'''
+
+with open('tito-casino-system/tests/unit/sync-engine.test.js', 'w') as f:
+    f.write(sync_engine_test)
+
+# Esquema de Supabase con la función de estadísticas agregadas
+supabase_schema_sql = '''-- src/main/database/schema.sql
+-- Esquema de Supabase (PostgreSQL) para el Sistema TITO
+
+CREATE TABLE IF NOT EXISTS tickets (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  ticket_number VARCHAR(50) UNIQUE NOT NULL,
+  valor DECIMAL(10,2) NOT NULL CHECK (valor > 0),
+  moneda VARCHAR(3) NOT NULL CHECK (moneda IN ('DOP', 'USD')),
+  fecha_emision TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  fecha_canje TIMESTAMPTZ NULL,
+  estado VARCHAR(10) NOT NULL DEFAULT 'emitido' CHECK (estado IN ('emitido', 'canjeado', 'anulado')),
+  qr_data TEXT NOT NULL,
+  mesa_id INTEGER NULL,
+  usuario_emision TEXT NULL,
+  usuario_canje TEXT NULL,
+  hash_seguridad TEXT NULL,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_tickets_fecha_emision ON tickets (fecha_emision);
+-- Descarga incremental por cursor (updated_at, id) (usada por PullEngine)
+CREATE INDEX IF NOT EXISTS idx_tickets_updated_at_id ON tickets (updated_at, id);
+
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS TRIGGER AS $$
+BEGIN
+  NEW.updated_at = NOW();
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tickets_updated_at ON tickets;
+CREATE TRIGGER tickets_updated_at
+  BEFORE UPDATE ON tickets
+  FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+-- Estadísticas agregadas en el servidor (usada por SupabaseSync.getTicketStats)
+CREATE OR REPLACE FUNCTION ticket_stats(
+  date_from TIMESTAMPTZ DEFAULT NULL,
+  date_to TIMESTAMPTZ DEFAULT NULL
+)
+RETURNS TABLE (estado TEXT, moneda TEXT, cantidad BIGINT, total NUMERIC)
+LANGUAGE sql STABLE AS $$
+  SELECT t.estado::TEXT, t.moneda::TEXT, COUNT(*), COALESCE(SUM(t.valor), 0)
+  FROM tickets t
+  WHERE (date_from IS NULL OR t.fecha_emision >= date_from)
+    AND (date_to IS NULL OR t.fecha_emision <= date_to)
+  GROUP BY t.estado, t.moneda;
+$$;
+
+GRANT EXECUTE ON FUNCTION ticket_stats(TIMESTAMPTZ, TIMESTAMPTZ) TO anon, authenticated;
+
+-- Canje central (usada por SupabaseSync.redeemTicket y RedemptionCoordinator)
+ALTER TABLE tickets ADD COLUMN IF NOT EXISTS redemption_id TEXT NULL;
+
+-- Un ticket cerrado no vuelve a 'emitido': el upsert de una estación que aún
+-- no conoce el canje (emisión pendiente de sincronizar) conserva el cierre
+CREATE OR REPLACE FUNCTION keep_closed_tickets() RETURNS TRIGGER AS $$
+BEGIN
+  IF OLD.estado <> 'emitido' AND NEW.estado = 'emitido' THEN
+    NEW.estado = OLD.estado;
+    NEW.fecha_canje = OLD.fecha_canje;
+    NEW.usuario_canje = OLD.usuario_canje;
+  END IF;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tickets_keep_closed ON tickets;
+CREATE TRIGGER tickets_keep_closed
+  BEFORE UPDATE ON tickets
+  FOR EACH ROW EXECUTE FUNCTION keep_closed_tickets();
+
+-- Compare-and-set en una sola sentencia: inserta el ticket ya canjeado si el
+-- servidor no lo tiene, o lo canjea si sigue 'emitido'. Devuelve la fila solo
+-- a la estación que gana (o a un reintento con el mismo redemption_id).
+CREATE OR REPLACE FUNCTION redeem_ticket(
+  p_ticket JSONB,
+  p_usuario_canje TEXT,
+  p_redemption_id TEXT
+)
+RETURNS SETOF tickets
+LANGUAGE sql VOLATILE AS $$
+  INSERT INTO tickets AS t (
+    ticket_number, valor, moneda, fecha_emision, qr_data, mesa_id,
+    usuario_emision, hash_seguridad, estado, fecha_canje, usuario_canje, redemption_id
+  )
+  VALUES (
+    p_ticket->>'ticket_number',
+    (p_ticket->>'valor')::DECIMAL,
+    p_ticket->>'moneda',
+    COALESCE((p_ticket->>'fecha_emision')::TIMESTAMPTZ, NOW()),
+    p_ticket->>'qr_data',
+    (p_ticket->>'mesa_id')::INTEGER,
+    p_ticket->>'usuario_emision',
+    p_ticket->>'hash_seguridad',
+    'canjeado', NOW(), p_usuario_canje, p_redemption_id
+  )
+  ON CONFLICT (ticket_number) DO UPDATE
+    SET estado = 'canjeado',
+        fecha_canje = CASE WHEN t.estado = 'emitido' THEN NOW() ELSE t.fecha_canje END,
+        usuario_canje = EXCLUDED.usuario_canje,
+        redemption_id = EXCLUDED.redemption_id
+    WHERE t.estado = 'emitido' OR t.redemption_id = EXCLUDED.redemption_id
+  RETURNING t.*;
+$$;
+
+GRANT EXECUTE ON FUNCTION redeem_ticket(JSONB, TEXT, TEXT) TO anon, authenticated;
+'''
+
+with open('tito-casino-system/src/main/database/schema.sql', 'w') as f:
+    f.write(supabase_schema_sql)
+
+redemption_coordinator_js = '''// src/main/database/redemption-coordinator.js
+const os = require('os');
+const { REDEMPTION_CONFIG, TICKET_STATES } = require('../../shared/constants');
+const TicketRedeemer = require('../utils/ticket-redeemer');
+
+const OFFLINE_POLICIES = ['deny', 'local'];
+
+/**
+ * Canje exactamente una vez entre varias cajas, cada una con su SQLite.
+ * El servidor central decide con un compare-and-set (SupabaseSync.redeemTicket,
+ * una petición) y después se canjea la fila local con db.redeemTicket: el pago
+ * solo se autoriza si ganan los dos.
+ *
+ * La decisión central queda en una caché local de corta vida (lease):
+ * - ganada: un reintento tras un fallo local se completa sin volver al servidor
+ *   (que ya respondería "canjeado");
+ * - perdida: escaneos repetidos de un ticket pagado en otra caja se rechazan sin red.
+ *
+ * Sin conexión se aplica offlinePolicy: 'deny' no paga nunca; 'local' paga con
+ * el canje local (hasta offlineMaxValor) y admite pagos dobles entre cajas.
+ */
+class RedemptionCoordinator {
+  /**
+   * @param {SQLiteDB|SQLiteClient} db - Base de datos local
+   * @param {SupabaseSync} supabaseSync - Servicio de Supabase
+   * @param {Object} options - { stationId, timeoutMs, leaseMs, offlinePolicy, offlineMaxValor, now, verify }
+   */
+  constructor(db, supabaseSync, options = {}) {
+    this.db = db;
+    this.supabaseSync = supabaseSync;
+    this.redeemer = new TicketRedeemer(db, { verify: options.verify });
+    this.stationId = options.stationId || process.env.STATION_ID || os.hostname();
+    this.timeoutMs = options.timeoutMs || REDEMPTION_CONFIG.TIMEOUT_MS;
+    this.leaseMs = options.leaseMs || REDEMPTION_CONFIG.LEASE_MS;
+    this.offlinePolicy = options.offlinePolicy || process.env.REDEMPTION_OFFLINE_POLICY || REDEMPTION_CONFIG.OFFLINE_POLICY;
+    this.offlineMaxValor = options.offlineMaxValor !== undefined
+      ? options.offlineMaxValor
+      : (process.env.REDEMPTION_OFFLINE_MAX_VALOR ? Number(process.env.REDEMPTION_OFFLINE_MAX_VALOR) : REDEMPTION_CONFIG.OFFLINE_MAX_VALOR);
+    this.now = options.now || Date.now;
+
+    if (!OFFLINE_POLICIES.includes(this.offlinePolicy)) {
+      throw new Error(`Política de canje sin conexión desconocida: ${this.offlinePolicy}`);
+    }
+
+    this.leases = new Map(); // ticket_number -> { won, ticket, expiresAt }
+    this.inflight = new Map(); // ticket_number -> canje en curso en esta estación
+    this.stats = { central: 0, won: 0, lost: 0, leaseHits: 0, offline: 0, offlineDenied: 0 };
+  }
+
+  /**
+   * Canjea el ticket de un QR escaneado
+   * @param {string} qrString - Contenido del QR
+   * @param {string} usuarioCanje - Usuario que canjea
+   * @returns {Promise<Object>} Como TicketRedeemer.redeem(), con offline: true si se pagó sin servidor
+   */
+  async redeem(qrString, usuarioCanje = null) {
+    const verification = this.redeemer.verify(qrString);
+    if (!verification.valid) {
+      return { success: false, reason: 'invalid_qr', error: 'Código QR inválido o alterado' };
+    }
+
+    return this.redeemVerified(verification.ticket.id, usuarioCanje, qrString);
+  }
+
+  /**
+   * Canjes del mismo ticket en esta estación, de uno en uno: un segundo escaneo
+   * espera al primero y vuelve a leer la fila local (ya cerrada si se pagó)
+   */
+  async redeemVerified(ticketNumber, usuarioCanje, qrData) {
+    const previous = this.inflight.get(ticketNumber);
+    const current = (previous ? previous.catch(() => {}) : Promise.resolve())
+      .then(() => this.redeemOnce(ticketNumber, usuarioCanje, qrData));
+    this.inflight.set(ticketNumber, current);
+
+    try {
+      return await current;
+    } finally {
+      if (this.inflight.get(ticketNumber) === current) {
+        this.inflight.delete(ticketNumber);
+      }
+    }
+  }
+
+  async redeemOnce(ticketNumber, usuarioCanje, qrData) {
+    // Lectura local previa: lo que el canje local rechazaría no se reclama en el servidor
+    const local = await this.db.findTicketByNumber(ticketNumber);
+    if (!local || local.estado !== TICKET_STATES.EMITIDO || local.qr_data !== qrData) {
+      return this.redeemer.explainFailure(ticketNumber);
+    }
+
+    const claim = await this.claim(local, usuarioCanje);
+
+    if (claim.status === 'lost') {
+      const estado = claim.ticket ? claim.ticket.estado : TICKET_STATES.CANJEADO;
+      return {
+        success: false,
+        reason: 'closed',
+        error: `Ticket ya ${estado} en otra estación`,
+        ticket: claim.ticket
+      };
+    }
+
+    if (claim.status === 'offline' && !this.allowsOffline(local)) {
+      this.stats.offlineDenied++;
+      return {
+        success: false,
+        reason: 'offline',
+        error: 'Sin conexión con el servidor central: canje no autorizado'
+      };
+    }
+
+    let ticket = await this.db.redeemTicket(ticketNumber, usuarioCanje, qrData);
+    if (!ticket && claim.status === 'won') {
+      ticket = await this.closedByOwnClaim(ticketNumber, claim.ticket);
+    }
+    if (!ticket) {
+      return this.redeemer.explainFailure(ticketNumber);
+    }
+
+    // Canje completo: la reserva central ya no hace falta
+    this.leases.delete(ticketNumber);
+
+    if (claim.status === 'offline') {
+      this.stats.offline++;
+      return { success: true, ticket, offline: true };
+    }
+
+    return { success: true, ticket };
+  }
+
+  /**
+   * Obtiene la decisión central para un ticket (de la caché si sigue vigente)
+   * @param {Object} local - Ticket local abierto
+   * @param {string} usuarioCanje - Usuario que canjea
+   * @returns {Promise<Object>} { status: 'won'|'lost'|'offline', ticket, error }
+   */
+  async claim(local, usuarioCanje) {
+    const ticketNumber = local.ticket_number;
+    const lease = this.getLease(ticketNumber);
+    if (lease) {
+      this.stats.leaseHits++;
+      return { status: lease.won ? 'won' : 'lost', ticket: lease.ticket };
+    }
+
+    if (!this.supabaseSync || !this.supabaseSync.isAvailable()) {
+      return { status: 'offline', error: 'Supabase no está disponible' };
+    }
+
+    let row;
+    try {
+      this.stats.central++;
+      row = await this.withTimeout(
+        this.supabaseSync.redeemTicket(local, usuarioCanje, this.redemptionId(ticketNumber))
+      );
+    } catch (error) {
+      console.warn(`⚠️  Canje central de ${ticketNumber} no disponible:`, error.message);
+      return { status: 'offline', error: error.message };
+    }
+
+    if (row) {
+      this.stats.won++;
+      this.setLease(ticketNumber, true, row);
+      return { status: 'won', ticket: row };
+    }
+
+    // Perdido: leer la fila central solo para informar quién la cerró
+    this.stats.lost++;
+    let current = null;
+    try {
+      current = await this.withTimeout(this.supabaseSync.getTicketByNumber(ticketNumber));
+    } catch (error) {
+      console.warn(`⚠️  No se pudo leer el ticket central ${ticketNumber}:`, error.message);
+    }
+    this.setLease(ticketNumber, false, current);
+    return { status: 'lost', ticket: current };
+  }
+
+  /**
+   * Tras ganar el canje central, la descarga (PullEngine o la consulta remota al
+   * validar) puede cerrar la fila local antes del canje local con la fila central,
+   * que es la de este canje. En ese caso la decisión central es la que vale y se paga.
+   * @param {string} ticketNumber - Número del ticket
+   * @param {Object} central - Fila central devuelta al ganar el canje
+   * @returns {Promise<Object|null>} Ticket local cerrado por la descarga, o null
+   */
+  async closedByOwnClaim(ticketNumber, central) {
+    if (!central || central.redemption_id !== this.redemptionId(ticketNumber)) {
+      return null;
+    }
+
+    // synced = 1: cerrado por la descarga; un canje local deja synced = 0
+    const local = await this.db.findTicketByNumber(ticketNumber);
+    if (!local || local.synced !== 1 || local.estado !== central.estado) {
+      return null;
+    }
+
+    return local;
+  }
+
+  /**
+   * Identificador del canje: el mismo para todos los intentos de esta estación
+   * sobre un ticket, así un reintento reconoce su propio canje en el servidor
+   */
+  redemptionId(ticketNumber) {
+    return `${this.stationId}:${ticketNumber}`;
+  }
+
+  /**
+   * Indica si la política sin conexión permite pagar un ticket
+   */
+  allowsOffline(ticket) {
+    if (this.offlinePolicy !== 'local') {
+      return false;
+    }
+    return this.offlineMaxValor === null || ticket.valor <= this.offlineMaxValor;
+  }
+
+  getLease(ticketNumber) {
+    const lease = this.leases.get(ticketNumber);
+    if (!lease) {
+      return null;
+    }
+    if (lease.expiresAt <= this.now()) {
+      this.leases.delete(ticketNumber);
+      return null;
+    }
+    return lease;
+  }
+
+  setLease(ticketNumber, won, ticket) {
+    const now = this.now();
+
+    // Vencimientos en orden de inserción: descartar desde el principio
+    for (const [key, lease] of this.leases) {
+      if (lease.expiresAt > now) break;
+      this.leases.delete(key);
+    }
+
+    this.leases.delete(ticketNumber);
+    this.leases.set(ticketNumber, { won, ticket, expiresAt: now + this.leaseMs });
+  }
+
+  /**
+   * Limita la espera del servidor central. Si la respuesta llega tarde y el canje
+   * se aplicó, el reintento de esta estación lo recupera por redemption_id.
+   */
+  withTimeout(promise) {
+    let timer;
+    const timeout = new Promise((resolve, reject) => {
+      timer = setTimeout(() => reject(new Error(`Sin respuesta del servidor central en ${this.timeoutMs}ms`)), this.timeoutMs);
+    });
+
+    return Promise.race([promise, timeout]).finally(() => clearTimeout(timer));
+  }
+
+  getStats() {
+    return {
+      ...this.stats,
+      leases: this.leases.size
+    };
+  }
+}
+
+module.exports = RedemptionCoordinator;
+'''
+
+with open('tito-casino-system/src/main/database/redemption-coordinator.js', 'w') as f:
+    f.write(redemption_coordinator_js)
+
+# Servidor PostgREST en proceso para tests de integración
+os.makedirs('tito-casino-system/tests/integration/helpers', exist_ok=True)
+
+fake_postgrest_js = '''// tests/integration/helpers/fake-postgrest.js
+const http = require('http');
+const crypto = require('crypto');
+
+const RESERVED_PARAMS = ['select', 'order', 'limit', 'offset', 'on_conflict', 'columns'];
+
+/**
+ * Divide una lista PostgREST por comas de primer nivel (respeta paréntesis y comillas)
+ * @param {string} text - Lista, p. ej. "a.eq.1,and(b.gt.2,c.lt.3)"
+ * @returns {Array<string>} Elementos
+ */
+function splitTopLevel(text) {
+  const parts = [];
+  let depth = 0;
+  let quoted = false;
+  let current = '';
+
+  for (const char of text) {
+    if (char === '"') quoted = !quoted;
+    if (!quoted && char === '(') depth++;
+    if (!quoted && char === ')') depth--;
+    if (!quoted && depth === 0 && char === ',') {
+      parts.push(current);
+      current = '';
+    } else {
+      current += char;
+    }
+  }
+  if (current) parts.push(current);
+
+  return parts;
+}
+
+/**
+ * Convierte "op.valor" en una condición
+ */
+function parseCondition(column, expression) {
+  const dot = expression.indexOf('.');
+  let value = expression.slice(dot + 1);
+  if (value.startsWith('"') && value.endsWith('"')) {
+    value = value.slice(1, -1);
+  }
+  return { column, op: expression.slice(0, dot), value };
+}
+
+/**
+ * Convierte "or=(...)" / "and(...)" en un árbol lógico
+ */
+function parseLogic(kind, body) {
+  const inner = body.replace(/^\\(/, '').replace(/\\)$/, '');
+  const conditions = splitTopLevel(inner).map(item => {
+    const nested = item.match(/^(and|or)(\\(.*\\))$/);
+    if (nested) {
+      return parseLogic(nested[1], nested[2]);
+    }
+    const dot = item.indexOf('.');
+    return parseCondition(item.slice(0, dot), item.slice(dot + 1));
+  });
+  return { logic: kind, conditions };
+}
+
+function compare(a, b) {
+  if (typeof a === 'number') {
+    return a - Number(b);
+  }
+  return String(a) < String(b) ? -1 : String(a) > String(b) ? 1 : 0;
+}
+
+function matches(row, filter) {
+  if (filter.logic) {
+    const results = filter.conditions.map(condition => matches(row, condition));
+    return filter.logic === 'and' ? results.every(Boolean) : results.some(Boolean);
+  }
+
+  const actual = row[filter.column];
+  const { op, value } = filter;
+
+  switch (op) {
+    case 'eq': return actual !== null && actual !== undefined && compare(actual, value) === 0;
+    case 'neq': return compare(actual, value) !== 0;
+    case 'gt': return actual !== null && compare(actual, value) > 0;
+    case 'gte': return actual !== null && compare(actual, value) >= 0;
+    case 'lt': return actual !== null && compare(actual, value) < 0;
+    case 'lte': return actual !== null && compare(actual, value) <= 0;
+    case 'is': return value === 'null' ? actual === null || actual === undefined : String(actual) === value;
+    case 'in': return value.replace(/^\\(|\\)$/g, '').split(',').some(item => compare(actual, item) === 0);
+    default: throw new Error(`Operador no soportado por FakePostgrest: ${op}`);
+  }
+}
+
+/**
+ * Servidor HTTP en proceso que imita el subconjunto de PostgREST que usa
+ * supabase-js: select con filtros/orden/límite (incluyendo or/and), upsert,
+ * update, .single() y llamadas RPC registradas en `rpcs`.
+ */
+class FakePostgrest {
+  constructor() {
+    this.tables = { tickets: [] };
+    this.rpcs = {};
+    this.requests = [];
+    this.maxRows = null; // Simula db-max-rows de PostgREST
+    this.uniqueKeys = { tickets: 'ticket_number' }; // Restricciones UNIQUE para INSERT
+    this.server = http.createServer((req, res) => this.handle(req, res));
+  }
+
+  /**
+   * Inicia el servidor en un puerto libre
+   * @returns {Promise<string>} URL base para SUPABASE_URL
+   */
+  start() {
+    return new Promise(resolve => {
+      this.server.listen(0, '127.0.0.1', () => {
+        this.url = `http://127.0.0.1:${this.server.address().port}`;
+        resolve(this.url);
+      });
+    });
+  }
+
+  stop() {
+    return new Promise(resolve => this.server.close(resolve));
+  }
+
+  /**
+   * Inserta filas directamente en una tabla
+   */
+  seed(table, rows) {
+    this.tables[table] = this.tables[table] || [];
+    rows.forEach(row => this.tables[table].push({ id: crypto.randomUUID(), ...row }));
+  }
+
+  handle(req, res) {
+    let body = '';
+    req.on('data', chunk => { body += chunk; });
+    req.on('end', async () => {
+      const url = new URL(req.url, 'http://localhost');
+      const parts = url.pathname.replace(/^\\/rest\\/v1\\//, '').split('/');
+      const payload = body ? JSON.parse(body) : null;
+      this.requests.push({ method: req.method, path: url.pathname, query: url.search, body: payload });
+
+      try {
+        if (parts[0] === 'rpc') {
+          return await this.handleRpc(res, parts[1], payload || {});
+        }
+        return this.handleTable(req, res, parts[0], url.searchParams, payload);
+      } catch (error) {
+        this.reply(res, 400, { code: error.code || 'PGRST100', message: error.message, details: null, hint: null });
+      }
+    });
+  }
+
+  async handleRpc(res, name, args) {
+    const fn = this.rpcs[name];
+    if (!fn) {
+      return this.reply(res, 404, {
+        code: 'PGRST202',
+        message: `Could not find the function public.${name} in the schema cache`,
+        details: null,
+        hint: null
+      });
+    }
+    return this.reply(res, 200, await fn(args, this));
+  }
+
+  handleTable(req, res, table, params, payload) {
+    const rows = this.tables[table];
+    if (!rows) {
+      return this.reply(res, 404, { code: '42P01', message: `relation "${table}" does not exist` });
+    }
+
+    const filters = [];
+    for (const [key, value] of params.entries()) {
+      if (RESERVED_PARAMS.includes(key)) continue;
+      if (key === 'or' || key === 'and') {
+        filters.push(parseLogic(key, value));
+      } else {
+        filters.push(parseCondition(key, value));
+      }
+    }
+
+    const prefer = req.headers.prefer || '';
+    const wantsObject = (req.headers.accept || '').includes('vnd.pgrst.object');
+    const selected = filteredRows => this.respondRows(res, this.project(filteredRows, params.get('select')), wantsObject);
+
+    switch (req.method) {
+      case 'GET':
+      case 'HEAD': {
+        let result = rows.filter(row => filters.every(filter => matches(row, filter)));
+        result = this.sort(result, params.get('order'));
+        const offset = Number(params.get('offset') || 0);
+        let limit = params.has('limit') ? Number(params.get('limit')) : Infinity;
+        if (this.maxRows !== null) limit = Math.min(limit, this.maxRows);
+        return selected(result.slice(offset, offset + limit));
+      }
+
+      case 'POST': {
+        const incoming = Array.isArray(payload) ? payload : [payload];
+        const conflictColumn = params.get('on_conflict') || this.uniqueKeys[table];
+        const merge = prefer.includes('resolution=merge-duplicates');
+        const written = incoming.map(item => {
+          const existing = conflictColumn && rows.find(row => row[conflictColumn] === item[conflictColumn]);
+          if (existing) {
+            if (!merge) {
+              const error = new Error('duplicate key value violates unique constraint');
+              error.code = '23505';
+              throw error;
+            }
+            Object.assign(existing, item);
+            return existing;
+          }
+          const row = { id: crypto.randomUUID(), ...item };
+          rows.push(row);
+          return row;
+        });
+        return prefer.includes('return=representation') ? selected(written) : this.reply(res, 201, null);
+      }
+
+      case 'PATCH': {
+        const updated = rows.filter(row => filters.every(filter => matches(row, filter)));
+        updated.forEach(row => Object.assign(row, payload));
+        return prefer.includes('return=representation') ? selected(updated) : this.reply(res, 204, null);
+      }
+
+      default:
+        return this.reply(res, 405, { message: `Método no soportado: ${req.method}` });
+    }
+  }
+
+  project(rows, select) {
+    if (!select || select === '*') {
+      return rows.map(row => ({ ...row }));
+    }
+    const columns = select.split(',').map(column => column.trim());
+    return rows.map(row => Object.fromEntries(columns.map(column => [column, row[column]])));
+  }
+
+  sort(rows, order) {
+    if (!order) return rows;
+    const keys = order.split(',').map(item => {
+      const [column, direction = 'asc'] = item.split('.');
+      return { column, sign: direction === 'desc' ? -1 : 1 };
+    });
+    return [...rows].sort((a, b) => {
+      for (const { column, sign } of keys) {
+        const result = compare(a[column], b[column]);
+        if (result !== 0) return result * sign;
+      }
+      return 0;
+    });
+  }
+
+  respondRows(res, rows, wantsObject) {
+    if (wantsObject) {
+      if (rows.length !== 1) {
+        return this.reply(res, 406, {
+          code: 'PGRST116',
+          message: 'JSON object requested, multiple (or no) rows returned',
+          details: `The result contains ${rows.length} rows`,
+          hint: null
+        });
+      }
+      return this.reply(res, 200, rows[0]);
+    }
+    return this.reply(res, 200, rows, { 'Content-Range': `0-${Math.max(rows.length - 1, 0)}/*` });
+  }
+
+  reply(res, status, body, headers = {}) {
+    res.writeHead(status, { 'Content-Type': 'application/json', ...headers });
+    res.end(body === null ? '' : JSON.stringify(body));
+  }
+}
+
+module.exports = FakePostgrest;
+'''
+
+with open('tito-casino-system/tests/integration/helpers/fake-postgrest.js', 'w') as f:
+    f.write(fake_postgrest_js)
+
+supabase_stats_test = '''// tests/integration/supabase-stats.test.js
+const FakePostgrest = require('./helpers/fake-postgrest');
+
+describe('SupabaseSync.getTicketStats (PostgREST local)', () => {
+  let server;
+  let supabaseSync;
+
+  const tickets = [
+    { ticket_number: 'T1', valor: 100, moneda: 'DOP', estado: 'emitido', fecha_emision: '2025-10-12T08:00:00Z' },
+    { ticket_number: 'T2', valor: 50, moneda: 'USD', estado: 'canjeado', fecha_emision: '2025-10-12T09:00:00Z' },
+    { ticket_number: 'T3', valor: 200, moneda: 'DOP', estado: 'canjeado', fecha_emision: '2025-10-12T10:00:00Z' },
+    { ticket_number: 'T4', valor: 75, moneda: 'DOP', estado: 'anulado', fecha_emision: '2025-10-12T11:00:00Z' },
+    { ticket_number: 'T5', valor: 999, moneda: 'USD', estado: 'emitido', fecha_emision: '2025-11-01T08:00:00Z' }
+  ];
+
+  const expected = {
+    total_tickets: 4,
+    total_emitidos: 1,
+    total_canjeados: 2,
+    total_anulados: 1,
+    valor_total_dop: 375,
+    valor_total_usd: 50,
+    valor_canjeado_dop: 200,
+    valor_canjeado_usd: 50,
+    valor_pendiente_dop: 100,
+    valor_pendiente_usd: 0
+  };
+
+  beforeEach(async () => {
+    server = new FakePostgrest();
+    server.seed('tickets', tickets);
+    process.env.SUPABASE_URL = await server.start();
+    process.env.SUPABASE_ANON_KEY = 'test-anon-key';
+
+    const SupabaseSync = require('../../src/main/database/supabase');
+    supabaseSync = new SupabaseSync();
+  });
+
+  afterEach(async () => {
+    await server.stop();
+  });
+
+  test('should aggregate on the server when the ticket_stats RPC exists', async () => {
+    server.rpcs.ticket_stats = ({ date_from, date_to }) => {
+      const groups = {};
+      server.tables.tickets
+        .filter(t => t.fecha_emision >= date_from && t.fecha_emision <= date_to)
+        .forEach(t => {
+          const key = `${t.estado}|${t.moneda}`;
+          groups[key] = groups[key] || { estado: t.estado, moneda: t.moneda, cantidad: 0, total: 0 };
+          groups[key].cantidad++;
+          groups[key].total += t.valor;
+        });
+      return Object.values(groups);
+    };
+
+    const stats = await supabaseSync.getTicketStats('2025-10-12T00:00:00Z', '2025-10-12T23:59:59Z');
+    
+    expect(stats).toEqual(expected);
+    expect(server.requests.filter(r => r.path.endsWith('/tickets'))).toHaveLength(0);
+  });
+
+  test('should fall back to paginated aggregation when the RPC is missing', async () => {
+    server.maxRows = 2; // El servidor recorta páginas por debajo de pageSize
+
+    const stats = await supabaseSync.getTicketStats('2025-10-12T00:00:00Z', '2025-10-12T23:59:59Z');
+    
+    expect(stats).toEqual(expected);
+    expect(supabaseSync.statsRpcAvailable).toBe(false);
+    expect(server.requests.filter(r => r.path.endsWith('/tickets')).length).toBeGreaterThan(2);
+  });
+});
+'''
+
+with open('tito-casino-system/tests/integration/supabase-stats.test.js', 'w') as f:
+    f.write(supabase_stats_test)
+
+supabase_range_test = '''// tests/integration/supabase-range.test.js
+const FakePostgrest = require('./helpers/fake-postgrest');
+
+describe('SupabaseSync.iterateTicketsByDateRange (PostgREST local)', () => {
+  let server;
+  let supabaseSync;
+
+  beforeEach(async () => {
+    server = new FakePostgrest();
+    // Varios tickets comparten fecha_emision para ejercitar el desempate por id
+    const rows = [];
+    for (let i = 0; i < 12; i++) {
+      rows.push({
+        id: `00000000-0000-0000-0000-${String(i).padStart(12, '0')}`,
+        ticket_number: `T${i}`,
+        valor: i + 1,
+        moneda: 'DOP',
+        estado: 'emitido',
+        fecha_emision: `2025-10-12T0${Math.floor(i / 3)}:00:00Z`
+      });
+    }
+    server.seed('tickets', rows);
+    server.maxRows = 4; // Límite de filas del servidor menor que pageSize
+
+    process.env.SUPABASE_URL = await server.start();
+    process.env.SUPABASE_ANON_KEY = 'test-anon-key';
+    const SupabaseSync = require('../../src/main/database/supabase');
+    supabaseSync = new SupabaseSync();
+  });
+
+  afterEach(async () => {
+    await server.stop();
+  });
+
+  test('should yield every ticket once, in (fecha_emision, id) order', async () => {
+    const numbers = [];
+    for await (const page of supabaseSync.iterateTicketsByDateRange('2025-10-12T00:00:00Z', '2025-10-12T23:59:59Z', { pageSize: 5 })) {
+      expect(page.length).toBeLessThanOrEqual(5);
+      numbers.push(...page.map(t => t.ticket_number));
+    }
+    
+    expect(numbers).toEqual(Array.from({ length: 12 }, (_, i) => `T${i}`));
+  });
+
+  test('should return the complete range despite the server row cap', async () => {
+    const tickets = await supabaseSync.getTicketsByDateRange('2025-10-12T00:00:00Z', '2025-10-12T23:59:59Z');
+    
+    expect(tickets).toHaveLength(12);
+    expect(tickets[0].ticket_number).toBe('T11');
+  });
+});
+'''
+
+with open('tito-casino-system/tests/integration/supabase-range.test.js', 'w') as f:
+    f.write(supabase_range_test)
+
+supabase_pull_test = '''// tests/integration/supabase-pull.test.js
+const FakePostgrest = require('./helpers/fake-postgrest');
+const SQLiteDB = require('../../src/main/database/sqlite');
+const PullEngine = require('../../src/main/database/pull-engine');
+
+describe('PullEngine (PostgREST local)', () => {
+  let server;
+  let db;
+  let engine;
+  let changes;
+
+  const remoteTicket = (i, overrides = {}) => ({
+    id: `00000000-0000-0000-0000-${String(i).padStart(12, '0')}`,
+    ticket_number: `M${i}`,
+    valor: 100 + i,
+    moneda: 'DOP',
+    estado: 'emitido',
+    fecha_emision: '2025-10-12T08:00:00Z',
+    fecha_canje: null,
+    qr_data: `M${i}|${100 + i}|DOP|2025-10-12T08:00:00Z|0123456789abcdef`,
+    mesa_id: 2,
+    usuario_emision: 'Mesa2',
+    usuario_canje: null,
+    hash_seguridad: '0123456789abcdef',
+    // Varios tickets comparten updated_at para ejercitar el desempate por id
+    updated_at: `2025-10-12T08:0${Math.floor(i / 3)}:00.000Z`,
+    ...overrides
+  });
+
+  beforeEach(async () => {
+    server = new FakePostgrest();
+    server.seed('tickets', Array.from({ length: 7 }, (_, i) => remoteTicket(i)));
+    server.maxRows = 2; // Límite de filas del servidor menor que pageSize
+
+    process.env.SUPABASE_URL = await server.start();
+    process.env.SUPABASE_ANON_KEY = 'test-anon-key';
+    const SupabaseSync = require('../../src/main/database/supabase');
+
+    db = new SQLiteDB(':memory:');
+    changes = [];
+    engine = new PullEngine(db, new SupabaseSync(), {
+      pageSize: 3,
+      overlapMs: 0,
+      onChanges: applied => changes.push(...applied)
+    });
+  });
+
+  afterEach(async () => {
+    db.close();
+    await server.stop();
+  });
+
+  test('should pull every remote ticket into SQLite as synced', async () => {
+    const summary = await engine.run();
+    
+    expect(summary).toMatchObject({ pulled: 7, applied: 7 });
+    expect(db.findTicketByNumber('M6')).toMatchObject({ valor: 106, estado: 'emitido', synced: 1, fecha_emision: '2025-10-12 08:00:00' });
+    expect(db.getUnsyncedTickets()).toHaveLength(0);
+    expect(db.getSyncState('pull_tickets_cursor')).toEqual({ updated_at: '2025-10-12T08:02:00.000Z', id: '00000000-0000-0000-0000-000000000006' });
+  });
+
+  test('should only fetch changes after the stored cursor', async () => {
+    await engine.run();
+    server.requests.length = 0;
+    changes.length = 0;
+    
+    const redeemed = server.tables.tickets.find(t => t.ticket_number === 'M1');
+    Object.assign(redeemed, { estado: 'canjeado', usuario_canje: 'Caja2', fecha_canje: '2025-10-12T09:00:00Z', updated_at: '2025-10-12T09:00:00.000Z' });
+    
+    const summary = await engine.run();
+    
+    expect(summary).toMatchObject({ pulled: 1, applied: 1 });
+    expect(changes).toEqual([expect.objectContaining({ previousEstado: 'emitido', ticket: expect.objectContaining({ ticket_number: 'M1', estado: 'canjeado' }) })]);
+    expect(db.getTicketStats().total_canjeados).toBe(1);
+  });
+
+  test('should keep local changes that are pending upload', async () => {
+    await engine.run();
+    db.updateTicketStatus('M2', 'canjeado', 'Caja1');
+    
+    const remote = server.tables.tickets.find(t => t.ticket_number === 'M2');
+    Object.assign(remote, { estado: 'anulado', updated_at: '2025-10-12T09:00:00.000Z' });
+    await engine.run();
+    
+    expect(db.findTicketByNumber('M2')).toMatchObject({ estado: 'canjeado', usuario_canje: 'Caja1', synced: 0 });
+  });
+
+  test('should resume from the cursor of the last committed page', async () => {
+    const supabaseSync = engine.supabaseSync;
+    const original = supabaseSync.getTicketsChangedSince.bind(supabaseSync);
+    let calls = 0;
+    supabaseSync.getTicketsChangedSince = (...args) => {
+      if (++calls === 3) throw new Error('Sin conexión');
+      return original(...args);
+    };
+    
+    await expect(engine.run()).rejects.toThrow('Sin conexión');
+    expect(db.getTicketStats().total_emitidos).toBe(4);
+    
+    supabaseSync.getTicketsChangedSince = original;
+    await engine.run();
+    expect(db.getTicketStats().total_emitidos).toBe(7);
+  });
+});
+'''
+
+with open('tito-casino-system/tests/integration/supabase-pull.test.js', 'w') as f:
+    f.write(supabase_pull_test)
+
+redemption_coordinator_test = '''// tests/integration/redemption-coordinator.test.js
+const crypto = require('crypto');
+const FakePostgrest = require('./helpers/fake-postgrest');
+const SQLiteDB = require('../../src/main/database/sqlite');
+const RedemptionCoordinator = require('../../src/main/database/redemption-coordinator');
+const TicketEmitter = require('../../src/main/utils/ticket-emitter');
+
+describe('RedemptionCoordinator (PostgREST local)', () => {
+  let server;
+  let SupabaseSync;
+  let supabaseSync;
+  let cajaA;
+  let cajaB;
+  let ticket;
+
+  const station = (db, stationId, options = {}) => new RedemptionCoordinator(db, options.supabaseSync || supabaseSync, {
+    stationId,
+    offlinePolicy: 'deny',
+    ...options
+  });
+
+  const centralRows = () => server.tables.tickets.filter(t => t.ticket_number === ticket.ticket_number);
+  const localEstado = (db) => db.findTicketByNumber(ticket.ticket_number).estado;
+
+  // Mismo comportamiento que la función redeem_ticket de schema.sql
+  const installRedeemRpc = () => {
+    server.rpcs.redeem_ticket = ({ p_ticket, p_usuario_canje, p_redemption_id }) => {
+      const redemption = {
+        estado: 'canjeado',
+        fecha_canje: new Date().toISOString(),
+        usuario_canje: p_usuario_canje,
+        redemption_id: p_redemption_id
+      };
+      const row = server.tables.tickets.find(t => t.ticket_number === p_ticket.ticket_number);
+      if (!row) {
+        const created = { id: crypto.randomUUID(), ...p_ticket, ...redemption };
+        server.tables.tickets.push(created);
+        return [created];
+      }
+      if (row.estado === 'emitido' || row.redemption_id === p_redemption_id) {
+        Object.assign(row, redemption);
+        return [row];
+      }
+      return [];
+    };
+  };
+
+  beforeEach(async () => {
+    server = new FakePostgrest();
+    process.env.SUPABASE_URL = await server.start();
+    process.env.SUPABASE_ANON_KEY = 'test-anon-key';
+    SupabaseSync = require('../../src/main/database/supabase');
+    supabaseSync = new SupabaseSync();
+
+    // Ticket emitido en la caja A y replicado en la caja B
+    cajaA = new SQLiteDB(':memory:');
+    cajaB = new SQLiteDB(':memory:');
+    const { tickets } = await new TicketEmitter(cajaA, { stationId: 1 }).emit([
+      { valor: 100, moneda: 'DOP', mesa_id: 1, usuario_emision: 'Mesa1' }
+    ]);
+    ticket = tickets[0];
+    await cajaB.createTicket({
+      ticket_number: ticket.ticket_number,
+      valor: ticket.valor,
+      moneda: ticket.moneda,
+      qr_data: ticket.qr_data,
+      mesa_id: ticket.mesa_id,
+      usuario_emision: ticket.usuario_emision,
+      hash_seguridad: ticket.hash_seguridad
+    });
+  });
+
+  afterEach(async () => {
+    cajaA.close();
+    cajaB.close();
+    await server.stop();
+  });
+
+  test('should pay exactly once across stations before the ticket reaches the server', async () => {
+    const results = await Promise.all([
+      station(cajaA, 'caja-a').redeem(ticket.qr_data, 'CajaA'),
+      station(cajaB, 'caja-b').redeem(ticket.qr_data, 'CajaB')
+    ]);
+
+    const winners = results.filter(r => r.success);
+    expect(winners).toHaveLength(1);
+    expect(results.find(r => !r.success)).toMatchObject({ reason: 'closed' });
+    expect(centralRows()).toEqual([expect.objectContaining({ estado: 'canjeado', usuario_canje: winners[0].ticket.usuario_canje })]);
+    expect([localEstado(cajaA), localEstado(cajaB)].filter(estado => estado === 'canjeado')).toHaveLength(1);
+  });
+
+  test('should pay exactly once when the ticket is already on the server', async () => {
+    server.seed('tickets', [supabaseSync.toRemoteTicket(ticket)]);
+
+    const results = await Promise.all([
+      station(cajaA, 'caja-a').redeem(ticket.qr_data, 'CajaA'),
+      station(cajaB, 'caja-b').redeem(ticket.qr_data, 'CajaB')
+    ]);
+
+    expect(results.filter(r => r.success)).toHaveLength(1);
+    expect(centralRows()).toHaveLength(1);
+    expect(centralRows()[0].redemption_id).toMatch(/^caja-[ab]:/);
+  });
+
+  test('should redeem with a single request through the redeem_ticket RPC', async () => {
+    installRedeemRpc();
+
+    const result = await station(cajaA, 'caja-a').redeem(ticket.qr_data, 'CajaA');
+
+    expect(result.success).toBe(true);
+    expect(server.requests).toEqual([expect.objectContaining({ method: 'POST', path: '/rest/v1/rpc/redeem_ticket' })]);
+    expect(centralRows()[0]).toMatchObject({ estado: 'canjeado', redemption_id: `caja-a:${ticket.ticket_number}` });
+  });
+
+  test('should answer repeated scans of a ticket paid elsewhere from the lease', async () => {
+    const cajaBCoordinator = station(cajaB, 'caja-b');
+    await station(cajaA, 'caja-a').redeem(ticket.qr_data, 'CajaA');
+    expect(await cajaBCoordinator.redeem(ticket.qr_data, 'CajaB')).toMatchObject({ success: false, reason: 'closed' });
+
+    server.requests.length = 0;
+    const again = await cajaBCoordinator.redeem(ticket.qr_data, 'CajaB');
+
+    expect(again).toMatchObject({ success: false, error: 'Ticket ya canjeado en otra estación' });
+    expect(server.requests).toHaveLength(0);
+    expect(cajaBCoordinator.getStats()).toMatchObject({ lost: 1, leaseHits: 1 });
+  });
+
+  test('should complete a central win after a local failure without asking the server again', async () => {
+    const coordinator = station(cajaA, 'caja-a');
+    jest.spyOn(cajaA, 'redeemTicket').mockImplementationOnce(() => {
+      throw new Error('database is locked');
+    });
+
+    await expect(coordinator.redeem(ticket.qr_data, 'CajaA')).rejects.toThrow('database is locked');
+    expect(localEstado(cajaA)).toBe('emitido');
+
+    server.requests.length = 0;
+    expect((await coordinator.redeem(ticket.qr_data, 'CajaA')).success).toBe(true);
+    expect(server.requests).toHaveLength(0);
+  });
+
+  test('should pay when a pull closes the local row between the central claim and the local redemption', async () => {
+    await cajaA.markAsSynced([ticket.id]);
+    const coordinator = station(cajaA, 'caja-a');
+    const claimCentral = supabaseSync.redeemTicket.bind(supabaseSync);
+    jest.spyOn(supabaseSync, 'redeemTicket').mockImplementationOnce(async (...args) => {
+      const row = await claimCentral(...args);
+      await cajaA.applyRemoteTickets([row]); // La descarga llega antes del canje local
+      return row;
+    });
+
+    const result = await coordinator.redeem(ticket.qr_data, 'CajaA');
+
+    expect(result).toMatchObject({ success: true, ticket: { estado: 'canjeado', usuario_canje: 'CajaA' } });
+    expect(await coordinator.redeem(ticket.qr_data, 'CajaA')).toMatchObject({ success: false, error: 'Ticket ya canjeado' });
+  });
+
+  test('should not pay twice for concurrent scans at the same station', async () => {
+    const coordinator = station(cajaA, 'caja-a');
+
+    const results = await Promise.all([
+      coordinator.redeem(ticket.qr_data, 'CajaA'),
+      coordinator.redeem(ticket.qr_data, 'CajaA')
+    ]);
+
+    expect(results.filter(r => r.success)).toHaveLength(1);
+    expect(coordinator.getStats()).toMatchObject({ won: 1, leaseHits: 0 });
+  });
+
+  test('should recognize its own central redemption after the lease expires', async () => {
+    let clock = 0;
+    const coordinator = station(cajaA, 'caja-a', { leaseMs: 1000, now: () => clock });
+    jest.spyOn(cajaA, 'redeemTicket').mockImplementationOnce(() => {
+      throw new Error('database is locked');
+    });
+    await expect(coordinator.redeem(ticket.qr_data, 'CajaA')).rejects.toThrow('database is locked');
+
+    clock = 1000;
+    const retry = await coordinator.redeem(ticket.qr_data, 'CajaA');
+
+    expect(retry.success).toBe(true);
+    expect(coordinator.getStats()).toMatchObject({ won: 2, leaseHits: 0 });
+    expect(await station(cajaB, 'caja-b').redeem(ticket.qr_data, 'CajaB')).toMatchObject({ reason: 'closed' });
+  });
+
+  test('should reject locally closed or mismatched tickets without a request', async () => {
+    cajaA.updateTicketStatus(ticket.ticket_number, 'anulado');
+
+    expect(await station(cajaA, 'caja-a').redeem(ticket.qr_data, 'CajaA'))
+      .toMatchObject({ success: false, reason: 'closed', error: 'Ticket ya anulado' });
+    expect(server.requests).toHaveLength(0);
+  });
+
+  describe('offline policy', () => {
+    let offlineSync;
+
+    beforeEach(() => {
+      process.env.SUPABASE_URL = 'http://127.0.0.1:1'; // Sin servidor escuchando
+      offlineSync = new SupabaseSync();
+    });
+
+    test('should refuse to pay without the central server by default', async () => {
+      const result = await station(cajaA, 'caja-a', { supabaseSync: offlineSync }).redeem(ticket.qr_data, 'CajaA');
+
+      expect(result).toMatchObject({ success: false, reason: 'offline' });
+      expect(localEstado(cajaA)).toBe('emitido');
+    });
+
+    test('should refuse to pay when the central server does not answer in time', async () => {
+      server.rpcs.redeem_ticket = () => new Promise(resolve => setTimeout(() => resolve([]), 200));
+
+      const result = await station(cajaA, 'caja-a', { timeoutMs: 20 }).redeem(ticket.qr_data, 'CajaA');
+
+      expect(result).toMatchObject({ success: false, reason: 'offline' });
+      await new Promise(resolve => setTimeout(resolve, 250));
+    });
+
+    test('should pay locally up to the configured value with the local policy', async () => {
+      const capped = station(cajaA, 'caja-a', { supabaseSync: offlineSync, offlinePolicy: 'local', offlineMaxValor: 50 });
+      expect(await capped.redeem(ticket.qr_data, 'CajaA')).toMatchObject({ success: false, reason: 'offline' });
+
+      const allowed = station(cajaA, 'caja-a', { supabaseSync: offlineSync, offlinePolicy: 'local', offlineMaxValor: 100 });
+      const result = await allowed.redeem(ticket.qr_data, 'CajaA');
+
+      expect(result).toMatchObject({ success: true, offline: true });
+      expect(localEstado(cajaA)).toBe('canjeado');
+    });
+
+    test('should reject unknown offline policies', () => {
+      expect(() => station(cajaA, 'caja-a', { offlinePolicy: 'maybe' }))
+        .toThrow('Política de canje sin conexión desconocida: maybe');
+    });
+  });
+});
+'''
+
+with open('tito-casino-system/tests/integration/redemption-coordinator.test.js', 'w') as f:
+    f.write(redemption_coordinator_test)
+
 print("✅ Servicio de Supabase creado")
\ No newline at end of file
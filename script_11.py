@@ -5,27 +5,53 @@ main_js = '''// src/main/main.js
 const { app, BrowserWindow, ipcMain, Menu } = require('electron');
 const path = require('path');
 const fs = require('fs');
+const { SYNC_CONFIG, ARCHIVE_CONFIG } = require('../shared/constants');
 
 // Importar servicios
-const SQLiteDB = require('./database/sqlite');
+const SQLiteClient = require('./database/sqlite-client');
 const SupabaseSync = require('./database/supabase');
+const SyncEngine = require('./database/sync-engine');
+const PullEngine = require('./database/pull-engine');
+const RedemptionCoordinator = require('./database/redemption-coordinator');
+const TicketArchiver = require('./database/ticket-archiver');
 const PrinterService = require('./hardware/printer');
+const PrintQueue = require('./hardware/print-queue');
 const QRReaderService = require('./hardware/qr-reader');
-const { generateTicketQR, generateTicketNumber, validateTicketQR, parseTicketQR } = require('./utils/qr-generator');
-const { generateTicketPDF } = require('./utils/pdf-generator');
+const { verifyTicketQR } = require('./utils/qr-generator');
+const { StatsPublisher, buildStatsDelta } = require('./utils/stats-publisher');
+const TicketEmitter = require('./utils/ticket-emitter');
+const TicketIndex = require('./utils/ticket-index');
+const TicketRedeemer = require('./utils/ticket-redeemer');
+const ScanDedupCache = require('./utils/scan-dedup');
 
 // Variables globales
 let mainWindow;
 let db;
 let supabaseSync;
+let syncEngine;
+let pullEngine;
+let ticketArchiver;
 let printer;
+let printQueue;
+let printQueueStart = null;
+let ticketEmitter;
+let ticketIndex;
+let ticketRedeemer;
+let redemptionCoordinator;
 let qrReader;
 let syncInterval;
+let pullInterval;
+let archiveInterval;
+let statsPublisher;
+
+// Validaciones en curso por contenido del QR
+const validationRuns = new ScanDedupCache();
 
 // Configuración de la aplicación
 const APP_CONFIG = {
   isDev: process.env.NODE_ENV === 'development',
   syncIntervalMs: 5 * 60 * 1000, // 5 minutos
+  statsMaxPerSecond: 4, // Máximo de eventos 'stats-updated' por segundo
   windowConfig: {
     width: 1024,
     height: 768,
@@ -69,6 +95,13 @@ function createWindow() {
     }
   }
 
+  // Los trabajos recuperados se imprimen cuando el renderer ya puede recibir su estado
+  mainWindow.webContents.once('did-finish-load', () => {
+    startPrintQueue().catch(error => {
+      console.error('Error iniciando la cola de impresión:', error.message);
+    });
+  });
+
   // Mostrar ventana cuando esté lista
   mainWindow.once('ready-to-show', () => {
     mainWindow.show();
@@ -84,6 +117,22 @@ function createWindow() {
   createApplicationMenu();
 }
 
+/**
+ * Recupera los trabajos de impresión pendientes y arranca la cola (una sola vez,
+ * aunque se vuelva a crear la ventana)
+ * @returns {Promise<void>}
+ */
+function startPrintQueue() {
+  if (!printQueueStart) {
+    printQueueStart = printQueue.start().then(recovered => {
+      if (recovered > 0) {
+        console.log(`🖨️  ${recovered} trabajos de impresión recuperados`);
+      }
+    });
+  }
+  return printQueueStart;
+}
+
 /**
  * Crea el menú de la aplicación
  */
@@ -173,12 +222,42 @@ async function initializeServices() {
   console.log('Inicializando servicios...');
   
   try {
-    // 1. Inicializar base de datos SQLite
-    db = new SQLiteDB();
+    // 1. Inicializar base de datos SQLite (en worker_threads, fuera del event loop)
+    db = new SQLiteClient();
+    await db.ready();
     console.log('✅ SQLite inicializado');
 
+    // Índice en memoria de tickets canjeables para validar escaneos sin ir a disco
+    ticketIndex = new TicketIndex(db);
+    const indexed = await ticketIndex.warm();
+    console.log(`✅ Índice de tickets cargado: ${indexed.open} abiertos, ${indexed.closed} cerrados`);
+
+    // Canje con compare-and-set en SQLite (verificación del QR y cambio de estado en un paso)
+    ticketRedeemer = new TicketRedeemer(db);
+
+    // Publicar cambios de estadísticas al renderer (sin polling)
+    statsPublisher = new StatsPublisher((payload) => {
+      if (mainWindow) {
+        mainWindow.webContents.send('stats-updated', payload);
+      }
+    }, { maxPerSecond: APP_CONFIG.statsMaxPerSecond });
+
     // 2. Inicializar Supabase
     supabaseSync = new SupabaseSync();
+    syncEngine = new SyncEngine(db, supabaseSync);
+    // Con servidor central, el canje se decide allí para todas las cajas
+    if (supabaseSync.isAvailable()) {
+      redemptionCoordinator = new RedemptionCoordinator(db, supabaseSync);
+    }
+    // Tickets de otras estaciones: índice y estadísticas se actualizan por página aplicada
+    pullEngine = new PullEngine(db, supabaseSync, {
+      onChanges: (changes) => {
+        changes.forEach(({ ticket, previousEstado }) => {
+          ticketIndex.add(ticket);
+          statsPublisher.publish(buildStatsDelta(ticket, previousEstado, ticket.estado));
+        });
+      }
+    });
     if (supabaseSync.isAvailable()) {
       const connected = await supabaseSync.testConnection();
       if (connected) {
@@ -192,6 +271,19 @@ async function initializeServices() {
     printer = new PrinterService();
     console.log('✅ Servicio de impresión inicializado');
 
+    // Cola persistente: imprime en segundo plano y notifica cada trabajo al renderer
+    printQueue = new PrintQueue(db, printer);
+    printQueue.on('status', (status) => {
+      if (status.error) {
+        console.warn(`⚠️  Impresión de ${status.ticket_number} (${status.estado}): ${status.error}`);
+      }
+      if (mainWindow) {
+        mainWindow.webContents.send('print-status', status);
+      }
+    });
+    ticketEmitter = new TicketEmitter(db);
+    // La cola arranca con la ventana (startPrintQueue), cuando ya hay quien reciba 'print-status'
+
     // 4. Inicializar lector QR
     qrReader = new QRReaderService();
     await qrReader.init();
@@ -207,11 +299,22 @@ async function initializeServices() {
     
     console.log('✅ Lector QR inicializado');
 
+    // Archivo de tickets cerrados: mantiene pequeña la tabla activa
+    ticketArchiver = new TicketArchiver(db);
+    archiveInterval = setInterval(performArchive, ARCHIVE_CONFIG.INTERVAL_MS);
+    performArchive();
+
     // 5. Configurar sincronización periódica
     if (supabaseSync.isAvailable()) {
       syncInterval = setInterval(async () => {
         await performSync();
       }, APP_CONFIG.syncIntervalMs);
+
+      // Descarga frecuente para validar localmente tickets de otras estaciones
+      pullInterval = setInterval(async () => {
+        await performPull();
+      }, SYNC_CONFIG.PULL_INTERVAL_MS);
+      performPull();
       console.log('✅ Sincronización periódica configurada');
     }
 
@@ -233,26 +336,17 @@ async function performSync() {
 
   try {
     console.log('Iniciando sincronización...');
-    const unsyncedTickets = db.getUnsyncedTickets();
+    // Recorre el backlog por páginas; cada página se confirma de forma atómica
+    const result = await syncEngine.run();
     
-    if (unsyncedTickets.length > 0) {
-      const result = await supabaseSync.syncTickets(unsyncedTickets);
-      
-      if (result.synced > 0) {
-        // Marcar tickets como sincronizados
-        const syncedIds = unsyncedTickets
-          .slice(0, result.synced)
-          .map(ticket => ticket.id);
-        db.markAsSynced(syncedIds);
-        
-        console.log(`✅ Sincronización completada: ${result.synced} tickets`);
-      }
-      
-      if (result.errors.length > 0) {
-        console.warn(`⚠️  Errores en sincronización: ${result.errors.length}`);
-      }
-    } else {
+    if (result.pages === 0) {
       console.log('No hay tickets para sincronizar');
+    } else {
+      console.log(`✅ Sincronización completada: ${result.synced} tickets en ${result.pages} páginas`);
+    }
+    
+    if (result.failed > 0) {
+      console.warn(`⚠️  Tickets con error en sincronización: ${result.failed}`);
     }
 
   } catch (error) {
@@ -260,73 +354,101 @@ async function performSync() {
   }
 }
 
-// === MANEJADORES IPC ===
-
 /**
- * Maneja la generación de tickets
+ * Descarga de Supabase los tickets modificados en otras estaciones
  */
-ipcMain.handle('generate-ticket', async (event, ticketData) => {
+async function performPull() {
+  if (!supabaseSync.isAvailable()) {
+    return;
+  }
+
   try {
-    console.log('Generando ticket:', ticketData);
+    const result = await pullEngine.run();
 
-    // Validar datos de entrada
-    if (!ticketData.valor || !ticketData.moneda) {
-      throw new Error('Datos de ticket incompletos');
+    if (result.applied > 0) {
+      console.log(`⬇️  Descarga completada: ${result.applied} tickets aplicados en ${result.pages} páginas`);
     }
 
-    if (ticketData.valor <= 0) {
-      throw new Error('El valor debe ser mayor que cero');
-    }
+  } catch (error) {
+    // Sin conexión: la Caja sigue validando con los datos locales
+    console.warn('Error descargando tickets:', error.message);
+  }
+}
 
-    if (!['DOP', 'USD'].includes(ticketData.moneda)) {
-      throw new Error('Moneda inválida');
+/**
+ * Archiva tickets cerrados y sincronizados antiguos (por lotes, sin bloquear la emisión)
+ */
+async function performArchive() {
+  try {
+    const result = await ticketArchiver.run();
+
+    if (result.archived > 0) {
+      console.log(`🗄️  ${result.archived} tickets archivados en ${result.chunks} lotes`);
     }
 
-    // Generar número único de ticket
-    const ticketNumber = generateTicketNumber(ticketData.mesa_id);
-    const fechaEmision = new Date().toISOString();
+  } catch (error) {
+    console.warn('Error archivando tickets:', error.message);
+  }
+}
 
-    // Generar código QR
-    const qrResult = await generateTicketQR({
-      id: ticketNumber,
-      valor: ticketData.valor,
-      moneda: ticketData.moneda,
-      fecha: fechaEmision
-    });
+// === MANEJADORES IPC ===
 
-    // Guardar en base de datos local
-    const ticket = await db.createTicket({
-      ticket_number: ticketNumber,
-      valor: ticketData.valor,
-      moneda: ticketData.moneda,
-      qr_data: qrResult.qrString,
-      mesa_id: ticketData.mesa_id || null,
-      usuario_emision: ticketData.usuario_emision || null,
-      hash_seguridad: qrResult.hash
-    });
+/**
+ * Emite tickets: los guarda con sus trabajos de impresión y publica estadísticas
+ * @param {Array<Object>} requests - Datos de los tickets a emitir
+ * @returns {Promise<Object>} Resultado de TicketEmitter.emit
+ */
+async function emitTickets(requests) {
+  // Rechazar si la impresora no está drenando la cola (atasco, sin papel)
+  if (!(await printQueue.hasRoom(requests.length))) {
+    throw new Error('Cola de impresión llena: revise la impresora');
+  }
 
-    // Generar PDF del ticket
-    const pdfBuffer = await generateTicketPDF({
-      ticket_number: ticketNumber,
-      valor: ticketData.valor,
-      moneda: ticketData.moneda,
-      fecha_emision: fechaEmision,
-      qr_code: qrResult.qrCode,
-      mesa_id: ticketData.mesa_id,
-      usuario_emision: ticketData.usuario_emision
-    });
+  const result = await ticketEmitter.emit(requests);
+  result.tickets.forEach(ticket => {
+    ticketIndex.add(ticket);
+    statsPublisher.publish(buildStatsDelta(ticket, null, ticket.estado));
+  });
+
+  // La impresión continúa en segundo plano; el resultado llega por 'print-status'
+  printQueue.kick();
+
+  const { timings } = result;
+  console.log(
+    `✅ ${result.tickets.length} ticket(s) generados y encolados ` +
+    `(qr ${timings.qr.toFixed(1)} ms, commit ${timings.commit.toFixed(1)} ms, total ${timings.total.toFixed(1)} ms)`
+  );
+
+  return result;
+}
+
+/**
+ * Convierte un ticket emitido en la respuesta IPC
+ */
+function toEmissionResponse(ticket, jobId) {
+  return {
+    ticket_number: ticket.ticket_number,
+    ticket_id: ticket.id,
+    valor: ticket.valor,
+    moneda: ticket.moneda,
+    print_job_id: jobId
+  };
+}
 
-    // Imprimir ticket
-    await printer.printTicket(pdfBuffer);
+/**
+ * Maneja la generación de tickets
+ */
+ipcMain.handle('generate-ticket', async (event, ticketData) => {
+  try {
+    console.log('Generando ticket:', ticketData);
 
-    console.log(`✅ Ticket ${ticketNumber} generado e impreso exitosamente`);
+    const result = await emitTickets([ticketData]);
 
     return {
       success: true,
-      ticket_number: ticketNumber,
-      ticket_id: ticket.id,
-      valor: ticketData.valor,
-      moneda: ticketData.moneda
+      ...toEmissionResponse(result.tickets[0], result.jobIds[0]),
+      print_queue_depth: await printQueue.getDepth(),
+      timings: result.timings
     };
 
   } catch (error) {
@@ -339,25 +461,63 @@ ipcMain.handle('generate-ticket', async (event, ticketData) => {
 });
 
 /**
- * Maneja la validación de tickets escaneados
+ * Genera varios tickets en una sola solicitud (p. ej. varios tickets para un jugador).
+ * Todos se guardan en una única transacción: se emiten todos o ninguno.
+ */
+ipcMain.handle('generate-tickets', async (event, ticketsData) => {
+  try {
+    console.log(`Generando ${Array.isArray(ticketsData) ? ticketsData.length : 0} tickets`);
+
+    const result = await emitTickets(ticketsData);
+
+    return {
+      success: true,
+      tickets: result.tickets.map((ticket, index) => toEmissionResponse(ticket, result.jobIds[index])),
+      print_queue_depth: await printQueue.getDepth(),
+      timings: result.timings
+    };
+
+  } catch (error) {
+    console.error('Error generando tickets:', error.message);
+    return {
+      success: false,
+      error: error.message
+    };
+  }
+});
+
+/**
+ * Valida un ticket escaneado
+ * @param {string} qrString - Contenido del QR
+ * @returns {Promise<Object>} { success, ticket, source } o { success: false, error }
  */
-ipcMain.handle('validate-ticket', async (event, qrString) => {
+async function validateTicket(qrString) {
   try {
     console.log('Validando ticket:', qrString);
 
-    // Validar formato y hash del QR
-    if (!validateTicketQR(qrString)) {
+    // Validar formato y hash del QR (un solo parseo; devuelve los datos del ticket)
+    const verification = verifyTicketQR(qrString);
+    if (!verification.valid) {
       return {
         success: false,
         error: 'Código QR inválido o alterado'
       };
     }
 
-    // Parsear datos del QR
-    const qrData = parseTicketQR(qrString);
+    const qrData = verification.ticket;
+
+    // Tickets abiertos se responden desde memoria
+    const entry = ticketIndex.lookup(qrData.id);
+    if (entry.status === 'open') {
+      return {
+        success: true,
+        ticket: entry.ticket,
+        source: 'local'
+      };
+    }
 
-    // Buscar ticket en base de datos local
-    const ticket = db.findTicketByNumber(qrData.id);
+    // Posible ticket cerrado: confirmar en SQLite (el filtro Bloom admite falsos positivos)
+    const ticket = entry.status === 'closed' ? await db.findTicketByNumber(qrData.id) : null;
 
     if (!ticket) {
       // Intentar buscar en Supabase si está disponible
@@ -365,20 +525,24 @@ ipcMain.handle('validate-ticket', async (event, qrString) => {
         try {
           const remoteTicket = await supabaseSync.getTicketByNumber(qrData.id);
           if (remoteTicket) {
-            // Agregar ticket a base local para futura referencia
-            await db.createTicket({
-              ticket_number: remoteTicket.ticket_number,
-              valor: remoteTicket.valor,
-              moneda: remoteTicket.moneda,
-              qr_data: remoteTicket.qr_data,
-              mesa_id: remoteTicket.mesa_id,
-              usuario_emision: remoteTicket.usuario_emision,
-              hash_seguridad: remoteTicket.hash_seguridad
+            // Copia local con el estado remoto y marcada como sincronizada (igual que una descarga)
+            const changes = await db.applyRemoteTickets([remoteTicket]);
+            changes.forEach(({ ticket: applied, previousEstado }) => {
+              ticketIndex.add(applied);
+              statsPublisher.publish(buildStatsDelta(applied, previousEstado, applied.estado));
             });
 
+            const localTicket = await db.findTicketByNumber(remoteTicket.ticket_number);
+            if (localTicket.estado !== 'emitido') {
+              return {
+                success: false,
+                error: `Ticket ya ${localTicket.estado}`
+              };
+            }
+
             return {
               success: true,
-              ticket: remoteTicket,
+              ticket: localTicket,
               source: 'remote'
             };
           }
@@ -413,6 +577,14 @@ ipcMain.handle('validate-ticket', async (event, qrString) => {
       error: `Error de validación: ${error.message}`
     };
   }
+}
+
+/**
+ * Maneja la validación de tickets escaneados. Lecturas repetidas del mismo QR
+ * mientras su validación está en curso reciben el mismo resultado.
+ */
+ipcMain.handle('validate-ticket', (event, qrString) => {
+  return validationRuns.run(String(qrString), () => validateTicket(qrString));
 });
 
 /**
@@ -422,30 +594,46 @@ ipcMain.handle('process-payment', async (event, paymentData) => {
   try {
     console.log('Procesando pago:', paymentData);
 
-    const { ticket_number, usuario_canje } = paymentData;
+    const { qr_data, usuario_canje } = paymentData;
 
-    if (!ticket_number) {
-      throw new Error('Número de ticket requerido');
+    // Sin QR no hay HMAC que verificar: solo se paga el código escaneado
+    if (!qr_data) {
+      throw new Error('Código QR requerido: escanee el ticket para pagarlo');
     }
 
-    // Actualizar estado del ticket
-    const result = db.updateTicketStatus(ticket_number, 'canjeado', usuario_canje);
+    // Verificación del QR, control de estado y canje en una sola operación:
+    // si dos cajas pagan el mismo ticket, solo una obtiene la fila canjeada.
+    // Con Supabase configurado, el canje central decide entre estaciones.
+    const redeemer = redemptionCoordinator || ticketRedeemer;
+    const result = await redeemer.redeem(qr_data, usuario_canje);
 
-    if (result.changes > 0) {
-      console.log(`✅ Ticket ${ticket_number} canjeado exitosamente`);
-      
-      return {
-        success: true,
-        message: 'Pago procesado exitosamente',
-        ticket_number: ticket_number
-      };
-    } else {
+    if (!result.success) {
       return {
         success: false,
-        error: 'No se pudo actualizar el ticket'
+        error: result.error,
+        reason: result.reason
       };
     }
 
+    const ticket = result.ticket;
+    const rebuild = ticketIndex.markClosed(ticket.ticket_number);
+    if (rebuild) {
+      rebuild.catch(error => console.warn('⚠️  Error reconstruyendo índice de tickets:', error.message));
+    }
+    statsPublisher.publish(buildStatsDelta(ticket, 'emitido', 'canjeado'));
+    if (result.offline) {
+      console.warn(`⚠️  Ticket ${ticket.ticket_number} canjeado sin conexión con el servidor central`);
+    } else {
+      console.log(`✅ Ticket ${ticket.ticket_number} canjeado exitosamente`);
+    }
+
+    return {
+      success: true,
+      message: 'Pago procesado exitosamente',
+      ticket_number: ticket.ticket_number,
+      offline: !!result.offline
+    };
+
   } catch (error) {
     console.error('Error procesando pago:', error.message);
     return {
@@ -461,7 +649,7 @@ ipcMain.handle('process-payment', async (event, paymentData) => {
 ipcMain.handle('get-stats', async (event, dateRange) => {
   try {
     const { dateFrom, dateTo } = dateRange || {};
-    const stats = db.getTicketStats(dateFrom, dateTo);
+    const stats = await db.getTicketStats(dateFrom, dateTo);
     
     return {
       success: true,
@@ -477,12 +665,91 @@ ipcMain.handle('get-stats', async (event, dateRange) => {
   }
 });
 
+/**
+ * Estado de la cola de impresión
+ */
+ipcMain.handle('get-print-queue-status', async () => {
+  try {
+    return {
+      success: true,
+      depth: await printQueue.getDepth(),
+      max_depth: printQueue.maxDepth
+    };
+
+  } catch (error) {
+    console.error('Error obteniendo estado de la cola de impresión:', error.message);
+    return {
+      success: false,
+      error: error.message
+    };
+  }
+});
+
+/**
+ * Reintenta un trabajo de impresión fallido (reimpresión manual)
+ */
+ipcMain.handle('retry-print-job', async (event, jobId) => {
+  try {
+    if (!(await db.retryPrintJob(jobId))) {
+      throw new Error('Trabajo de impresión no encontrado o no fallido');
+    }
+    printQueue.kick();
+
+    return {
+      success: true,
+      depth: await printQueue.getDepth()
+    };
+
+  } catch (error) {
+    console.error('Error reintentando impresión:', error.message);
+    return {
+      success: false,
+      error: error.message
+    };
+  }
+});
+
+/**
+ * Obtiene una página de tickets por rango de fechas (reportes y exportaciones).
+ * El renderer pide la siguiente página enviando el nextCursor recibido.
+ */
+ipcMain.handle('get-tickets-page', async (event, request) => {
+  try {
+    const { dateFrom, dateTo, estado, cursor, pageSize, order } = request || {};
+
+    if (!dateFrom || !dateTo) {
+      throw new Error('Rango de fechas requerido');
+    }
+
+    const page = await db.getTicketsPageByDateRange(dateFrom, dateTo, {
+      estado,
+      cursor,
+      pageSize: Math.min(pageSize || 500, 1000),
+      order
+    });
+
+    return {
+      success: true,
+      tickets: page.tickets,
+      nextCursor: page.nextCursor
+    };
+
+  } catch (error) {
+    console.error('Error obteniendo página de tickets:', error.message);
+    return {
+      success: false,
+      error: error.message
+    };
+  }
+});
+
 /**
  * Fuerza sincronización manual
  */
 ipcMain.handle('force-sync', async (event) => {
   try {
     await performSync();
+    await performPull();
     return {
       success: true,
       message: 'Sincronización completada'
@@ -532,7 +799,7 @@ app.on('before-quit', () => {
 /**
  * Limpia recursos antes de cerrar la aplicación
  */
-function cleanup() {
+async function cleanup() {
   console.log('Limpiando recursos...');
   
   try {
@@ -540,10 +807,26 @@ function cleanup() {
       clearInterval(syncInterval);
     }
     
+    if (pullInterval) {
+      clearInterval(pullInterval);
+    }
+    
+    if (archiveInterval) {
+      clearInterval(archiveInterval);
+    }
+    
+    if (statsPublisher) {
+      statsPublisher.close();
+    }
+    
     if (qrReader) {
       qrReader.close();
     }
     
+    if (printQueue) {
+      printQueue.stop();
+    }
+    
     if (printer) {
       printer.close();
     }
@@ -553,7 +836,7 @@ function cleanup() {
     }
     
     if (db) {
-      db.close();
+      await db.close();
     }
     
     console.log('✅ Limpieza completada');
@@ -578,4 +861,1120 @@ process.on('uncaughtException', (error) => {
 with open('tito-casino-system/src/main/main.js', 'w') as f:
     f.write(main_js)
 
+# Publicador de estadísticas por IPC (push con coalescencia)
+stats_publisher_js = '''// src/main/utils/stats-publisher.js
+const { TICKET_STATES } = require('../../shared/constants');
+
+/**
+ * Aporte de un ticket en un estado dado a las estadísticas de getTicketStats
+ * @param {Object} ticket - Ticket con valor y moneda
+ * @param {string|null} estado - Estado del ticket (null = no existe)
+ * @returns {Object} Contadores y valores aportados
+ */
+function statsContribution(ticket, estado) {
+  const suffix = ticket.moneda === 'DOP' ? 'dop' : 'usd';
+  const contribution = {};
+
+  if (!estado) {
+    return contribution;
+  }
+
+  contribution[`valor_total_${suffix}`] = ticket.valor;
+
+  if (estado === TICKET_STATES.EMITIDO) {
+    contribution.total_emitidos = 1;
+    contribution[`valor_pendiente_${suffix}`] = ticket.valor;
+  } else if (estado === TICKET_STATES.CANJEADO) {
+    contribution.total_canjeados = 1;
+    contribution[`valor_canjeado_${suffix}`] = ticket.valor;
+  } else if (estado === TICKET_STATES.ANULADO) {
+    contribution.total_anulados = 1;
+  }
+
+  return contribution;
+}
+
+/**
+ * Día (UTC, YYYY-MM-DD) en que cuenta un ticket, igual que date(fecha_emision)
+ * en ticket_stats_daily
+ * @param {Object} ticket - Ticket con fecha_emision
+ * @returns {string} Día de emisión
+ */
+function statsDay(ticket) {
+  return new Date(String(ticket.fecha_emision).replace(' ', 'T').replace(/(T[\\d:.]+)$/, '$1Z'))
+    .toISOString()
+    .split('T')[0];
+}
+
+/**
+ * Calcula el delta de estadísticas de una transición de estado de un ticket
+ * @param {Object} ticket - Ticket con valor, moneda y fecha_emision
+ * @param {string|null} fromEstado - Estado anterior (null si es un ticket nuevo)
+ * @param {string} toEstado - Estado nuevo
+ * @returns {Object} { fecha, delta } día de emisión del ticket y solo los campos que cambian
+ */
+function buildStatsDelta(ticket, fromEstado, toEstado) {
+  const delta = {};
+  const before = statsContribution(ticket, fromEstado);
+  const after = statsContribution(ticket, toEstado);
+
+  for (const key of new Set([...Object.keys(before), ...Object.keys(after)])) {
+    const value = (after[key] || 0) - (before[key] || 0);
+    if (value !== 0) {
+      delta[key] = value;
+    }
+  }
+
+  return { fecha: statsDay(ticket), delta };
+}
+
+/**
+ * Publica cambios de estadísticas al renderer agrupando deltas,
+ * con un máximo de `maxPerSecond` envíos por segundo.
+ */
+class StatsPublisher {
+  constructor(send, options = {}) {
+    this.send = send;
+    this.minIntervalMs = 1000 / (options.maxPerSecond || 4);
+    this.pending = new Map(); // fecha -> delta acumulado
+    this.timer = null;
+    this.lastFlush = 0;
+  }
+
+  /**
+   * Agrega un delta y programa el envío
+   * @param {Object} change - { fecha, delta } de buildStatsDelta
+   */
+  publish({ fecha, delta }) {
+    // Se acumula por día de emisión: canjear un ticket de otro día no toca los contadores de hoy
+    if (!this.pending.has(fecha)) {
+      this.pending.set(fecha, {});
+    }
+
+    const pending = this.pending.get(fecha);
+    for (const [key, value] of Object.entries(delta)) {
+      pending[key] = (pending[key] || 0) + value;
+    }
+
+    if (!this.timer) {
+      const wait = Math.max(0, this.lastFlush + this.minIntervalMs - Date.now());
+      this.timer = setTimeout(() => this.flush(), wait);
+    }
+  }
+
+  /**
+   * Envía inmediatamente el delta acumulado
+   */
+  flush() {
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+
+    if (this.pending.size === 0) {
+      return;
+    }
+
+    const pending = this.pending;
+    this.pending = new Map();
+    this.lastFlush = Date.now();
+
+    for (const [fecha, delta] of pending) {
+      try {
+        this.send({ fecha, delta });
+      } catch (error) {
+        console.error('Error publicando estadísticas:', error.message);
+      }
+    }
+  }
+
+  /**
+   * Detiene el publicador descartando envíos programados
+   */
+  close() {
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+    this.pending.clear();
+  }
+}
+
+module.exports = {
+  StatsPublisher,
+  buildStatsDelta,
+  statsDay
+};
+'''
+
+with open('tito-casino-system/src/main/utils/stats-publisher.js', 'w') as f:
+    f.write(stats_publisher_js)
+
+bloom_filter_js = '''// src/main/utils/bloom-filter.js
+
+/**
+ * FNV-1a de 32 bits con semilla
+ * @param {string} value - Texto a resumir
+ * @param {number} seed - Semilla
+ * @returns {number} Hash sin signo
+ */
+function fnv1a(value, seed) {
+  let hash = (2166136261 ^ seed) >>> 0;
+  for (let i = 0; i < value.length; i++) {
+    hash ^= value.charCodeAt(i);
+    hash = Math.imul(hash, 16777619);
+  }
+  return hash >>> 0;
+}
+
+/**
+ * Filtro Bloom: pertenencia aproximada sin falsos negativos
+ */
+class BloomFilter {
+  /**
+   * @param {number} capacity - Elementos esperados
+   * @param {number} errorRate - Tasa de falsos positivos deseada con la capacidad llena
+   */
+  constructor(capacity, errorRate = 0.001) {
+    this.capacity = Math.max(1, capacity);
+    this.size = Math.ceil(-(this.capacity * Math.log(errorRate)) / (Math.LN2 * Math.LN2));
+    this.hashCount = Math.max(1, Math.round((this.size / this.capacity) * Math.LN2));
+    this.bits = new Uint8Array(Math.ceil(this.size / 8));
+    this.count = 0;
+  }
+
+  /**
+   * Posiciones de bit de un valor (doble hashing)
+   */
+  positions(value) {
+    const h1 = fnv1a(value, 0);
+    const h2 = (fnv1a(value, 0x9747b28c) | 1) >>> 0; // Impar y sin signo: posiciones nunca negativas
+    const positions = new Array(this.hashCount);
+    for (let i = 0; i < this.hashCount; i++) {
+      positions[i] = (h1 + i * h2) % this.size;
+    }
+    return positions;
+  }
+
+  /**
+   * @param {string} value - Valor a agregar
+   */
+  add(value) {
+    for (const position of this.positions(value)) {
+      this.bits[position >> 3] |= 1 << (position & 7);
+    }
+    this.count++;
+  }
+
+  /**
+   * @param {string} value - Valor a consultar
+   * @returns {boolean} False si seguro no está; true si probablemente está
+   */
+  has(value) {
+    for (const position of this.positions(value)) {
+      if ((this.bits[position >> 3] & (1 << (position & 7))) === 0) {
+        return false;
+      }
+    }
+    return true;
+  }
+
+  /**
+   * @returns {boolean} True si se superó la capacidad (la tasa de error ya no se garantiza)
+   */
+  isFull() {
+    return this.count >= this.capacity;
+  }
+}
+
+module.exports = BloomFilter;
+'''
+
+with open('tito-casino-system/src/main/utils/bloom-filter.js', 'w') as f:
+    f.write(bloom_filter_js)
+
+ticket_index_js = '''// src/main/utils/ticket-index.js
+const BloomFilter = require('./bloom-filter');
+
+const MIN_CLOSED_CAPACITY = 10000;
+
+/**
+ * Índice en memoria para validar escaneos en Caja:
+ * mapa de tickets abiertos (canjeables) y filtro Bloom de tickets cerrados.
+ * SQLite sigue siendo la fuente de verdad; el índice se carga al iniciar
+ * y se actualiza en cada emisión, canje y sincronización.
+ */
+class TicketIndex {
+  /**
+   * @param {SQLiteDB|SQLiteClient} db - Base de datos local (síncrona o en worker)
+   * @param {Object} options - { errorRate } del filtro Bloom
+   */
+  constructor(db, options = {}) {
+    this.db = db;
+    this.errorRate = options.errorRate || 0.001;
+    this.open = new Map();
+    this.closed = new BloomFilter(MIN_CLOSED_CAPACITY, this.errorRate);
+    this.rebuilding = null;
+    this.closedDuringRebuild = [];
+  }
+
+  /**
+   * Carga el índice desde SQLite
+   * @returns {Promise<Object>} { open, closed } cantidades indexadas
+   */
+  async warm() {
+    const tickets = await this.db.getOpenTickets();
+    this.open.clear();
+    for (const ticket of tickets) {
+      this.open.set(ticket.ticket_number, ticket);
+    }
+    await this.rebuildClosed();
+
+    return { open: this.open.size, closed: this.closed.count };
+  }
+
+  /**
+   * Reconstruye el filtro de cerrados con margen para crecer. Mientras se
+   * reconstruye, el filtro anterior sigue respondiendo y los cierres nuevos
+   * se agregan a ambos.
+   * @returns {Promise<void>}
+   */
+  rebuildClosed() {
+    if (!this.rebuilding) {
+      this.closedDuringRebuild = [];
+      this.rebuilding = this.loadClosed().finally(() => {
+        this.rebuilding = null;
+      });
+    }
+    return this.rebuilding;
+  }
+
+  async loadClosed() {
+    const count = await this.db.countClosedTickets();
+    const filter = new BloomFilter(Math.max(MIN_CLOSED_CAPACITY, count * 2), this.errorRate);
+    for await (const ticketNumber of this.db.iterateClosedTicketNumbers()) {
+      filter.add(ticketNumber);
+    }
+    this.closedDuringRebuild.forEach(ticketNumber => filter.add(ticketNumber));
+    this.closed = filter;
+  }
+
+  /**
+   * Registra un ticket nuevo o actualizado (emisión, sincronización)
+   * @param {Object} ticket - Fila de tickets
+   */
+  add(ticket) {
+    if (ticket.estado === 'emitido') {
+      this.open.set(ticket.ticket_number, ticket);
+    } else {
+      this.markClosed(ticket.ticket_number);
+    }
+  }
+
+  /**
+   * Marca un ticket como cerrado (canjeado o anulado). Debe llamarse después
+   * de confirmar el cambio en SQLite: si el filtro está lleno se reconstruye desde la base.
+   * @param {string} ticketNumber - Número del ticket
+   * @returns {Promise<void>|undefined} Reconstrucción en curso, si se inició una
+   */
+  markClosed(ticketNumber) {
+    this.open.delete(ticketNumber);
+    this.closed.add(ticketNumber);
+
+    if (this.rebuilding) {
+      this.closedDuringRebuild.push(ticketNumber);
+      return this.rebuilding;
+    }
+
+    if (this.closed.isFull()) {
+      return this.rebuildClosed();
+    }
+  }
+
+  /**
+   * Consulta un ticket
+   * @param {string} ticketNumber - Número del ticket
+   * @returns {Object} { status: 'open', ticket } | { status: 'closed' } (probable) | { status: 'unknown' }
+   */
+  lookup(ticketNumber) {
+    const ticket = this.open.get(ticketNumber);
+    if (ticket) {
+      return { status: 'open', ticket };
+    }
+
+    return { status: this.closed.has(ticketNumber) ? 'closed' : 'unknown' };
+  }
+}
+
+module.exports = TicketIndex;
+'''
+
+with open('tito-casino-system/src/main/utils/ticket-index.js', 'w') as f:
+    f.write(ticket_index_js)
+
+ticket_index_test = '''// tests/unit/ticket-index.test.js
+const SQLiteDB = require('../../src/main/database/sqlite');
+const TicketIndex = require('../../src/main/utils/ticket-index');
+const BloomFilter = require('../../src/main/utils/bloom-filter');
+
+describe('Ticket Index', () => {
+  describe('BloomFilter', () => {
+    test('should have no false negatives', () => {
+      const filter = new BloomFilter(1000);
+      for (let i = 0; i < 1000; i++) filter.add(`T${i}`);
+      
+      for (let i = 0; i < 1000; i++) {
+        expect(filter.has(`T${i}`)).toBe(true);
+      }
+    });
+
+    test('should keep false positives near the configured rate', () => {
+      const filter = new BloomFilter(1000, 0.01);
+      for (let i = 0; i < 1000; i++) filter.add(`T${i}`);
+      
+      let falsePositives = 0;
+      for (let i = 0; i < 10000; i++) {
+        if (filter.has(`X${i}`)) falsePositives++;
+      }
+      expect(falsePositives / 10000).toBeLessThan(0.03);
+    });
+  });
+
+  describe('TicketIndex', () => {
+    let db;
+    let index;
+
+    const createTicket = (number) => db.createTicket({
+      ticket_number: number,
+      valor: 100,
+      moneda: 'DOP',
+      qr_data: `${number}|100|DOP`
+    });
+
+    beforeEach(async () => {
+      db = new SQLiteDB(':memory:');
+      await createTicket('T1');
+      await createTicket('T2');
+      db.updateTicketStatus('T2', 'canjeado', 'Caja1');
+      index = new TicketIndex(db);
+    });
+
+    afterEach(() => {
+      db.close();
+    });
+
+    test('should warm open and closed tickets from SQLite', async () => {
+      await expect(index.warm()).resolves.toEqual({ open: 1, closed: 1 });
+      
+      expect(index.lookup('T1')).toMatchObject({ status: 'open', ticket: { ticket_number: 'T1' } });
+      expect(index.lookup('T2')).toEqual({ status: 'closed' });
+      expect(index.lookup('T999')).toEqual({ status: 'unknown' });
+    });
+
+    test('should answer lookups without touching SQLite', async () => {
+      await index.warm();
+      const spy = jest.spyOn(db, 'findTicketByNumber');
+      
+      index.lookup('T1');
+      index.lookup('T999');
+      
+      expect(spy).not.toHaveBeenCalled();
+    });
+
+    test('should follow emissions and redemptions', async () => {
+      await index.warm();
+      index.add(await createTicket('T3'));
+      expect(index.lookup('T3').status).toBe('open');
+      
+      db.updateTicketStatus('T3', 'canjeado', 'Caja1');
+      index.markClosed('T3');
+      expect(index.lookup('T3')).toEqual({ status: 'closed' });
+    });
+
+    test('should rebuild the closed filter from SQLite when it fills up', async () => {
+      await index.warm();
+      index.closed.count = index.closed.capacity;
+      
+      db.updateTicketStatus('T1', 'anulado');
+      await index.markClosed('T1');
+      
+      expect(index.closed.count).toBe(2);
+      expect(index.lookup('T1')).toEqual({ status: 'closed' });
+      expect(index.lookup('T2')).toEqual({ status: 'closed' });
+    });
+  });
+});
+'''
+
+with open('tito-casino-system/tests/unit/ticket-index.test.js', 'w') as f:
+    f.write(ticket_index_test)
+
+ticket_emitter_js = '''// src/main/utils/ticket-emitter.js
+const { generateTicketQR } = require('./qr-generator');
+const { TicketNumberGenerator } = require('./ticket-number');
+
+const MAX_TICKETS_PER_REQUEST = 20;
+
+/**
+ * Valida los datos de un ticket a emitir
+ * @param {Object} ticketData - { valor, moneda, mesa_id, usuario_emision }
+ */
+function validateTicketRequest(ticketData) {
+  if (!ticketData || !ticketData.valor || !ticketData.moneda) {
+    throw new Error('Datos de ticket incompletos');
+  }
+
+  if (ticketData.valor <= 0) {
+    throw new Error('El valor debe ser mayor que cero');
+  }
+
+  if (!['DOP', 'USD'].includes(ticketData.moneda)) {
+    throw new Error('Moneda inválida');
+  }
+}
+
+/**
+ * Milisegundos transcurridos desde un instante de process.hrtime.bigint()
+ */
+function elapsedMs(start) {
+  return Number(process.hrtime.bigint() - start) / 1e6;
+}
+
+/**
+ * Emisión de tickets por etapas: prepara número y QR de todos los tickets,
+ * y los guarda junto con sus trabajos de impresión en una sola transacción.
+ * La impresión queda a cargo de PrintQueue.
+ */
+class TicketEmitter {
+  /**
+   * @param {SQLiteDB} db - Base de datos local
+   * @param {Object} options - { maxPerRequest, numberGenerator, stationId }
+   */
+  constructor(db, options = {}) {
+    this.db = db;
+    this.maxPerRequest = options.maxPerRequest || MAX_TICKETS_PER_REQUEST;
+    this.numberGenerator = options.numberGenerator || new TicketNumberGenerator(db, { stationId: options.stationId });
+  }
+
+  /**
+   * Emite uno o varios tickets (todos o ninguno)
+   * @param {Array<Object>} requests - Datos de los tickets
+   * @returns {Promise<Object>} { tickets, jobIds, timings } con tiempos por etapa en ms
+   */
+  async emit(requests) {
+    const start = process.hrtime.bigint();
+
+    if (!Array.isArray(requests) || requests.length === 0) {
+      throw new Error('Se requiere al menos un ticket');
+    }
+
+    if (requests.length > this.maxPerRequest) {
+      throw new Error(`Máximo ${this.maxPerRequest} tickets por solicitud`);
+    }
+
+    requests.forEach(validateTicketRequest);
+    const timings = { validate: elapsedMs(start) };
+
+    // Etapa 1: números (una sola reserva en la secuencia del equipo) y QR de cada ticket.
+    // Si la transacción falla, los números reservados quedan sin usar.
+    let stageStart = process.hrtime.bigint();
+    const fechaEmision = new Date().toISOString();
+    const ticketNumbers = await this.numberGenerator.nextBatch(requests.length);
+    const entries = await Promise.all(requests.map((ticketData, i) => this.prepare(ticketData, ticketNumbers[i], fechaEmision)));
+    timings.qr = elapsedMs(stageStart);
+
+    // Etapa 2: tickets y trabajos de impresión en una transacción
+    stageStart = process.hrtime.bigint();
+    const created = await this.db.createTicketsWithPrintJobs(entries);
+    timings.commit = elapsedMs(stageStart);
+
+    timings.total = elapsedMs(start);
+
+    return {
+      tickets: created.map(entry => entry.ticket),
+      jobIds: created.map(entry => entry.jobId),
+      timings
+    };
+  }
+
+  /**
+   * Genera el QR de un ticket
+   * @returns {Promise<Object>} { ticket, payload } para createTicketsWithPrintJobs
+   */
+  async prepare(ticketData, ticketNumber, fechaEmision) {
+
+    // Solo hash y contenido: ni imagen PNG ni matriz (la impresión parte de qr_data)
+    const qrResult = await generateTicketQR({
+      id: ticketNumber,
+      valor: ticketData.valor,
+      moneda: ticketData.moneda,
+      fecha: fechaEmision
+    }, { preview: false, matrix: false });
+
+    return {
+      ticket: {
+        ticket_number: ticketNumber,
+        valor: ticketData.valor,
+        moneda: ticketData.moneda,
+        qr_data: qrResult.qrString,
+        mesa_id: ticketData.mesa_id || null,
+        usuario_emision: ticketData.usuario_emision || null,
+        hash_seguridad: qrResult.hash
+      },
+      payload: {
+        ticket_number: ticketNumber,
+        valor: ticketData.valor,
+        moneda: ticketData.moneda,
+        fecha_emision: fechaEmision,
+        qr_data: qrResult.qrString,
+        mesa_id: ticketData.mesa_id,
+        usuario_emision: ticketData.usuario_emision
+      }
+    };
+  }
+}
+
+module.exports = TicketEmitter;
+'''
+
+with open('tito-casino-system/src/main/utils/ticket-emitter.js', 'w') as f:
+    f.write(ticket_emitter_js)
+
+ticket_emitter_test = '''// tests/unit/ticket-emitter.test.js
+const SQLiteDB = require('../../src/main/database/sqlite');
+const TicketEmitter = require('../../src/main/utils/ticket-emitter');
+const { validateTicketQR } = require('../../src/main/utils/qr-generator');
+const { isValidTicketNumber } = require('../../src/main/utils/ticket-number');
+
+describe('TicketEmitter', () => {
+  let db;
+  let emitter;
+
+  beforeEach(() => {
+    db = new SQLiteDB(':memory:');
+    emitter = new TicketEmitter(db, { maxPerRequest: 5, stationId: 1 });
+  });
+
+  afterEach(() => {
+    db.close();
+  });
+
+  test('should emit several tickets with their print jobs in one request', async () => {
+    const result = await emitter.emit([
+      { valor: 100, moneda: 'DOP', mesa_id: 1, usuario_emision: 'Mesa1' },
+      { valor: 50, moneda: 'USD', mesa_id: 1, usuario_emision: 'Mesa1' },
+      { valor: 25, moneda: 'DOP', mesa_id: 1, usuario_emision: 'Mesa1' }
+    ]);
+    
+    expect(result.tickets.map(t => t.valor)).toEqual([100, 50, 25]);
+    expect(result.tickets.map(t => t.ticket_number)).toEqual(
+      result.tickets.map(t => t.ticket_number).sort()
+    );
+    result.tickets.forEach(ticket => {
+      expect(isValidTicketNumber(ticket.ticket_number)).toBe(true);
+    });
+    expect(result.jobIds).toHaveLength(3);
+    expect(db.getPrintQueueDepth()).toBe(3);
+    expect(db.getNextPrintJob().payload.ticket_number).toBe(result.tickets[0].ticket_number);
+    result.tickets.forEach(ticket => {
+      expect(validateTicketQR(ticket.qr_data)).toBe(true);
+    });
+  });
+
+  test('should report per-stage timings', async () => {
+    const { timings } = await emitter.emit([{ valor: 100, moneda: 'DOP' }]);
+    
+    expect(Object.keys(timings)).toEqual(['validate', 'qr', 'commit', 'total']);
+    expect(timings.total).toBeGreaterThanOrEqual(timings.qr + timings.commit);
+  });
+
+  test('should emit nothing if any ticket in the request is invalid', async () => {
+    await expect(emitter.emit([
+      { valor: 100, moneda: 'DOP' },
+      { valor: 100, moneda: 'EUR' }
+    ])).rejects.toThrow('Moneda inválida');
+    
+    expect(db.getTicketStats().total_emitidos).toBe(0);
+    expect(db.getPrintQueueDepth()).toBe(0);
+  });
+
+  test('should enforce the per-request limit', async () => {
+    const requests = Array.from({ length: 6 }, () => ({ valor: 1, moneda: 'DOP' }));
+    
+    await expect(emitter.emit(requests)).rejects.toThrow('Máximo 5 tickets por solicitud');
+    await expect(emitter.emit([])).rejects.toThrow('Se requiere al menos un ticket');
+  });
+});
+'''
+
+with open('tito-casino-system/tests/unit/ticket-emitter.test.js', 'w') as f:
+    f.write(ticket_emitter_test)
+
+stats_publisher_test = '''// tests/unit/stats-publisher.test.js
+const { StatsPublisher, buildStatsDelta, statsDay } = require('../../src/main/utils/stats-publisher');
+
+describe('Stats Publisher', () => {
+  const fecha_emision = '2025-10-12 08:00:00';
+
+  describe('buildStatsDelta', () => {
+    test('should count a new ticket as emitted and pending', () => {
+      const { fecha, delta } = buildStatsDelta({ valor: 100, moneda: 'DOP', fecha_emision }, null, 'emitido');
+      
+      expect(fecha).toBe('2025-10-12');
+      expect(delta).toEqual({
+        total_emitidos: 1,
+        valor_total_dop: 100,
+        valor_pendiente_dop: 100
+      });
+    });
+
+    test('should move value from pending to redeemed on payment', () => {
+      const { delta } = buildStatsDelta({ valor: 25, moneda: 'USD', fecha_emision }, 'emitido', 'canjeado');
+      
+      expect(delta).toEqual({
+        total_emitidos: -1,
+        valor_pendiente_usd: -25,
+        total_canjeados: 1,
+        valor_canjeado_usd: 25
+      });
+    });
+
+    test('should use the UTC emission day like ticket_stats_daily', () => {
+      expect(statsDay({ fecha_emision: '2025-10-12 23:59:59' })).toBe('2025-10-12');
+      expect(statsDay({ fecha_emision: '2025-10-12T22:30:00-04:00' })).toBe('2025-10-13');
+      expect(statsDay({ fecha_emision: '2025-10-12T08:00:00.000Z' })).toBe('2025-10-12');
+    });
+  });
+
+  describe('StatsPublisher', () => {
+    beforeEach(() => {
+      jest.useFakeTimers();
+    });
+
+    afterEach(() => {
+      jest.useRealTimers();
+    });
+
+    test('should coalesce bursts into at most maxPerSecond sends', () => {
+      const send = jest.fn();
+      const publisher = new StatsPublisher(send, { maxPerSecond: 2 });
+      
+      publisher.publish({ fecha: '2025-10-12', delta: { total_emitidos: 1 } });
+      jest.advanceTimersByTime(0);
+      expect(send).toHaveBeenCalledTimes(1);
+      
+      for (let i = 0; i < 10; i++) {
+        publisher.publish({ fecha: '2025-10-12', delta: { total_emitidos: 1, valor_total_dop: 10 } });
+      }
+      jest.advanceTimersByTime(499);
+      expect(send).toHaveBeenCalledTimes(1);
+      
+      jest.advanceTimersByTime(1);
+      expect(send).toHaveBeenCalledTimes(2);
+      expect(send.mock.calls[1][0].delta).toEqual({ total_emitidos: 10, valor_total_dop: 100 });
+    });
+
+    test('should keep deltas of different emission days apart', () => {
+      const send = jest.fn();
+      const publisher = new StatsPublisher(send);
+      
+      publisher.publish({ fecha: '2025-10-12', delta: { total_canjeados: 1 } });
+      publisher.publish({ fecha: '2025-10-01', delta: { total_canjeados: 1 } });
+      publisher.publish({ fecha: '2025-10-12', delta: { total_canjeados: 1 } });
+      jest.advanceTimersByTime(0);
+      
+      expect(send.mock.calls.map(([payload]) => payload)).toEqual([
+        { fecha: '2025-10-12', delta: { total_canjeados: 2 } },
+        { fecha: '2025-10-01', delta: { total_canjeados: 1 } }
+      ]);
+    });
+
+    test('should not send anything while idle', () => {
+      const send = jest.fn();
+      new StatsPublisher(send);
+      
+      jest.advanceTimersByTime(60000);
+      expect(send).not.toHaveBeenCalled();
+    });
+  });
+});
+'''
+
+with open('tito-casino-system/tests/unit/stats-publisher.test.js', 'w') as f:
+    f.write(stats_publisher_test)
+
+ticket_redeemer_js = '''// src/main/utils/ticket-redeemer.js
+const { TICKET_STATES } = require('../../shared/constants');
+const { verifyTicketQR } = require('./qr-generator');
+
+/**
+ * Canje de tickets en Caja en una sola operación: verifica el HMAC del QR
+ * y cambia el estado con un compare-and-set en SQLite (db.redeemTicket).
+ * Solo la primera caja que canjea un ticket obtiene la fila; el resto recibe
+ * el motivo del rechazo, consultado después del intento fallido.
+ */
+class TicketRedeemer {
+  /**
+   * @param {SQLiteDB|SQLiteClient} db - Base de datos local (síncrona o en worker)
+   * @param {Object} options - { verify } verificador de QR (por defecto verifyTicketQR)
+   */
+  constructor(db, options = {}) {
+    this.db = db;
+    this.verify = options.verify || verifyTicketQR;
+  }
+
+  /**
+   * Canjea el ticket de un QR escaneado
+   * @param {string} qrString - Contenido del QR
+   * @param {string} usuarioCanje - Usuario que canjea
+   * @returns {Promise<Object>} { success, ticket } o { success: false, reason, error, ticket }
+   */
+  async redeem(qrString, usuarioCanje = null) {
+    const verification = this.verify(qrString);
+    if (!verification.valid) {
+      return { success: false, reason: 'invalid_qr', error: 'Código QR inválido o alterado' };
+    }
+
+    const ticketNumber = verification.ticket.id;
+    const ticket = await this.db.redeemTicket(ticketNumber, usuarioCanje, qrString);
+    if (ticket) {
+      return { success: true, ticket };
+    }
+
+    return this.explainFailure(ticketNumber);
+  }
+
+  /**
+   * Explica por qué no se canjeó un ticket. Solo informa: el canje ya se decidió
+   * en la sentencia condicional, así que esta lectura no abre ninguna carrera.
+   * @param {string} ticketNumber - Número del ticket
+   * @returns {Promise<Object>} { success: false, reason, error, ticket }
+   */
+  async explainFailure(ticketNumber) {
+    const current = await this.db.findTicketByNumber(ticketNumber);
+
+    if (!current) {
+      return { success: false, reason: 'not_found', error: 'Ticket no encontrado en el sistema' };
+    }
+
+    if (current.estado !== TICKET_STATES.EMITIDO) {
+      return { success: false, reason: 'closed', error: `Ticket ya ${current.estado}`, ticket: current };
+    }
+
+    return { success: false, reason: 'qr_mismatch', error: 'El QR no corresponde al ticket registrado', ticket: current };
+  }
+}
+
+module.exports = TicketRedeemer;
+'''
+
+with open('tito-casino-system/src/main/utils/ticket-redeemer.js', 'w') as f:
+    f.write(ticket_redeemer_js)
+
+ticket_redeemer_test = '''// tests/unit/ticket-redeemer.test.js
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const SQLiteDB = require('../../src/main/database/sqlite');
+const TicketEmitter = require('../../src/main/utils/ticket-emitter');
+const TicketRedeemer = require('../../src/main/utils/ticket-redeemer');
+const { generateTicketQR } = require('../../src/main/utils/qr-generator');
+
+describe('TicketRedeemer', () => {
+  let db;
+  let redeemer;
+
+  const emitOne = async () => {
+    const { tickets } = await new TicketEmitter(db, { stationId: 1 }).emit([
+      { valor: 100, moneda: 'DOP', mesa_id: 1, usuario_emision: 'Mesa1' }
+    ]);
+    return tickets[0];
+  };
+
+  beforeEach(() => {
+    db = new SQLiteDB(':memory:');
+    redeemer = new TicketRedeemer(db);
+  });
+
+  afterEach(() => {
+    if (db) db.close();
+  });
+
+  test('should verify the QR and redeem the ticket in one call', async () => {
+    const ticket = await emitOne();
+
+    const result = await redeemer.redeem(ticket.qr_data, 'Caja1');
+
+    expect(result.success).toBe(true);
+    expect(result.ticket).toMatchObject({
+      ticket_number: ticket.ticket_number,
+      estado: 'canjeado',
+      usuario_canje: 'Caja1'
+    });
+  });
+
+  test('should redeem exactly once when several cashiers scan the same ticket', async () => {
+    const ticket = await emitOne();
+
+    const results = await Promise.all(
+      Array.from({ length: 10 }, (_, i) => redeemer.redeem(ticket.qr_data, `Caja${i}`))
+    );
+
+    expect(results.filter(r => r.success)).toHaveLength(1);
+    results.filter(r => !r.success).forEach(result => {
+      expect(result).toMatchObject({ reason: 'closed', error: 'Ticket ya canjeado' });
+    });
+  });
+
+  test('should reject a tampered QR without touching the database', async () => {
+    const ticket = await emitOne();
+    const redeemSpy = jest.spyOn(db, 'redeemTicket');
+
+    const last = ticket.qr_data.slice(-1);
+    const tampered = ticket.qr_data.slice(0, -1) + (last === 'A' ? 'B' : 'A');
+
+    const result = await redeemer.redeem(tampered, 'Caja1');
+
+    expect(result).toEqual({ success: false, reason: 'invalid_qr', error: 'Código QR inválido o alterado' });
+    expect(redeemSpy).not.toHaveBeenCalled();
+    expect(db.findTicketByNumber(ticket.ticket_number).estado).toBe('emitido');
+  });
+
+  test('should explain voided, unknown and mismatched tickets', async () => {
+    const voided = await emitOne();
+    db.updateTicketStatus(voided.ticket_number, 'anulado');
+    expect(await redeemer.redeem(voided.qr_data, 'Caja1'))
+      .toMatchObject({ success: false, reason: 'closed', error: 'Ticket ya anulado' });
+
+    const other = await emitOne();
+    const { qrString } = await generateTicketQR(
+      { id: other.ticket_number, valor: 5000, moneda: 'DOP', fecha: new Date().toISOString() },
+      { preview: false, matrix: false }
+    );
+    expect(await redeemer.redeem(qrString, 'Caja1'))
+      .toMatchObject({ success: false, reason: 'qr_mismatch' });
+    expect(db.findTicketByNumber(other.ticket_number).estado).toBe('emitido');
+
+    db.db.prepare('DELETE FROM tickets WHERE ticket_number = ?').run(other.ticket_number);
+    expect(await redeemer.redeem(other.qr_data, 'Caja1'))
+      .toEqual({ success: false, reason: 'not_found', error: 'Ticket no encontrado en el sistema' });
+  });
+
+  test('should redeem exactly once across connections to the same file', async () => {
+    db.close();
+    const dbPath = path.join(os.tmpdir(), `redeem-${process.pid}-${Date.now()}.db`);
+    db = new SQLiteDB(dbPath);
+    const otherCaja = new SQLiteDB(dbPath);
+    const ticket = await emitOne();
+
+    const first = await new TicketRedeemer(otherCaja).redeem(ticket.qr_data, 'Caja2');
+    const second = await redeemer.redeem(ticket.qr_data, 'Caja1');
+
+    expect(first.success).toBe(true);
+    expect(second).toMatchObject({ success: false, reason: 'closed' });
+    expect(db.findTicketByNumber(ticket.ticket_number).usuario_canje).toBe('Caja2');
+
+    otherCaja.close();
+    db.close();
+    db = null;
+    for (const file of [dbPath, dbPath.replace(/\\.db$/, '-archive.db')]) {
+      for (const suffix of ['', '-wal', '-shm']) {
+        if (fs.existsSync(file + suffix)) fs.unlinkSync(file + suffix);
+      }
+    }
+  });
+});
+'''
+
+with open('tito-casino-system/tests/unit/ticket-redeemer.test.js', 'w') as f:
+    f.write(ticket_redeemer_test)
+
+redeem_stress_bench = '''// tests/benchmarks/redeem-stress.bench.js
+// Uso: node tests/benchmarks/redeem-stress.bench.js [tickets] [cajas]
+// Varias cajas simuladas (un worker y una conexión SQLite por caja) intentan canjear
+// los mismos tickets en distinto orden. Comprueba que cada ticket se canjea una sola vez
+// con el canje atómico y mide canjes/s; como referencia repite la prueba con el flujo
+// anterior (leer el estado y luego actualizar), que admite canjes dobles.
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const { Worker, isMainThread, parentPort, workerData } = require('worker_threads');
+const SQLiteDB = require('../../src/main/database/sqlite');
+const TicketRedeemer = require('../../src/main/utils/ticket-redeemer');
+const { generateTicketQR } = require('../../src/main/utils/qr-generator');
+const { encodeTicketNumber } = require('../../src/main/utils/ticket-number');
+
+const TOTAL = parseInt(process.argv[2], 10) || 2000;
+const CASHIERS = parseInt(process.argv[3], 10) || 8;
+
+function elapsedMs(start) {
+  return Number(process.hrtime.bigint() - start) / 1e6;
+}
+
+/**
+ * Orden pseudoaleatorio reproducible por caja (xorshift32)
+ */
+function shuffled(items, seed) {
+  const result = [...items];
+  let state = seed || 1;
+  for (let i = result.length - 1; i > 0; i--) {
+    state ^= state << 13;
+    state ^= state >>> 17;
+    state ^= state << 5;
+    const j = (state >>> 0) % (i + 1);
+    [result[i], result[j]] = [result[j], result[i]];
+  }
+  return result;
+}
+
+/**
+ * Caja simulada: espera la señal de inicio y canjea todos los QR de su lista
+ */
+async function runCashier() {
+  const { dbPath, qrStrings, mode, cashier } = workerData;
+  const sqlite = new SQLiteDB(dbPath);
+  const redeemer = new TicketRedeemer(sqlite);
+  const usuario = `Caja${cashier}`;
+
+  parentPort.postMessage({ type: 'ready' });
+  await new Promise(resolve => parentPort.once('message', resolve));
+
+  const redeemed = [];
+  const start = process.hrtime.bigint();
+
+  for (const qrString of shuffled(qrStrings, cashier + 1)) {
+    if (mode === 'cas') {
+      const result = await redeemer.redeem(qrString, usuario);
+      if (result.success) {
+        redeemed.push(result.ticket.ticket_number);
+      }
+    } else {
+      // Flujo anterior: validación y pago como dos pasos separados
+      const ticketNumber = redeemer.verify(qrString).ticket.id;
+      const ticket = sqlite.findTicketByNumber(ticketNumber);
+      if (ticket && ticket.estado === 'emitido') {
+        const result = sqlite.updateTicketStatus(ticketNumber, 'canjeado', usuario);
+        if (result.changes > 0) {
+          redeemed.push(ticketNumber);
+        }
+      }
+    }
+  }
+
+  sqlite.close();
+  parentPort.postMessage({ type: 'done', redeemed, ms: elapsedMs(start) });
+}
+
+async function seed(dbPath) {
+  const sqlite = new SQLiteDB(dbPath);
+  const fecha = new Date().toISOString();
+  const tickets = [];
+
+  for (let i = 0; i < TOTAL; i++) {
+    const ticketNumber = encodeTicketNumber({ day: 1, stationId: 1 + (i % 3), sequence: i });
+    const { qrString, hash } = await generateTicketQR(
+      { id: ticketNumber, valor: 100, moneda: 'DOP', fecha },
+      { preview: false, matrix: false }
+    );
+    tickets.push({ ticket_number: ticketNumber, valor: 100, moneda: 'DOP', qr_data: qrString, mesa_id: 1, hash_seguridad: hash });
+  }
+
+  await sqlite.createTicketsBatch(tickets);
+  sqlite.close();
+  return tickets.map(ticket => ticket.qr_data);
+}
+
+async function runCase(mode) {
+  const dbPath = path.join(os.tmpdir(), `tito-redeem-${process.pid}-${Date.now()}.db`);
+  const qrStrings = await seed(dbPath);
+
+  // Las conexiones se abren de a una; todas las cajas arrancan juntas
+  const workers = [];
+  for (let cashier = 0; cashier < CASHIERS; cashier++) {
+    const worker = new Worker(__filename, { workerData: { dbPath, qrStrings, mode, cashier } });
+    await new Promise((resolve, reject) => {
+      worker.once('message', resolve);
+      worker.once('error', reject);
+    });
+    workers.push(worker);
+  }
+
+  const start = process.hrtime.bigint();
+  const results = await Promise.all(workers.map(worker => new Promise((resolve, reject) => {
+    worker.on('message', message => {
+      if (message.error) reject(new Error(message.error));
+      else if (message.type === 'done') resolve(message);
+    });
+    worker.once('error', reject);
+    worker.postMessage('go');
+  })));
+  const totalMs = elapsedMs(start);
+
+  const sqlite = new SQLiteDB(dbPath);
+  const canjeados = sqlite.db.prepare("SELECT COUNT(*) AS c FROM tickets WHERE estado = 'canjeado'").get().c;
+  sqlite.close();
+  for (const file of [dbPath, dbPath.replace(/\\.db$/, '-archive.db')]) {
+    for (const suffix of ['', '-wal', '-shm']) {
+      fs.rmSync(file + suffix, { force: true });
+    }
+  }
+
+  const successes = results.flatMap(result => result.redeemed);
+  const distinct = new Set(successes).size;
+
+  return {
+    mode,
+    attempts: TOTAL * CASHIERS,
+    successes: successes.length,
+    duplicates: successes.length - distinct,
+    canjeados,
+    redeemedPerSecond: Math.round(successes.length / (totalMs / 1000)),
+    attemptsPerSecond: Math.round((TOTAL * CASHIERS) / (totalMs / 1000))
+  };
+}
+
+async function main() {
+  console.log(`Estrés de canje: ${TOTAL} tickets, ${CASHIERS} cajas (cada caja intenta todos los tickets)\\n`);
+  console.log(
+    `${'modo'.padEnd(10)} ${'intentos'.padStart(9)} ${'canjes'.padStart(8)} ${'dobles'.padStart(7)} ` +
+    `${'en base'.padStart(8)} ${'canjes/s'.padStart(9)} ${'intentos/s'.padStart(11)}`
+  );
+
+  let failed = false;
+  for (const mode of ['cas', 'legacy']) {
+    const r = await runCase(mode);
+    console.log(
+      `${r.mode.padEnd(10)} ${String(r.attempts).padStart(9)} ${String(r.successes).padStart(8)} ` +
+      `${String(r.duplicates).padStart(7)} ${String(r.canjeados).padStart(8)} ` +
+      `${String(r.redeemedPerSecond).padStart(9)} ${String(r.attemptsPerSecond).padStart(11)}`
+    );
+
+    if (mode === 'cas' && (r.duplicates !== 0 || r.successes !== TOTAL || r.canjeados !== TOTAL)) {
+      failed = true;
+    }
+  }
+
+  console.log('\\ndobles: canjes aceptados de más (el mismo ticket pagado por dos cajas)');
+  if (failed) {
+    console.error('❌ El canje atómico no fue exactamente una vez por ticket');
+    process.exit(1);
+  }
+  console.log('✅ Canje atómico: exactamente un canje por ticket');
+}
+
+if (isMainThread) {
+  main().catch(error => {
+    console.error('Error en benchmark:', error.message);
+    process.exit(1);
+  });
+} else {
+  runCashier().catch(error => {
+    parentPort.postMessage({ type: 'done', error: error.message });
+  });
+}
+'''
+
+with open('tito-casino-system/tests/benchmarks/redeem-stress.bench.js', 'w') as f:
+    f.write(redeem_stress_bench)
+
 print("✅ Proceso principal de Electron creado")
\ No newline at end of file
@@ -8,7 +8,7 @@ os.makedirs('tito-casino-system/src/renderer/components/Common', exist_ok=True)
 os.makedirs('tito-casino-system/src/renderer/services', exist_ok=True)
 
 mesa_app_js = '''// src/renderer/components/Mesa/MesaApp.js
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import './MesaApp.css';
 
 const { ipcRenderer } = window.require('electron');
@@ -31,24 +31,91 @@ function MesaApp() {
     valor_total_usd: 0
   });
 
-  // Efecto para cargar estadísticas al iniciar
+  // Trabajos pendientes en la cola de impresión
+  const [printQueueDepth, setPrintQueueDepth] = useState(0);
+
+  // Día (UTC) al que corresponden las estadísticas mostradas
+  const statsDayRef = useRef(null);
+
+  // Cargar estadísticas al iniciar y suscribirse a las actualizaciones del proceso principal
   useEffect(() => {
     loadStats();
-    const interval = setInterval(loadStats, 30000); // Actualizar cada 30 segundos
-    return () => clearInterval(interval);
+    loadPrintQueueStatus();
+    ipcRenderer.on('stats-updated', handleStatsUpdated);
+    ipcRenderer.on('print-status', handlePrintStatus);
+    return () => {
+      ipcRenderer.removeListener('stats-updated', handleStatsUpdated);
+      ipcRenderer.removeListener('print-status', handlePrintStatus);
+    };
   }, []);
 
+  /**
+   * Refleja el avance de la cola de impresión
+   */
+  const handlePrintStatus = (event, status) => {
+    setPrintQueueDepth(status.depth);
+
+    if (status.estado === 'fallido') {
+      setMessage(`❌ No se pudo imprimir el ticket ${status.ticket_number}: ${status.error}`);
+      setMessageType('error');
+    } else if (status.estado === 'pendiente' && status.error) {
+      setMessage(`⚠️ Reintentando impresión de ${status.ticket_number}: ${status.error}`);
+      setMessageType('info');
+    } else if (status.estado === 'impreso') {
+      setMessage(`🖨️ Ticket ${status.ticket_number} impreso`);
+      setMessageType('success');
+    }
+  };
+
+  /**
+   * Carga la profundidad de la cola de impresión (trabajos recuperados al iniciar)
+   */
+  const loadPrintQueueStatus = async () => {
+    try {
+      const result = await ipcRenderer.invoke('get-print-queue-status');
+      if (result.success) {
+        setPrintQueueDepth(result.depth);
+      }
+    } catch (error) {
+      console.error('Error cargando estado de la cola de impresión:', error);
+    }
+  };
+
+  /**
+   * Aplica un delta de estadísticas publicado por el proceso principal
+   */
+  const handleStatsUpdated = (event, { fecha, delta }) => {
+    // fecha es el día de emisión de los tickets del delta
+    if (fecha !== statsDayRef.current) {
+      // Un día posterior indica que cambió el día; los deltas de días anteriores no cuentan hoy
+      if (!statsDayRef.current || fecha > statsDayRef.current) {
+        loadStats();
+      }
+      return;
+    }
+
+    setStats(prev => {
+      const next = { ...prev };
+      Object.entries(delta).forEach(([key, value]) => {
+        next[key] = (next[key] || 0) + value;
+      });
+      return next;
+    });
+  };
+
   /**
    * Carga estadísticas de tickets
    */
   const loadStats = async () => {
     try {
+      const today = new Date().toISOString().split('T')[0];
       const result = await ipcRenderer.invoke('get-stats', {
-        dateFrom: new Date().toISOString().split('T')[0] + 'T00:00:00Z',
+        dateFrom: today + 'T00:00:00Z',
         dateTo: new Date().toISOString()
       });
       
       if (result.success) {
+        statsDayRef.current = today;
         setStats(result.stats);
       }
     } catch (error) {
@@ -123,8 +190,9 @@ function MesaApp() {
       const result = await ipcRenderer.invoke('generate-ticket', ticketData);
       
       if (result.success) {
+        setPrintQueueDepth(result.print_queue_depth);
         setMessage(
-          `✅ Ticket ${result.ticket_number} generado exitosamente\\n` +
+          `✅ Ticket ${result.ticket_number} generado, imprimiendo...\\n` +
           `Valor: ${result.moneda} $${result.valor.toFixed(2)}`
         );
         setMessageType('success');
@@ -135,9 +203,6 @@ function MesaApp() {
           valor: ''
         }));
         
-        // Actualizar estadísticas
-        setTimeout(loadStats, 1000);
-        
       } else {
         setMessage(`❌ Error: ${result.error}`);
         setMessageType('error');
@@ -228,6 +293,12 @@ function MesaApp() {
           <div className="stat-value">US$ {stats.valor_total_usd?.toFixed(2) || '0.00'}</div>
           <div className="stat-label">Total USD</div>
         </div>
+        {printQueueDepth > 0 && (
+          <div className="stat-card">
+            <div className="stat-value">{printQueueDepth}</div>
+            <div className="stat-label">En cola de impresión</div>
+          </div>
+        )}
       </div>
 
       {/* Main Form */}
@@ -3,6 +3,7 @@ import os
 
 caja_app_js = '''// src/renderer/components/Caja/CajaApp.js
 import React, { useState, useEffect, useRef } from 'react';
+import { isTitoQrString } from '../../../shared/qr-format';
 import './CajaApp.css';
 
 const { ipcRenderer } = window.require('electron');
@@ -22,6 +23,8 @@ function CajaApp() {
 
   // Referencias
   const inputRef = useRef(null);
+  const statsDayRef = useRef(null); // Día (UTC) de las estadísticas mostradas
+  const scannedQrRef = useRef(null); // QR tal como se escaneó (se verifica de nuevo al pagar)
 
   // Efectos
   useEffect(() => {
@@ -38,27 +41,51 @@ function CajaApp() {
 
     ipcRenderer.on('qr-scanned', handleQRScan);
 
-    // Cargar estadísticas
+    // Cargar estadísticas y suscribirse a las actualizaciones del proceso principal
     loadStats();
-    const interval = setInterval(loadStats, 30000);
+    ipcRenderer.on('stats-updated', handleStatsUpdated);
 
     return () => {
       ipcRenderer.removeListener('qr-scanned', handleQRScan);
-      clearInterval(interval);
+      ipcRenderer.removeListener('stats-updated', handleStatsUpdated);
     };
   }, []);
 
+  /**
+   * Aplica un delta de estadísticas publicado por el proceso principal
+   */
+  const handleStatsUpdated = (event, { fecha, delta }) => {
+    // fecha es el día de emisión de los tickets del delta
+    if (fecha !== statsDayRef.current) {
+      // Un día posterior indica que cambió el día; los deltas de días anteriores no cuentan hoy
+      if (!statsDayRef.current || fecha > statsDayRef.current) {
+        loadStats();
+      }
+      return;
+    }
+
+    setStats(prev => {
+      const next = { ...prev };
+      Object.entries(delta).forEach(([key, value]) => {
+        next[key] = (next[key] || 0) + value;
+      });
+      return next;
+    });
+  };
+
   /**
    * Carga estadísticas de caja
    */
   const loadStats = async () => {
     try {
+      const today = new Date().toISOString().split('T')[0];
       const result = await ipcRenderer.invoke('get-stats', {
-        dateFrom: new Date().toISOString().split('T')[0] + 'T00:00:00Z',
+        dateFrom: today + 'T00:00:00Z',
         dateTo: new Date().toISOString()
       });
       
       if (result.success) {
+        statsDayRef.current = today;
         setStats(result.stats);
       }
     } catch (error) {
@@ -81,6 +108,7 @@ function CajaApp() {
       const result = await ipcRenderer.invoke('validate-ticket', qrString.trim());
       
       if (result.success) {
+        scannedQrRef.current = qrString.trim();
         setTicketData(result.ticket);
         setMessage(`✅ Ticket válido. Proceder con el pago de ${result.ticket.moneda} $${result.ticket.valor.toFixed(2)}`);
         setMessageType('success');
@@ -113,8 +141,9 @@ function CajaApp() {
     const value = e.target.value;
     setQrInput(value);
     
-    // Si el valor contiene el patrón de QR TITO, procesarlo automáticamente
-    if (value.includes('|') && value.split('|').length === 5) {
+    // QR TITO completo (compacto o legacy): procesarlo sin esperar Enter,
+    // así funcionan los lectores en modo teclado sin sufijo
+    if (isTitoQrString(value)) {
       handleQRInput(value);
     }
   };
@@ -139,8 +168,11 @@ function CajaApp() {
     setMessageType('info');
     
     try {
+      // El QR escaneado (no el guardado en la base) viaja con el pago:
+      // el proceso principal verifica su HMAC y canjea en un solo paso
       const result = await ipcRenderer.invoke('process-payment', {
         ticket_number: ticketData.ticket_number,
+        qr_data: scannedQrRef.current,
         usuario_canje: 'Cajero'
       });
       
@@ -153,9 +185,6 @@ function CajaApp() {
         setMessageType('success');
         setTicketData(null);
         
-        // Actualizar estadísticas
-        setTimeout(loadStats, 1000);
-        
         // Limpiar mensaje después de 5 segundos
         setTimeout(() => {
           setMessage('Escanee el siguiente ticket');
@@ -388,4 +417,48 @@ export default CajaApp;
 with open('tito-casino-system/src/renderer/components/Caja/CajaApp.js', 'w') as f:
     f.write(caja_app_js)
 
+# Test del auto-envío de escaneos en la caja (lector en modo teclado)
+caja_scan_input_test = '''// tests/unit/caja-scan-input.test.js
+const { isTitoQrString } = require('../../src/shared/qr-format');
+const { generateTicketQR } = require('../../src/main/utils/qr-generator');
+const { encodeTicketNumber } = require('../../src/main/utils/ticket-number');
+
+// CajaApp.handleInputChange envía el escaneo en cuanto isTitoQrString(value) es true:
+// cada tecla del lector llega como un cambio del input, sin Enter al final
+describe('Caja scan input (keyboard wedge)', () => {
+  const ticket = {
+    id: encodeTicketNumber({ day: 284, stationId: 3, sequence: 17 }),
+    valor: 534.10,
+    moneda: 'USD',
+    fecha: '2025-10-12T08:02:00Z'
+  };
+
+  // Valores del input tras cada carácter tecleado por el lector
+  const keystrokes = (qrString) => Array.from(qrString, (_, i) => qrString.slice(0, i + 1));
+
+  test('should submit a compact QR only once it is complete', async () => {
+    const { qrString, format } = await generateTicketQR(ticket, { preview: false, matrix: false });
+
+    expect(format).toBe('compact');
+    expect(keystrokes(qrString).filter(isTitoQrString)).toEqual([qrString]);
+  });
+
+  test('should submit a legacy QR only once it is complete', async () => {
+    const { qrString } = await generateTicketQR(ticket, { preview: false, matrix: false, format: 'legacy' });
+
+    expect(qrString.split('|')).toHaveLength(5);
+    expect(keystrokes(qrString).filter(isTitoQrString)).toEqual([qrString]);
+  });
+
+  test('should not submit text that is not a TITO QR', () => {
+    expect(isTitoQrString('TC1')).toBe(false);
+    expect(isTitoQrString('hola|mundo|a|b|c')).toBe(false);
+    expect(isTitoQrString('')).toBe(false);
+  });
+});
+'''
+
+with open('tito-casino-system/tests/unit/caja-scan-input.test.js', 'w') as f:
+    f.write(caja_scan_input_test)
+
 print("✅ Componente React para Caja creado")
\ No newline at end of file
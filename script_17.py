@@ -90,10 +90,24 @@ SUPABASE_ANON_KEY=your-anon-key
 
 # Security
 QR_SECRET=your-secret-key-for-qr-hashing
+# Formato del QR emitido: compact (TC1 + base45) | legacy (id|valor|moneda|fecha|hash)
+QR_FORMAT=compact
 
 # Hardware
 PRINTER_NAME=TM-T20II
+# pdf (spooler del sistema) | escpos (bytes directos a DEVICE o HOST:PORT)
+PRINTER_BACKEND=pdf
+PRINTER_DEVICE=/dev/usb/lp0
+# PRINTER_HOST=192.168.1.50
+# PRINTER_PORT=9100
 SQLITE_DB_PATH=./data/tito.db
+# Perfil de almacenamiento: durable (synchronous=FULL) | balanced | fast-read
+SQLITE_PROFILE=durable
+# SQLITE_ARCHIVE_PATH=./data/tito-archive.db
+# Entero único por equipo (0-1023), obligatorio para emitir tickets
+# STATION_ID=1
+# deny (no pagar sin conexión) | local (pagar con la base local)
+REDEMPTION_OFFLINE_POLICY=deny
 
 # App
 NODE_ENV=development
@@ -3,7 +3,17 @@ import os
 
 # Crear test para generador QR (TDD - Test First)
 qr_generator_test = '''// tests/unit/qr-generator.test.js
-const { generateTicketQR, parseTicketQR, validateTicketQR } = require('../../src/main/utils/qr-generator');
+const {
+  generateTicketQR,
+  parseTicketQR,
+  validateTicketQR,
+  verifyTicketQR,
+  QRVerifier,
+  COMPACT_QR_PATTERN,
+  base45Encode,
+  base45Decode
+} = require('../../src/main/utils/qr-generator');
+const { encodeTicketNumber } = require('../../src/main/utils/ticket-number');
 
 describe('QR Generator', () => {
   const mockTicketData = {
@@ -24,6 +34,14 @@ describe('QR Generator', () => {
       expect(result.hash).toHaveLength(16);
     });
 
+    test('should skip the PNG preview and return the module matrix', async () => {
+      const result = await generateTicketQR(mockTicketData, { preview: false });
+      
+      expect(result.qrCode).toBeUndefined();
+      expect(result.qrMatrix.size).toBeGreaterThanOrEqual(21);
+      expect(result.qrMatrix.data).toHaveLength(result.qrMatrix.size * result.qrMatrix.size);
+    });
+
     test('should generate different hashes for different data', async () => {
       const data1 = { ...mockTicketData, valor: 100 };
       const data2 = { ...mockTicketData, valor: 200 };
@@ -97,6 +115,104 @@ describe('QR Generator', () => {
       expect(isValid).toBe(false);
     });
   });
+
+  describe('verifyTicketQR', () => {
+    test('should return the parsed ticket for a valid QR', async () => {
+      const { qrString, hash } = await generateTicketQR(mockTicketData, { preview: false });
+      const result = verifyTicketQR(qrString);
+      
+      expect(result.valid).toBe(true);
+      expect(result.ticket).toEqual({ ...mockTicketData, valor: 534, hash });
+    });
+
+    test('should reject hashes that differ only in letter case', async () => {
+      const { qrString, hash } = await generateTicketQR(mockTicketData, { preview: false });
+      const result = verifyTicketQR(qrString.replace(hash, hash.toUpperCase()));
+      
+      expect(result.valid).toBe(/^[0-9]+$/.test(hash));
+    });
+
+    test('should reject QRs signed with a different secret', async () => {
+      const { qrString } = await generateTicketQR(mockTicketData, { preview: false });
+      const result = new QRVerifier('otra-clave').verify(qrString);
+      
+      expect(result).toEqual({ valid: false, ticket: null, error: 'Hash no coincide' });
+    });
+
+    test('should report parse errors without throwing', () => {
+      const result = verifyTicketQR('invalid-qr-string');
+      
+      expect(result.valid).toBe(false);
+      expect(result.error).toContain('Invalid QR format');
+    });
+  });
+
+  describe('compact format', () => {
+    const compactTicket = {
+      id: encodeTicketNumber({ day: 284, stationId: 3, sequence: 17 }),
+      valor: 534.10,
+      moneda: 'USD',
+      fecha: '2025-10-12T08:02:00Z'
+    };
+
+    test('should emit an alphanumeric payload for compact ticket numbers', async () => {
+      const result = await generateTicketQR(compactTicket, { preview: false });
+      
+      expect(result.format).toBe('compact');
+      expect(result.qrString).toMatch(COMPACT_QR_PATTERN);
+      expect(result.qrString).toHaveLength(36);
+    });
+
+    test('should produce a smaller QR than the legacy format', async () => {
+      const compact = await generateTicketQR(compactTicket, { preview: false });
+      const legacy = await generateTicketQR(compactTicket, { preview: false, format: 'legacy' });
+      
+      expect(legacy.format).toBe('legacy');
+      expect(compact.qrMatrix.size).toBeLessThan(legacy.qrMatrix.size);
+    });
+
+    test('should round-trip through parse and verify', async () => {
+      const { qrString, hash } = await generateTicketQR(compactTicket, { preview: false, matrix: false });
+      const result = verifyTicketQR(qrString);
+      
+      expect(result.valid).toBe(true);
+      expect(result.ticket).toEqual({ ...compactTicket, fecha: '2025-10-12T08:02:00.000Z', hash });
+      expect(parseTicketQR(qrString)).toEqual(result.ticket);
+    });
+
+    test('should fall back to legacy for tickets it cannot pack', async () => {
+      const legacyNumber = await generateTicketQR(mockTicketData, { preview: false, matrix: false });
+      const fractional = await generateTicketQR({ ...compactTicket, valor: 0.001 }, { preview: false, matrix: false });
+      
+      expect(legacyNumber.format).toBe('legacy');
+      expect(fractional.format).toBe('legacy');
+      expect(validateTicketQR(fractional.qrString)).toBe(true);
+    });
+
+    test('should reject any altered character', async () => {
+      const { qrString } = await generateTicketQR(compactTicket, { preview: false, matrix: false });
+      
+      for (let i = 3; i < qrString.length; i++) {
+        const altered = qrString.slice(0, i) + (qrString[i] === '0' ? '1' : '0') + qrString.slice(i + 1);
+        expect(verifyTicketQR(altered).valid).toBe(false);
+      }
+    });
+
+    test('should reject unknown payload versions', async () => {
+      const { qrString } = await generateTicketQR(compactTicket, { preview: false, matrix: false });
+      const result = verifyTicketQR('TC2' + qrString.slice(3));
+      
+      expect(result.valid).toBe(false);
+      expect(result.error).toContain('Versión de QR no soportada: 2');
+    });
+
+    test('should encode base45 as in RFC 9285', () => {
+      expect(base45Encode(Buffer.from('AB'))).toBe('BB8');
+      expect(base45Encode(Buffer.from('Hello!!'))).toBe('%69 VD92EX0');
+      expect(base45Decode('%69 VD92EX0').toString()).toBe('Hello!!');
+      expect(() => base45Decode('GGW')).toThrow('Base45 fuera de rango');
+    });
+  });
 });
 '''
 
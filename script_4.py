@@ -32,9 +32,18 @@ describe('SQLite Database', () => {
       const indexes = db.db.prepare("SELECT name FROM sqlite_master WHERE type='index'").all();
       const indexNames = indexes.map(idx => idx.name);
       
-      expect(indexNames).toContain('idx_ticket_number');
-      expect(indexNames).toContain('idx_estado');
-      expect(indexNames).toContain('idx_synced');
+      expect(indexNames).toContain('idx_fecha_emision');
+      expect(indexNames).toContain('idx_tickets_report');
+      expect(indexNames).toContain('idx_tickets_unsynced');
+      expect(indexNames).toContain('idx_tickets_open');
+    });
+
+    test('should not keep redundant or low-selectivity indexes', () => {
+      const indexNames = db.db.prepare("SELECT name FROM sqlite_master WHERE type='index'").pluck().all();
+      
+      ['idx_ticket_number', 'idx_estado', 'idx_synced', 'idx_mesa_id'].forEach(name => {
+        expect(indexNames).not.toContain(name);
+      });
     });
   });
 
@@ -90,6 +99,43 @@ describe('SQLite Database', () => {
     });
   });
 
+  describe('createTicketsBatch', () => {
+    const batch = [
+      { ticket_number: 'TB001', valor: 100, moneda: 'DOP', qr_data: 'qr-b1', mesa_id: 1 },
+      { ticket_number: 'TB002', valor: 25.50, moneda: 'USD', qr_data: 'qr-b2', mesa_id: 2 },
+      { ticket_number: 'TB003', valor: 300, moneda: 'DOP', qr_data: 'qr-b3' }
+    ];
+
+    test('should create all tickets and return them in order', async () => {
+      const created = await db.createTicketsBatch(batch);
+      
+      expect(created).toHaveLength(3);
+      expect(created.map(t => t.ticket_number)).toEqual(['TB001', 'TB002', 'TB003']);
+      expect(created[1].valor).toBe(25.50);
+      expect(created[2].estado).toBe(TICKET_STATES.EMITIDO);
+    });
+
+    test('should roll back the whole batch on duplicate ticket number', async () => {
+      await db.createTicket(batch[1]);
+      
+      await expect(db.createTicketsBatch(batch)).rejects.toThrow('TB002');
+      expect(db.findTicketByNumber('TB001')).toBeUndefined();
+    });
+
+    test('should return empty array for empty batch', async () => {
+      await expect(db.createTicketsBatch([])).resolves.toEqual([]);
+    });
+  });
+
+  describe('prepareCached', () => {
+    test('should reuse the same statement for the same SQL', () => {
+      const first = db.prepareCached('SELECT * FROM tickets WHERE id = ?');
+      const second = db.prepareCached('SELECT * FROM tickets WHERE id = ?');
+      
+      expect(second).toBe(first);
+    });
+  });
+
   describe('findTicketByNumber', () => {
     beforeEach(async () => {
       await db.createTicket({
@@ -146,6 +192,74 @@ describe('SQLite Database', () => {
     });
   });
 
+  describe('redeemTicket', () => {
+    beforeEach(async () => {
+      await db.createTicket({
+        ticket_number: 'T790',
+        valor: 150.00,
+        moneda: 'USD',
+        qr_data: 'test-qr'
+      });
+    });
+
+    test('should redeem an open ticket and return the updated row', () => {
+      const ticket = db.redeemTicket('T790', 'Cajero1', 'test-qr');
+
+      expect(ticket).toMatchObject({
+        ticket_number: 'T790',
+        estado: TICKET_STATES.CANJEADO,
+        usuario_canje: 'Cajero1',
+        synced: 0
+      });
+      expect(ticket.fecha_canje).toBeTruthy();
+    });
+
+    test('should redeem only once', () => {
+      expect(db.redeemTicket('T790', 'Caja1')).toBeDefined();
+      expect(db.redeemTicket('T790', 'Caja2')).toBeUndefined();
+      expect(db.findTicketByNumber('T790').usuario_canje).toBe('Caja1');
+    });
+
+    test('should not redeem voided tickets or a different QR', () => {
+      expect(db.redeemTicket('T790', 'Caja1', 'otro-qr')).toBeUndefined();
+
+      db.updateTicketStatus('T790', TICKET_STATES.ANULADO);
+      expect(db.redeemTicket('T790', 'Caja1', 'test-qr')).toBeUndefined();
+      expect(db.findTicketByNumber('T790').estado).toBe(TICKET_STATES.ANULADO);
+    });
+  });
+
+  describe('applyRemoteTickets', () => {
+    const remote = (ticketNumber, estado) => ({
+      ticket_number: ticketNumber,
+      valor: 75.00,
+      moneda: 'DOP',
+      fecha_emision: '2025-10-12T08:00:00Z',
+      fecha_canje: estado === 'emitido' ? null : '2025-10-12T09:00:00Z',
+      estado,
+      qr_data: `qr-${ticketNumber}`,
+      mesa_id: 2,
+      usuario_emision: null,
+      usuario_canje: estado === 'emitido' ? null : 'Caja9',
+      hash_seguridad: null
+    });
+
+    test('should store remote tickets with their remote state as synced', () => {
+      const changes = db.applyRemoteTickets([remote('R1', 'emitido'), remote('R2', 'canjeado')]);
+
+      expect(changes.map(c => c.previousEstado)).toEqual([null, null]);
+      expect(db.findTicketByNumber('R1')).toMatchObject({ estado: 'emitido', synced: 1 });
+      expect(db.findTicketByNumber('R2')).toMatchObject({ estado: 'canjeado', usuario_canje: 'Caja9', synced: 1 });
+      expect(db.findTicketByNumber('R2').fecha_canje).toBeTruthy();
+      expect(db.getUnsyncedTickets()).toHaveLength(0);
+    });
+
+    test('should not move the pull cursor', () => {
+      db.applyRemoteTickets([remote('R3', 'emitido')]);
+      expect(db.getSyncState('pull_tickets_cursor')).toBeNull();
+    });
+  });
+
   describe('getUnsyncedTickets', () => {
     beforeEach(async () => {
       // Crear tickets sincronizados y no sincronizados
@@ -175,6 +289,46 @@ describe('SQLite Database', () => {
     });
   });
 
+  describe('getUnsyncedTicketsPage', () => {
+    beforeEach(async () => {
+      for (let i = 1; i <= 5; i++) {
+        await db.createTicket({
+          ticket_number: `TP00${i}`,
+          valor: i * 10,
+          moneda: 'DOP',
+          qr_data: `qr-p${i}`
+        });
+      }
+    });
+
+    test('should page through unsynced tickets with a cursor', () => {
+      const first = db.getUnsyncedTicketsPage(null, 2);
+      expect(first.map(t => t.ticket_number)).toEqual(['TP001', 'TP002']);
+      
+      const last = first[first.length - 1];
+      const second = db.getUnsyncedTicketsPage({ updated_at: last.updated_at, id: last.id }, 10);
+      expect(second.map(t => t.ticket_number)).toEqual(['TP003', 'TP004', 'TP005']);
+    });
+
+    test('should commit a page and persist the cursor atomically', () => {
+      const page = db.getUnsyncedTicketsPage(null, 2);
+      const cursor = { updated_at: page[1].updated_at, id: page[1].id };
+      
+      expect(db.commitSyncPage(page, 'test_cursor', cursor)).toBe(2);
+      
+      expect(db.getSyncState('test_cursor')).toEqual(cursor);
+      expect(db.getUnsyncedTickets()).toHaveLength(3);
+    });
+
+    test('should not mark tickets that changed after they were read', () => {
+      const page = db.getUnsyncedTicketsPage(null, 2);
+      db.updateTicketStatus(page[0].ticket_number, TICKET_STATES.CANJEADO, 'Caja1');
+      
+      expect(db.commitSyncPage(page, 'test_cursor', null)).toBe(1);
+      expect(db.getUnsyncedTickets().map(t => t.ticket_number)).toContain(page[0].ticket_number);
+    });
+  });
+
   describe('markAsSynced', () => {
     beforeEach(async () => {
       await db.createTicket({
@@ -196,6 +350,47 @@ describe('SQLite Database', () => {
     });
   });
 
+  describe('iterateTicketsByDateRange', () => {
+    beforeEach(async () => {
+      for (let i = 1; i <= 7; i++) {
+        await db.createTicket({
+          ticket_number: `TR00${i}`,
+          valor: i,
+          moneda: i % 2 ? 'DOP' : 'USD',
+          qr_data: `qr-r${i}`
+        });
+      }
+      db.updateTicketStatus('TR003', TICKET_STATES.CANJEADO);
+    });
+
+    const range = ['2000-01-01T00:00:00Z', '2999-12-31T23:59:59Z'];
+
+    test('should yield every ticket exactly once in bounded pages', async () => {
+      const pages = [];
+      for await (const page of db.iterateTicketsByDateRange(...range, { pageSize: 3 })) {
+        pages.push(page);
+      }
+      
+      expect(pages.map(page => page.length)).toEqual([3, 3, 1]);
+      expect(pages.flat().map(t => t.ticket_number)).toEqual(
+        ['TR001', 'TR002', 'TR003', 'TR004', 'TR005', 'TR006', 'TR007']
+      );
+    });
+
+    test('should support descending order and state filter', async () => {
+      const numbers = [];
+      for await (const page of db.iterateTicketsByDateRange(...range, { pageSize: 2, order: 'desc', estado: 'emitido' })) {
+        numbers.push(...page.map(t => t.ticket_number));
+      }
+      
+      expect(numbers).toEqual(['TR007', 'TR006', 'TR005', 'TR004', 'TR002', 'TR001']);
+    });
+
+    test('should accept ISO dates in getTicketsByDateRange', () => {
+      expect(db.getTicketsByDateRange(...range)).toHaveLength(7);
+    });
+  });
+
   describe('getTicketStats', () => {
     beforeEach(async () => {
       // Crear varios tickets para estadísticas
@@ -217,6 +412,33 @@ describe('SQLite Database', () => {
       db.updateTicketStatus('T001', TICKET_STATES.CANJEADO);
     });
 
+    test('should keep daily stats table in sync with inserts and updates', () => {
+      const rows = db.db.prepare(
+        'SELECT estado, moneda, count, total FROM ticket_stats_daily WHERE count > 0 ORDER BY estado, moneda'
+      ).all();
+      
+      expect(rows).toEqual([
+        { estado: TICKET_STATES.CANJEADO, moneda: 'DOP', count: 1, total: 100 },
+        { estado: TICKET_STATES.EMITIDO, moneda: 'USD', count: 1, total: 50 }
+      ]);
+    });
+
+    test('should filter stats by day range', () => {
+      const today = new Date().toISOString().split('T')[0];
+      
+      expect(db.getTicketStats(`${today}T00:00:00Z`, new Date().toISOString()).total_canjeados).toBe(1);
+      expect(db.getTicketStats('2000-01-01T00:00:00Z', '2000-01-02T00:00:00Z').total_emitidos).toBe(0);
+    });
+
+    test('should rebuild daily stats from tickets', () => {
+      const before = db.getTicketStats();
+      db.db.exec('DELETE FROM ticket_stats_daily');
+      
+      db.rebuildDailyStats();
+      
+      expect(db.getTicketStats()).toEqual(before);
+    });
+
     test('should calculate correct statistics', () => {
       const stats = db.getTicketStats();
       
@@ -234,4 +456,308 @@ describe('SQLite Database', () => {
 with open('tito-casino-system/tests/unit/sqlite.test.js', 'w') as f:
     f.write(sqlite_test)
 
+# Regresión de planes de consulta: ningún método de SQLiteDB recorre tablas grandes completas ni ordena sin índice
+query_plans_test = '''// tests/unit/query-plans.test.js
+const SQLiteDB = require('../../src/main/database/sqlite');
+
+// Tablas que crecen sin límite: ninguna consulta puede recorrerlas completas
+const LARGE_TABLES = ['tickets', 'print_jobs'];
+
+// Recorridos (también de índices completos) y ordenamientos temporales aceptados, con su motivo
+const ALLOWED_SCANS = [
+  {
+    sql: `
+      SELECT ticket_number FROM main.tickets WHERE estado != 'emitido'
+      UNION ALL
+      SELECT ticket_number FROM archive.tickets a
+      WHERE NOT EXISTS (SELECT 1 FROM main.tickets m WHERE m.id = a.id)
+    `,
+    reason: 'carga del filtro de cerrados: lee la mayoría de la tabla, solo al iniciar o reconstruir'
+  },
+  {
+    sql: `
+      SELECT
+        (SELECT COUNT(*) FROM main.tickets WHERE estado != 'emitido') +
+        (SELECT COUNT(*) FROM archive.tickets a
+         WHERE NOT EXISTS (SELECT 1 FROM main.tickets m WHERE m.id = a.id)) AS count
+    `,
+    reason: 'tamaño del filtro de cerrados: índices de cobertura, solo al iniciar o reconstruir'
+  },
+  {
+    sql: "SELECT * FROM tickets WHERE estado = 'emitido'",
+    reason: 'índice parcial de tickets abiertos: recorre solo los abiertos, al cargar el índice en memoria'
+  },
+  {
+    sql: 'SELECT * FROM tickets WHERE synced = 0 ORDER BY created_at ASC',
+    reason: 'índice parcial de no sincronizados; el orden por creación se resuelve sobre ese conjunto acotado'
+  },
+  {
+    sql: "SELECT * FROM print_jobs WHERE estado IN ('pendiente', 'imprimiendo') ORDER BY id ASC LIMIT 1",
+    reason: 'índice parcial de trabajos pendientes, ya ordenado por id'
+  },
+  {
+    sql: "SELECT COUNT(*) AS depth FROM print_jobs WHERE estado IN ('pendiente', 'imprimiendo')",
+    reason: 'índice parcial de trabajos pendientes'
+  },
+  {
+    sql: `
+      UPDATE print_jobs SET estado = 'pendiente', next_attempt_at = 0
+      WHERE estado IN ('pendiente', 'imprimiendo') AND estado = 'imprimiendo'
+    `,
+    reason: 'índice parcial de trabajos pendientes, solo al iniciar'
+  },
+  {
+    sql: `
+      SELECT estado, moneda, SUM(count) as count, SUM(total) as total_valor
+      FROM ticket_stats_daily
+      GROUP BY estado, moneda
+    `,
+    reason: 'agrupa ticket_stats_daily (una fila por día, mesa, moneda y estado), no tickets'
+  },
+  {
+    sql: `
+      SELECT estado, moneda, SUM(count) as count, SUM(total) as total_valor
+      FROM ticket_stats_daily
+      WHERE fecha BETWEEN date(?) AND date(?)
+      GROUP BY estado, moneda
+    `,
+    reason: 'agrupa ticket_stats_daily (una fila por día, mesa, moneda y estado), no tickets'
+  },
+  {
+    sql: `
+      INSERT INTO ticket_stats_daily (fecha, mesa_id, moneda, estado, count, total)
+      SELECT date(fecha_emision), COALESCE(mesa_id, 0), moneda, estado, COUNT(*), SUM(valor)
+      FROM (
+        SELECT fecha_emision, mesa_id, moneda, estado, valor FROM main.tickets
+        UNION ALL
+        SELECT fecha_emision, mesa_id, moneda, estado, valor FROM archive.tickets a
+        WHERE NOT EXISTS (SELECT 1 FROM main.tickets m WHERE m.id = a.id)
+      )
+      GROUP BY date(fecha_emision), COALESCE(mesa_id, 0), moneda, estado
+    `,
+    reason: 'rebuildDailyStats: reconstrucción completa, solo en bases existentes sin estadísticas'
+  }
+];
+
+describe('SQLiteDB query plans', () => {
+  let db;
+  let executed;
+
+  const ticket = (number, extra = {}) => ({
+    ticket_number: number,
+    valor: 100,
+    moneda: 'DOP',
+    qr_data: `${number}|100|DOP`,
+    mesa_id: 1,
+    ...extra
+  });
+
+  const plan = (sql, params = []) => db.db
+    .prepare(`EXPLAIN QUERY PLAN ${sql}`)
+    .all(...params)
+    .map(row => row.detail);
+
+  // Los parámetros no cambian el plan: se enlazan como NULL
+  const planOf = (sql) => plan(sql, new Array((sql.match(/\\?/g) || []).length).fill(null));
+
+  // Palabras que pueden seguir al nombre de una tabla sin ser un alias
+  const SQL_KEYWORDS = ['WHERE', 'ORDER', 'GROUP', 'LIMIT', 'UNION', 'JOIN', 'LEFT', 'INNER', 'CROSS',
+    'ON', 'SET', 'VALUES', 'SELECT', 'INDEXED', 'NOT', 'RETURNING', 'DEFAULT'];
+
+  // Nombres con que una sentencia se refiere a las tablas grandes: el plan muestra el alias si lo hay
+  const largeTableNames = (sql) => {
+    const names = [...LARGE_TABLES];
+    for (const table of LARGE_TABLES) {
+      for (const [, alias] of sql.matchAll(new RegExp(`\\\\b${table}\\\\s+(?:AS\\\\s+)?(\\\\w+)`, 'gi'))) {
+        if (!SQL_KEYWORDS.includes(alias.toUpperCase())) names.push(alias);
+      }
+    }
+    return names;
+  };
+
+  // Cualquier SCAN de una tabla grande, también a través de un índice (USING INDEX /
+  // USING COVERING INDEX recorren el índice completo). Incluye main.tickets y archive.tickets
+  const isFullScan = (detail, names = LARGE_TABLES) => names.some(name => (
+    new RegExp(`^SCAN (TABLE )?(\\\\w+\\\\.)?${name}( |$)`).test(detail)
+  ));
+
+  // Ordenamientos y agrupaciones sin índice que los cubra
+  const isTempSort = (detail) => detail.includes('USE TEMP B-TREE');
+
+  const normalize = (sql) => sql.replace(/\\s+/g, ' ').trim();
+
+  /**
+   * Ejecuta todos los métodos de SQLiteDB para poblar la caché de statements
+   */
+  const exerciseAll = async () => {
+    await db.createTicket(ticket('Q1'));
+    await db.createTicketsBatch([ticket('Q2'), ticket('Q3')]);
+    const [{ jobId }] = await db.createTicketsWithPrintJobs([{ ticket: ticket('Q4'), payload: { n: 1 } }]);
+
+    db.findTicketById(1);
+    db.findTicketByNumber('Q1');
+    db.getOpenTickets();
+    db.updateTicketStatus('Q1', 'canjeado', 'Caja1');
+    db.redeemTicket('Q2', 'Caja1', 'Q2|100|DOP');
+    db.countClosedTickets();
+    [...db.iterateClosedTicketNumbers()];
+
+    db.getUnsyncedTickets();
+    const page = db.getUnsyncedTicketsPage(null, 10);
+    db.commitSyncPage(page, 'push_tickets_cursor', { updated_at: 'x', id: 1 });
+    db.getSyncState('push_tickets_cursor');
+    db.setSyncState('push_tickets_cursor', null);
+    const remote = { fecha_emision: '2025-10-12T08:00:00Z', usuario_emision: null, usuario_canje: null, hash_seguridad: null };
+    db.applyRemoteTicketsPage([
+      { ...ticket('R1'), ...remote, estado: 'emitido', fecha_canje: null },
+      { ...ticket('Q4'), ...remote, estado: 'canjeado', fecha_canje: '2025-10-12T09:00:00Z' }
+    ], 'pull_tickets_cursor', { updated_at: 'x', id: 'y' });
+    db.allocateTicketSequence(1, 300, 2);
+
+    db.getNextPrintJob();
+    db.startPrintJob(jobId);
+    db.failPrintJob(jobId, 'sin papel', null);
+    db.retryPrintJob(jobId);
+    db.completePrintJob(jobId);
+    db.recoverPrintJobs();
+    db.getPrintQueueDepth();
+
+    db.getTicketStats();
+    db.getTicketStats('2025-01-01', '2100-01-01');
+    db.getTicketsByDateRange('2000-01-01', '2100-01-01');
+    db.getTicketsByDateRange('2000-01-01', '2100-01-01', 'emitido');
+    const first = db.getTicketsPageByDateRange('2000-01-01', '2100-01-01', { pageSize: 1 });
+    db.getTicketsPageByDateRange('2000-01-01', '2100-01-01', { pageSize: 1, cursor: first.nextCursor, estado: 'emitido' });
+    db.getTicketsPageByDateRange('2000-01-01', '2100-01-01', { pageSize: 1, cursor: first.nextCursor, order: 'desc' });
+    db.archiveClosedTickets({ now: Date.now() + 30 * 24 * 60 * 60 * 1000 });
+    db.rebuildDailyStats();
+  };
+
+  beforeEach(() => {
+    db = new SQLiteDB(':memory:');
+
+    // Sentencias ejecutadas con exec() (no pasan por prepareCached)
+    executed = [];
+    const exec = db.db.exec.bind(db.db);
+    db.db.exec = (sql) => {
+      executed.push(sql);
+      return exec(sql);
+    };
+  });
+
+  afterEach(() => {
+    db.close();
+  });
+
+  test('should never scan a large table or sort without an index outside the allow-list', async () => {
+    await exerciseAll();
+
+    const allowed = ALLOWED_SCANS.map(entry => normalize(entry.sql));
+    const statements = [
+      ...db.statements.keys(),
+      ...executed.filter(sql => /^\\s*(SELECT|INSERT|UPDATE|DELETE|WITH)\\b/i.test(sql))
+    ];
+    const offenders = statements
+      .filter(sql => !allowed.includes(normalize(sql)))
+      .map(sql => ({ sql: normalize(sql), plan: planOf(sql), names: largeTableNames(sql) }))
+      .filter(entry => entry.plan.some(step => isFullScan(step, entry.names) || isTempSort(step)))
+      .map(({ sql, plan: steps }) => ({ sql, plan: steps }));
+
+    expect(offenders).toEqual([]);
+  });
+
+  test('should resolve table aliases in plans', () => {
+    const sql = 'SELECT t.id FROM tickets t WHERE t.valor > 0';
+
+    expect(planOf(sql).some(step => isFullScan(step, largeTableNames(sql)))).toBe(true);
+    expect(largeTableNames('SELECT * FROM main.tickets WHERE id = ?')).toEqual(LARGE_TABLES);
+  });
+
+  test('should check statements run through exec()', async () => {
+    await exerciseAll();
+    expect(executed.some(sql => sql.includes('INSERT INTO ticket_stats_daily'))).toBe(true);
+  });
+
+  test('should exercise a meaningful set of statements', async () => {
+    await exerciseAll();
+    expect(db.statements.size).toBeGreaterThanOrEqual(25);
+  });
+
+  test('should look up tickets through the UNIQUE index', () => {
+    expect(planOf('SELECT * FROM tickets WHERE ticket_number = ?'))
+      .toEqual([expect.stringMatching(/SEARCH tickets USING INDEX sqlite_autoindex_tickets_\\d \\(ticket_number=\\?\\)/)]);
+  });
+
+  test('should page unsynced tickets through the partial index', () => {
+    const sql = `
+      SELECT * FROM tickets
+      WHERE synced = 0 AND (updated_at, id) > (?, ?)
+      ORDER BY updated_at ASC, id ASC
+      LIMIT ?
+    `;
+    const steps = planOf(sql);
+
+    expect(steps).toEqual([expect.stringMatching(/^SEARCH tickets USING INDEX idx_tickets_unsynced /)]);
+  });
+
+  test('should load open tickets through the partial index', () => {
+    expect(planOf("SELECT * FROM tickets WHERE estado = 'emitido'"))
+      .toEqual(['SCAN tickets USING INDEX idx_tickets_open']);
+  });
+
+  test('should rebuild daily stats from the covering index only', () => {
+    const steps = planOf(`
+      SELECT date(fecha_emision), COALESCE(mesa_id, 0), moneda, estado, COUNT(*), SUM(valor)
+      FROM tickets
+      GROUP BY date(fecha_emision), COALESCE(mesa_id, 0), moneda, estado
+    `);
+
+    expect(steps[0]).toBe('SCAN tickets USING COVERING INDEX idx_tickets_report');
+  });
+
+  test('should count closed tickets from the covering index only', () => {
+    expect(planOf("SELECT COUNT(*) AS count FROM main.tickets WHERE estado != 'emitido'"))
+      .toEqual(['SCAN main.tickets USING COVERING INDEX idx_tickets_report']);
+  });
+
+  test('should merge hot and archived date ranges without sorting', async () => {
+    await db.createTicket(ticket('M1'));
+    db.getTicketsPageByDateRange('2000-01-01', '2100-01-01', { pageSize: 1, cursor: { fecha_emision: '2000-01-01', id: 0 } });
+
+    const sql = [...db.statements.keys()].find(text => text.includes('(fecha_emision, id) >'));
+    const steps = planOf(sql);
+
+    expect(steps).toContain('MERGE (UNION ALL)');
+    expect(steps).toEqual(expect.arrayContaining([
+      expect.stringMatching(/^SEARCH main\.tickets USING INDEX idx_fecha_emision /),
+      expect.stringMatching(/^SEARCH (archive\.tickets|a) USING INDEX idx_archive_fecha_emision /),
+      // Descarta copias de tickets que siguen en main (traslado interrumpido) por rowid
+      expect.stringMatching(/^SEARCH m USING INTEGER PRIMARY KEY /)
+    ]));
+    expect(steps.some(step => step.includes('TEMP B-TREE'))).toBe(false);
+  });
+
+  test('should find archive candidates through the partial index', () => {
+    const steps = planOf(`
+      SELECT id FROM tickets
+      WHERE estado != 'emitido' AND synced = 1 AND updated_at < datetime(?)
+      ORDER BY updated_at
+      LIMIT ?
+    `);
+
+    expect(steps).toEqual([expect.stringMatching(/^SEARCH tickets USING (COVERING )?INDEX idx_tickets_archivable /)]);
+  });
+
+  test('should use the pending index for the print queue', () => {
+    const pending = "FROM print_jobs WHERE estado IN ('pendiente', 'imprimiendo')";
+
+    expect(planOf(`SELECT * ${pending} ORDER BY id ASC LIMIT 1`)).toEqual(['SCAN print_jobs USING INDEX idx_print_jobs_pending']);
+    expect(planOf(`SELECT COUNT(*) AS depth ${pending}`)[0]).toMatch(/USING (COVERING )?INDEX idx_print_jobs_pending/);
+  });
+});
+'''
+
+with open('tito-casino-system/tests/unit/query-plans.test.js', 'w') as f:
+    f.write(query_plans_test)
+
 print("✅ Test para SQLite Database creado (TDD - Test First)")
\ No newline at end of file
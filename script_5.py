@@ -5,13 +5,78 @@ sqlite_js = '''// src/main/database/sqlite.js
 const Database = require('better-sqlite3');
 const path = require('path');
 const fs = require('fs');
-const { TICKET_STATES, CURRENCIES } = require('../../shared/constants');
+const { TICKET_STATES, CURRENCIES, ARCHIVE_CONFIG } = require('../../shared/constants');
+
+// Columnas de tickets, en el mismo orden en main y en archive (UNION ALL e INSERT ... SELECT)
+const TICKET_COLUMNS = `
+  id, ticket_number, valor, moneda, fecha_emision, fecha_canje, estado, qr_data,
+  mesa_id, usuario_emision, usuario_canje, hash_seguridad, synced, created_at, updated_at
+`;
+
+const INSERT_TICKET_SQL = `
+  INSERT INTO tickets (
+    ticket_number, 
+    valor, 
+    moneda, 
+    qr_data, 
+    mesa_id, 
+    usuario_emision, 
+    hash_seguridad
+  )
+  VALUES (?, ?, ?, ?, ?, ?, ?)
+  RETURNING *
+`;
+
+/**
+ * Perfiles de almacenamiento (PRAGMAs que se ajustan juntos):
+ * - durable: synchronous=FULL, cada commit llega al disco (valor por defecto)
+ * - balanced: synchronous=NORMAL, en WAL un corte de luz puede perder los últimos
+ *   commits pero nunca corrompe la base; más caché y mmap
+ * - fast-read: como balanced, con caché y mmap grandes para reportes
+ * cacheSizeKiB y mmapSize en KiB/bytes; walAutocheckpoint en páginas (respaldo del
+ * CheckpointScheduler, que hace el trabajo en momentos ociosos).
+ */
+const STORAGE_PROFILES = {
+  durable: {
+    synchronous: 'FULL',
+    cacheSizeKiB: 16 * 1024,
+    mmapSize: 0,
+    tempStore: 'DEFAULT',
+    walAutocheckpoint: 4000
+  },
+  balanced: {
+    synchronous: 'NORMAL',
+    cacheSizeKiB: 64 * 1024,
+    mmapSize: 256 * 1024 * 1024,
+    tempStore: 'MEMORY',
+    walAutocheckpoint: 10000
+  },
+  'fast-read': {
+    synchronous: 'NORMAL',
+    cacheSizeKiB: 128 * 1024,
+    mmapSize: 1024 * 1024 * 1024,
+    tempStore: 'MEMORY',
+    walAutocheckpoint: 20000
+  }
+};
+
+const DEFAULT_STORAGE_PROFILE = 'durable';
+
+const CHECKPOINT_MODES = ['PASSIVE', 'FULL', 'RESTART', 'TRUNCATE'];
 
 /**
  * Clase para manejar la base de datos SQLite local
  */
 class SQLiteDB {
-  constructor(dbPath = null) {
+  /**
+   * @param {string} dbPath - Ruta del archivo o ':memory:'
+   * @param {Object} options - { readonly, profile, archivePath }
+   *   readonly: abre una base existente solo para lectura (sin crear esquema)
+   *   profile: nombre en STORAGE_PROFILES (por defecto SQLITE_PROFILE o 'durable')
+   *   archivePath: archivo de tickets archivados (por defecto SQLITE_ARCHIVE_PATH o <db>-archive.db;
+   *     con ':memory:' el archivo también queda en memoria)
+   */
+  constructor(dbPath = null, options = {}) {
     // Configurar ruta de la base de datos
     if (dbPath === ':memory:') {
       this.dbPath = dbPath;
@@ -27,14 +92,114 @@ class SQLiteDB {
       this.dbPath = defaultPath;
     }
     
+    if (this.dbPath === ':memory:') {
+      this.archivePath = options.archivePath || ':memory:';
+    } else {
+      this.archivePath = options.archivePath || process.env.SQLITE_ARCHIVE_PATH ||
+        this.dbPath.replace(/(\\.db)?$/, '-archive.db');
+    }
+    
+    // Caché de statements preparados (uno por SQL, por conexión)
+    this.statements = new Map();
+    this.readonly = Boolean(options.readonly);
+    this.profileName = options.profile || process.env.SQLITE_PROFILE || DEFAULT_STORAGE_PROFILE;
+    this.profile = STORAGE_PROFILES[this.profileName];
+    
+    if (!this.profile) {
+      throw new Error(`Perfil de almacenamiento desconocido: ${this.profileName}`);
+    }
+    
+    // Conexión de solo lectura (worker de consultas): el esquema ya lo creó la de escritura
+    if (this.readonly) {
+      this.db = new Database(this.dbPath, { readonly: true, fileMustExist: true });
+      this.applyProfile();
+      this.db.prepare('ATTACH DATABASE ? AS archive').run(this.archivePath);
+      return;
+    }
+    
     // Inicializar base de datos
     this.db = new Database(this.dbPath);
     this.db.pragma('journal_mode = WAL'); // Mejor rendimiento
     this.db.pragma('foreign_keys = ON');   // Habilitar foreign keys
+    this.applyProfile();
     
+    this.initArchive();
     this.initTables();
   }
 
+  /**
+   * Aplica los PRAGMAs del perfil de almacenamiento. En la conexión de solo
+   * lectura solo cuentan los de lectura (caché, mmap y temporales).
+   */
+  applyProfile() {
+    const { synchronous, cacheSizeKiB, mmapSize, tempStore, walAutocheckpoint } = this.profile;
+    
+    this.db.pragma(`cache_size = -${cacheSizeKiB}`);
+    this.db.pragma(`mmap_size = ${mmapSize}`);
+    this.db.pragma(`temp_store = ${tempStore}`);
+    
+    if (!this.readonly) {
+      this.db.pragma(`synchronous = ${synchronous}`);
+      this.db.pragma(`wal_autocheckpoint = ${walAutocheckpoint}`);
+    }
+  }
+
+  /**
+   * Ejecuta un checkpoint del WAL. Los modos distintos de PASSIVE no esperan
+   * a los lectores: si hay uno activo devuelven busy en lugar de bloquear la conexión.
+   * @param {string} mode - PASSIVE | FULL | RESTART | TRUNCATE
+   * @returns {Object} { busy, log, checkpointed } (páginas en el WAL y copiadas a la base)
+   */
+  checkpoint(mode = 'PASSIVE') {
+    if (!CHECKPOINT_MODES.includes(mode)) {
+      throw new Error(`Modo de checkpoint inválido: ${mode}`);
+    }
+    
+    if (mode === 'PASSIVE') {
+      return this.db.pragma('wal_checkpoint(PASSIVE)')[0];
+    }
+    
+    const busyTimeout = this.db.pragma('busy_timeout', { simple: true });
+    this.db.pragma('busy_timeout = 0');
+    try {
+      return this.db.pragma(`wal_checkpoint(${mode})`)[0];
+    } finally {
+      this.db.pragma(`busy_timeout = ${busyTimeout}`);
+    }
+  }
+
+  /**
+   * Configuración efectiva de la conexión (diagnóstico y benchmarks)
+   * @returns {Object} Perfil y valores leídos de SQLite
+   */
+  getStorageSettings() {
+    return {
+      profile: this.profileName,
+      journal_mode: this.db.pragma('journal_mode', { simple: true }),
+      synchronous: this.db.pragma('synchronous', { simple: true }),
+      cache_size: this.db.pragma('cache_size', { simple: true }),
+      mmap_size: this.db.pragma('mmap_size', { simple: true }),
+      temp_store: this.db.pragma('temp_store', { simple: true }),
+      wal_autocheckpoint: this.db.pragma('wal_autocheckpoint', { simple: true })
+    };
+  }
+
+  /**
+   * Obtiene un statement preparado, compilándolo solo la primera vez
+   * @param {string} sql - Sentencia SQL
+   * @returns {Object} Statement preparado de better-sqlite3
+   */
+  prepareCached(sql) {
+    let stmt = this.statements.get(sql);
+    
+    if (!stmt) {
+      stmt = this.db.prepare(sql);
+      this.statements.set(sql, stmt);
+    }
+    
+    return stmt;
+  }
+
   /**
    * Inicializa las tablas de la base de datos
    */
@@ -61,13 +226,24 @@ class SQLiteDB {
     
     this.db.exec(createTableSQL);
     
-    // Crear índices para mejorar rendimiento
+    // Índices anteriores: ticket_number ya tiene el índice del UNIQUE, estado/synced
+    // tienen muy poca selectividad y ninguna consulta filtra por mesa_id
+    const droppedIndexes = ['idx_ticket_number', 'idx_estado', 'idx_synced', 'idx_mesa_id'];
+    droppedIndexes.forEach(name => {
+      this.db.exec(`DROP INDEX IF EXISTS ${name}`);
+    });
+    
+    // Cada índice corresponde a consultas de esta clase (ver tests/unit/query-plans.test.js)
     const indexes = [
-      'CREATE INDEX IF NOT EXISTS idx_ticket_number ON tickets(ticket_number)',
-      'CREATE INDEX IF NOT EXISTS idx_estado ON tickets(estado)',
-      'CREATE INDEX IF NOT EXISTS idx_synced ON tickets(synced)',
+      // Rangos por fecha y paginación por (fecha_emision, id)
       'CREATE INDEX IF NOT EXISTS idx_fecha_emision ON tickets(fecha_emision)',
-      'CREATE INDEX IF NOT EXISTS idx_mesa_id ON tickets(mesa_id)'
+      // Cubre estadísticas sin leer la tabla (rebuildDailyStats, conteo de cerrados)
+      'CREATE INDEX IF NOT EXISTS idx_tickets_report ON tickets(fecha_emision, estado, moneda, valor, mesa_id)',
+      // Parciales: solo las filas pendientes de sincronizar / canjeables
+      'CREATE INDEX IF NOT EXISTS idx_tickets_unsynced ON tickets(updated_at, id) WHERE synced = 0',
+      "CREATE INDEX IF NOT EXISTS idx_tickets_open ON tickets(id) WHERE estado = 'emitido'",
+      // Candidatos a archivo: cerrados y ya sincronizados, por antigüedad
+      "CREATE INDEX IF NOT EXISTS idx_tickets_archivable ON tickets(updated_at) WHERE estado != 'emitido' AND synced = 1"
     ];
     
     indexes.forEach(indexSQL => {
@@ -84,14 +260,167 @@ class SQLiteDB {
     `;
     
     this.db.exec(triggerSQL);
+    
+    this.initDailyStats();
+    
+    // Estado persistente de sincronización (cursores, marcas de agua)
+    this.db.exec(`
+      CREATE TABLE IF NOT EXISTS sync_state (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+      )
+    `);
+    
+    // Secuencia de números de ticket por estación (se reinicia cada día)
+    this.db.exec(`
+      CREATE TABLE IF NOT EXISTS ticket_sequences (
+        station_id INTEGER PRIMARY KEY,
+        day INTEGER NOT NULL,
+        last_value INTEGER NOT NULL
+      )
+    `);
+    
+    // Cola persistente de impresión (se procesa en orden de id)
+    this.db.exec(`
+      CREATE TABLE IF NOT EXISTS print_jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ticket_number TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        estado TEXT NOT NULL DEFAULT 'pendiente' CHECK (estado IN ('pendiente', 'imprimiendo', 'impreso', 'fallido')),
+        attempts INTEGER NOT NULL DEFAULT 0,
+        last_error TEXT NULL,
+        next_attempt_at INTEGER NOT NULL DEFAULT 0,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        printed_at DATETIME NULL
+      )
+    `);
+    this.db.exec(`
+      CREATE INDEX IF NOT EXISTS idx_print_jobs_pending ON print_jobs(id)
+      WHERE estado IN ('pendiente', 'imprimiendo')
+    `);
   }
 
   /**
-   * Crea un nuevo ticket
+   * Adjunta la base de archivo y crea su esquema. Guarda los tickets cerrados
+   * antiguos (ver archiveClosedTickets) para que la tabla tickets siga pequeña;
+   * conserva los id originales.
+   */
+  initArchive() {
+    this.db.prepare('ATTACH DATABASE ? AS archive').run(this.archivePath);
+    this.db.pragma('archive.journal_mode = WAL');
+    this.db.pragma(`archive.synchronous = ${this.profile.synchronous}`);
+    
+    this.db.exec(`
+      CREATE TABLE IF NOT EXISTS archive.tickets (
+        id INTEGER PRIMARY KEY,
+        ticket_number TEXT UNIQUE NOT NULL,
+        valor REAL NOT NULL,
+        moneda TEXT NOT NULL,
+        fecha_emision DATETIME,
+        fecha_canje DATETIME NULL,
+        estado TEXT NOT NULL,
+        qr_data TEXT NOT NULL,
+        mesa_id INTEGER NULL,
+        usuario_emision TEXT NULL,
+        usuario_canje TEXT NULL,
+        hash_seguridad TEXT NULL,
+        synced INTEGER NOT NULL,
+        created_at DATETIME,
+        updated_at DATETIME,
+        archived_at DATETIME DEFAULT CURRENT_TIMESTAMP
+      )
+    `);
+    this.db.exec('CREATE INDEX IF NOT EXISTS archive.idx_archive_fecha_emision ON tickets(fecha_emision)');
+  }
+
+  /**
+   * Crea la tabla de estadísticas diarias pre-agregadas y sus triggers.
+   * ticket_stats_daily guarda (count, total) por día, mesa, moneda y estado;
+   * los triggers la mantienen al insertar tickets y al cambiar estado/valor.
+   * No hay trigger de DELETE: las estadísticas históricas se conservan
+   * (archivar un ticket no lo descuenta).
+   */
+  initDailyStats() {
+    this.db.exec(`
+      CREATE TABLE IF NOT EXISTS ticket_stats_daily (
+        fecha TEXT NOT NULL,
+        mesa_id INTEGER NOT NULL DEFAULT 0,
+        moneda TEXT NOT NULL,
+        estado TEXT NOT NULL,
+        count INTEGER NOT NULL DEFAULT 0,
+        total REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (fecha, mesa_id, moneda, estado)
+      )
+    `);
+
+    this.db.exec(`
+      CREATE TRIGGER IF NOT EXISTS ticket_stats_daily_insert
+      AFTER INSERT ON tickets
+      BEGIN
+        INSERT INTO ticket_stats_daily (fecha, mesa_id, moneda, estado, count, total)
+        VALUES (date(NEW.fecha_emision), COALESCE(NEW.mesa_id, 0), NEW.moneda, NEW.estado, 1, NEW.valor)
+        ON CONFLICT (fecha, mesa_id, moneda, estado)
+        DO UPDATE SET count = count + 1, total = total + excluded.total;
+      END
+    `);
+
+    this.db.exec(`
+      CREATE TRIGGER IF NOT EXISTS ticket_stats_daily_update
+      AFTER UPDATE OF estado, valor, moneda, mesa_id, fecha_emision ON tickets
+      WHEN OLD.estado IS NOT NEW.estado
+        OR OLD.valor IS NOT NEW.valor
+        OR OLD.moneda IS NOT NEW.moneda
+        OR OLD.mesa_id IS NOT NEW.mesa_id
+        OR OLD.fecha_emision IS NOT NEW.fecha_emision
+      BEGIN
+        UPDATE ticket_stats_daily
+        SET count = count - 1, total = total - OLD.valor
+        WHERE fecha = date(OLD.fecha_emision)
+          AND mesa_id = COALESCE(OLD.mesa_id, 0)
+          AND moneda = OLD.moneda
+          AND estado = OLD.estado;
+
+        INSERT INTO ticket_stats_daily (fecha, mesa_id, moneda, estado, count, total)
+        VALUES (date(NEW.fecha_emision), COALESCE(NEW.mesa_id, 0), NEW.moneda, NEW.estado, 1, NEW.valor)
+        ON CONFLICT (fecha, mesa_id, moneda, estado)
+        DO UPDATE SET count = count + 1, total = total + excluded.total;
+      END
+    `);
+
+    // Bases de datos existentes: poblar la tabla a partir de los tickets actuales
+    const isEmpty = !this.db.prepare('SELECT 1 FROM ticket_stats_daily LIMIT 1').get();
+    if (isEmpty) {
+      this.rebuildDailyStats();
+    }
+  }
+
+  /**
+   * Recalcula ticket_stats_daily desde cero a partir de tickets y su archivo
+   */
+  rebuildDailyStats() {
+    this.transaction(() => {
+      this.db.exec('DELETE FROM ticket_stats_daily');
+      this.db.exec(`
+        INSERT INTO ticket_stats_daily (fecha, mesa_id, moneda, estado, count, total)
+        SELECT date(fecha_emision), COALESCE(mesa_id, 0), moneda, estado, COUNT(*), SUM(valor)
+        FROM (
+          SELECT fecha_emision, mesa_id, moneda, estado, valor FROM main.tickets
+          UNION ALL
+          SELECT fecha_emision, mesa_id, moneda, estado, valor FROM archive.tickets a
+          WHERE NOT EXISTS (SELECT 1 FROM main.tickets m WHERE m.id = a.id)
+        )
+        GROUP BY date(fecha_emision), COALESCE(mesa_id, 0), moneda, estado
+      `);
+    });
+  }
+
+  /**
+   * Valida los datos de un ticket y los convierte en parámetros de INSERT
    * @param {Object} ticketData - Datos del ticket
-   * @returns {Promise<Object>} Ticket creado
+   * @returns {Array} Parámetros en el orden de INSERT_TICKET_SQL
    */
-  async createTicket(ticketData) {
+  buildTicketParams(ticketData) {
     const {
       ticket_number,
       valor,
@@ -115,58 +444,176 @@ class SQLiteDB {
       throw new Error('El valor debe ser mayor que cero');
     }
 
+    return [
+      ticket_number,
+      valor,
+      moneda,
+      qr_data,
+      mesa_id,
+      usuario_emision,
+      hash_seguridad
+    ];
+  }
+
+  /**
+   * Crea un nuevo ticket
+   * @param {Object} ticketData - Datos del ticket
+   * @returns {Promise<Object>} Ticket creado
+   */
+  async createTicket(ticketData) {
+    const params = this.buildTicketParams(ticketData);
+
     try {
-      const stmt = this.db.prepare(`
-        INSERT INTO tickets (
-          ticket_number, 
-          valor, 
-          moneda, 
-          qr_data, 
-          mesa_id, 
-          usuario_emision, 
-          hash_seguridad
-        )
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-      `);
-      
-      const result = stmt.run(
-        ticket_number,
-        valor,
-        moneda,
-        qr_data,
-        mesa_id,
-        usuario_emision,
-        hash_seguridad
-      );
+      // INSERT ... RETURNING devuelve la fila creada sin un SELECT adicional
+      return this.prepareCached(INSERT_TICKET_SQL).get(...params);
       
-      return this.findTicketById(result.lastInsertRowid);
+    } catch (error) {
+      if (error.code === 'SQLITE_CONSTRAINT_UNIQUE') {
+        throw new Error(`Ticket con número ${params[0]} ya existe`);
+      }
+      throw new Error(`Error creando ticket: ${error.message}`);
+    }
+  }
+
+  /**
+   * Crea un ticket y encola su impresión en la misma transacción
+   * @param {Object} ticketData - Datos del ticket
+   * @param {Object} printPayload - Datos de impresión (serializables a JSON)
+   * @returns {Promise<Object>} { ticket, jobId }
+   */
+  async createTicketWithPrintJob(ticketData, printPayload) {
+    const [created] = await this.createTicketsWithPrintJobs([{ ticket: ticketData, payload: printPayload }]);
+    return created;
+  }
+
+  /**
+   * Crea varios tickets con sus trabajos de impresión en una sola transacción
+   * @param {Array<Object>} entries - Lista de { ticket, payload }
+   * @returns {Promise<Array<Object>>} Lista de { ticket, jobId }, en el mismo orden
+   */
+  async createTicketsWithPrintJobs(entries) {
+    // Validar todo el lote antes de escribir
+    const paramsList = entries.map(entry => this.buildTicketParams(entry.ticket));
+    const stmt = this.prepareCached(INSERT_TICKET_SQL);
+    let current = null;
+
+    const insertAll = this.db.transaction(() => {
+      return entries.map((entry, index) => {
+        current = paramsList[index][0];
+        const ticket = stmt.get(...paramsList[index]);
+        const jobId = this.enqueuePrintJob(ticket.ticket_number, entry.payload);
+        return { ticket, jobId };
+      });
+    });
+
+    try {
+      return insertAll();
       
     } catch (error) {
       if (error.code === 'SQLITE_CONSTRAINT_UNIQUE') {
-        throw new Error(`Ticket con número ${ticket_number} ya existe`);
+        throw new Error(`Ticket con número ${current} ya existe`);
       }
       throw new Error(`Error creando ticket: ${error.message}`);
     }
   }
 
   /**
-   * Busca un ticket por ID
+   * Crea varios tickets en una sola transacción
+   * @param {Array<Object>} tickets - Lista de datos de tickets
+   * @returns {Promise<Array<Object>>} Tickets creados, en el mismo orden
+   */
+  async createTicketsBatch(tickets) {
+    if (!Array.isArray(tickets) || tickets.length === 0) {
+      return [];
+    }
+
+    // Validar todo el lote antes de escribir
+    const paramsList = tickets.map(ticket => this.buildTicketParams(ticket));
+    const stmt = this.prepareCached(INSERT_TICKET_SQL);
+    let current = null;
+
+    const insertAll = this.db.transaction((rows) => {
+      return rows.map(params => {
+        current = params[0];
+        return stmt.get(...params);
+      });
+    });
+
+    try {
+      return insertAll(paramsList);
+      
+    } catch (error) {
+      if (error.code === 'SQLITE_CONSTRAINT_UNIQUE') {
+        throw new Error(`Ticket con número ${current} ya existe`);
+      }
+      throw new Error(`Error creando lote de tickets: ${error.message}`);
+    }
+  }
+
+  /**
+   * Busca un ticket por ID (también entre los archivados)
    * @param {number} id - ID del ticket
    * @returns {Object|undefined} Ticket encontrado
    */
   findTicketById(id) {
-    const stmt = this.db.prepare('SELECT * FROM tickets WHERE id = ?');
-    return stmt.get(id);
+    return this.prepareCached(`
+      SELECT ${TICKET_COLUMNS} FROM main.tickets WHERE id = ?
+      UNION ALL
+      SELECT ${TICKET_COLUMNS} FROM archive.tickets WHERE id = ?
+      LIMIT 1
+    `).get(id, id);
   }
 
   /**
-   * Busca un ticket por número
+   * Busca un ticket por número (también entre los archivados: un ticket
+   * canjeado hace meses sigue reconociéndose como canjeado)
    * @param {string} ticketNumber - Número del ticket
    * @returns {Object|undefined} Ticket encontrado
    */
   findTicketByNumber(ticketNumber) {
-    const stmt = this.db.prepare('SELECT * FROM tickets WHERE ticket_number = ?');
-    return stmt.get(ticketNumber);
+    return this.prepareCached(`
+      SELECT ${TICKET_COLUMNS} FROM main.tickets WHERE ticket_number = ?
+      UNION ALL
+      SELECT ${TICKET_COLUMNS} FROM archive.tickets WHERE ticket_number = ?
+      LIMIT 1
+    `).get(ticketNumber, ticketNumber);
+  }
+
+  /**
+   * Obtiene los tickets canjeables (estado 'emitido')
+   * @returns {Array} Tickets abiertos
+   */
+  getOpenTickets() {
+    return this.prepareCached("SELECT * FROM tickets WHERE estado = 'emitido'").all();
+  }
+
+  /**
+   * Cuenta los tickets cerrados (canjeados o anulados), incluidos los archivados.
+   * Un ticket copiado al archivo y aún no borrado de la tabla principal cuenta una vez.
+   * @returns {number} Cantidad de tickets cerrados
+   */
+  countClosedTickets() {
+    return this.prepareCached(`
+      SELECT (SELECT COUNT(*) FROM main.tickets WHERE estado != 'emitido')
+        + (SELECT COUNT(*) FROM archive.tickets a
+           WHERE NOT EXISTS (SELECT 1 FROM main.tickets m WHERE m.id = a.id)) AS count
+    `).get().count;
+  }
+
+  /**
+   * Recorre los números de los tickets cerrados (incluidos los archivados)
+   * sin cargarlos todos en memoria, una vez cada uno
+   * @returns {Iterator<string>} Números de ticket
+   */
+  iterateClosedTicketNumbers() {
+    return this.prepareCached(`
+      SELECT ticket_number FROM main.tickets WHERE estado != 'emitido'
+      UNION ALL
+      SELECT ticket_number FROM archive.tickets a
+      WHERE NOT EXISTS (SELECT 1 FROM main.tickets m WHERE m.id = a.id)
+    `)
+      .pluck()
+      .iterate();
   }
 
   /**
@@ -181,7 +628,7 @@ class SQLiteDB {
       throw new Error(`Estado inválido: ${estado}`);
     }
 
-    const stmt = this.db.prepare(`
+    const stmt = this.prepareCached(`
       UPDATE tickets 
       SET 
         estado = ?, 
@@ -194,67 +641,430 @@ class SQLiteDB {
     return stmt.run(estado, estado, usuarioCanje, ticketNumber);
   }
 
+  /**
+   * Canjea un ticket con una sola sentencia condicional (compare-and-set):
+   * solo pasa a 'canjeado' si sigue 'emitido' y, si se indica, si su QR coincide.
+   * Dos cajas que canjean el mismo ticket a la vez: una recibe la fila, la otra nada.
+   * @param {string} ticketNumber - Número del ticket
+   * @param {string} usuarioCanje - Usuario que canjea
+   * @param {string|null} qrData - Contenido del QR presentado (opcional)
+   * @returns {Object|undefined} Ticket canjeado, o undefined si no se canjeó
+   */
+  redeemTicket(ticketNumber, usuarioCanje = null, qrData = null) {
+    return this.prepareCached(`
+      UPDATE tickets
+      SET
+        estado = 'canjeado',
+        fecha_canje = CURRENT_TIMESTAMP,
+        usuario_canje = ?,
+        synced = 0
+      WHERE ticket_number = ? AND estado = 'emitido' AND (? IS NULL OR qr_data = ?)
+      RETURNING *
+    `).get(usuarioCanje, ticketNumber, qrData, qrData);
+  }
+
   /**
    * Obtiene tickets no sincronizados
    * @returns {Array} Lista de tickets no sincronizados
    */
   getUnsyncedTickets() {
-    const stmt = this.db.prepare('SELECT * FROM tickets WHERE synced = 0 ORDER BY created_at ASC');
-    return stmt.all();
+    return this.prepareCached('SELECT * FROM tickets WHERE synced = 0 ORDER BY created_at ASC').all();
+  }
+
+  /**
+   * Obtiene una página de tickets no sincronizados posterior a un cursor
+   * @param {Object|null} cursor - Último { updated_at, id } procesado
+   * @param {number} limit - Tamaño máximo de la página
+   * @returns {Array} Tickets ordenados por (updated_at, id)
+   */
+  getUnsyncedTicketsPage(cursor = null, limit = 200) {
+    const { updated_at = '', id = 0 } = cursor || {};
+    
+    return this.prepareCached(`
+      SELECT * FROM tickets
+      WHERE synced = 0 AND (updated_at, id) > (?, ?)
+      ORDER BY updated_at ASC, id ASC
+      LIMIT ?
+    `).all(updated_at, id, limit);
+  }
+
+  /**
+   * Lee un valor del estado de sincronización
+   * @param {string} key - Clave del estado
+   * @returns {*} Valor almacenado o null
+   */
+  getSyncState(key) {
+    const row = this.prepareCached('SELECT value FROM sync_state WHERE key = ?').get(key);
+    return row ? JSON.parse(row.value) : null;
+  }
+
+  /**
+   * Guarda un valor en el estado de sincronización
+   * @param {string} key - Clave del estado
+   * @param {*} value - Valor serializable a JSON (null lo elimina)
+   */
+  setSyncState(key, value) {
+    if (value === null || value === undefined) {
+      this.prepareCached('DELETE FROM sync_state WHERE key = ?').run(key);
+      return;
+    }
+
+    this.prepareCached(`
+      INSERT INTO sync_state (key, value) VALUES (?, ?)
+      ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = CURRENT_TIMESTAMP
+    `).run(key, JSON.stringify(value));
+  }
+
+  /**
+   * Confirma una página sincronizada: marca tickets y avanza el cursor en una transacción
+   * @param {Array<Object>} tickets - Filas enviadas correctamente, tal como se leyeron
+   * @param {string} cursorKey - Clave del cursor en sync_state
+   * @param {Object|null} cursor - Nuevo cursor { updated_at, id }
+   * @returns {number} Cantidad de tickets marcados
+   */
+  commitSyncPage(tickets, cursorKey, cursor) {
+    return this.transaction(() => {
+      const marked = this.markPushedAsSynced(tickets);
+      this.setSyncState(cursorKey, cursor);
+      return marked;
+    });
+  }
+
+  /**
+   * Marca como sincronizados los tickets enviados que no cambiaron desde que se
+   * leyeron. Un ticket modificado durante el envío (p. ej. canjeado mientras se
+   * subía su emisión) queda pendiente y su estado nuevo se envía en la próxima pasada.
+   * @param {Array<Object>} tickets - Filas enviadas { id, updated_at, estado, fecha_canje, usuario_canje }
+   * @returns {number} Cantidad de tickets marcados
+   */
+  markPushedAsSynced(tickets) {
+    if (!Array.isArray(tickets) || tickets.length === 0) {
+      return 0;
+    }
+
+    const pushed = tickets.map(ticket => ({
+      id: ticket.id,
+      updated_at: ticket.updated_at,
+      estado: ticket.estado,
+      fecha_canje: ticket.fecha_canje,
+      usuario_canje: ticket.usuario_canje
+    }));
+
+    return this.prepareCached(`
+      UPDATE tickets SET synced = 1
+      WHERE id IN (
+        SELECT t.id FROM tickets t
+        JOIN json_each(?) j ON t.id = json_extract(j.value, '$.id')
+        WHERE t.updated_at = json_extract(j.value, '$.updated_at')
+          AND t.estado = json_extract(j.value, '$.estado')
+          AND t.fecha_canje IS json_extract(j.value, '$.fecha_canje')
+          AND t.usuario_canje IS json_extract(j.value, '$.usuario_canje')
+      )
+    `).run(JSON.stringify(pushed)).changes;
   }
 
   /**
    * Marca tickets como sincronizados
    * @param {Array<number>} ticketIds - IDs de tickets a marcar
+   * @returns {number} Cantidad de tickets marcados
    */
   markAsSynced(ticketIds) {
     if (!Array.isArray(ticketIds) || ticketIds.length === 0) {
-      return;
+      return 0;
     }
 
-    const stmt = this.db.prepare('UPDATE tickets SET synced = 1 WHERE id = ?');
-    const transaction = this.db.transaction((ids) => {
-      for (const id of ids) {
-        stmt.run(id);
+    // Un solo UPDATE por lote; json_each evita un statement distinto por cantidad de IDs
+    const stmt = this.prepareCached(`
+      UPDATE tickets SET synced = 1
+      WHERE id IN (SELECT value FROM json_each(?))
+    `);
+    
+    return stmt.run(JSON.stringify(ticketIds)).changes;
+  }
+
+  /**
+   * Aplica una página de tickets descargados de Supabase y avanza el cursor
+   * de descarga en una sola transacción. Los tickets nuevos se insertan como
+   * sincronizados; los existentes solo pasan de 'emitido' a cerrado, y nunca
+   * se pisan cambios locales pendientes de subir (synced = 0).
+   * @param {Array} tickets - Tickets remotos
+   * @param {string} cursorKey - Clave del cursor en sync_state
+   * @param {Object} cursor - Nuevo cursor { updated_at, id } (valores remotos)
+   * @returns {Array<Object>} Cambios aplicados: { ticket, previousEstado } (null si se insertó)
+   */
+  applyRemoteTicketsPage(tickets, cursorKey, cursor) {
+    return this.transaction(() => {
+      const changes = this.applyRemoteTickets(tickets);
+      this.setSyncState(cursorKey, cursor);
+      return changes;
+    });
+  }
+
+  /**
+   * Aplica tickets remotos con las mismas reglas que applyRemoteTicketsPage,
+   * sin tocar el cursor de descarga (p. ej. un ticket consultado a Supabase al validar)
+   * @param {Array} tickets - Tickets remotos
+   * @returns {Array<Object>} Cambios aplicados: { ticket, previousEstado } (null si se insertó)
+   */
+  applyRemoteTickets(tickets) {
+    const insertStmt = this.prepareCached(`
+      INSERT INTO tickets (
+        ticket_number, valor, moneda, fecha_emision, fecha_canje, estado,
+        qr_data, mesa_id, usuario_emision, usuario_canje, hash_seguridad, synced
+      )
+      VALUES (?, ?, ?, datetime(?), datetime(?), ?, ?, ?, ?, ?, ?, 1)
+      RETURNING *
+    `);
+    const closeStmt = this.prepareCached(`
+      UPDATE tickets
+      SET estado = ?, fecha_canje = datetime(?), usuario_canje = ?
+      WHERE id = ?
+      RETURNING *
+    `);
+
+    return this.transaction(() => {
+      const changes = [];
+
+      for (const remote of tickets) {
+        const local = this.findTicketByNumber(remote.ticket_number);
+
+        if (!local) {
+          const ticket = insertStmt.get(
+            remote.ticket_number,
+            remote.valor,
+            remote.moneda,
+            remote.fecha_emision,
+            remote.fecha_canje,
+            remote.estado,
+            remote.qr_data,
+            remote.mesa_id,
+            remote.usuario_emision,
+            remote.usuario_canje,
+            remote.hash_seguridad
+          );
+          changes.push({ ticket, previousEstado: null });
+
+        } else if (local.synced === 1 && local.estado === 'emitido' && remote.estado !== 'emitido') {
+          const ticket = closeStmt.get(remote.estado, remote.fecha_canje, remote.usuario_canje, local.id);
+          changes.push({ ticket, previousEstado: local.estado });
+        }
       }
+
+      return changes;
     });
-    
-    transaction(ticketIds);
   }
 
   /**
-   * Obtiene estadísticas de tickets
-   * @param {string} dateFrom - Fecha desde (opcional)
-   * @param {string} dateTo - Fecha hasta (opcional)
-   * @returns {Object} Estadísticas calculadas
+   * Reserva valores consecutivos de la secuencia de tickets de una estación.
+   * La secuencia vuelve a 1 al cambiar de día; si el reloj retrocede se
+   * conserva el día más reciente y se sigue incrementando, así nunca se repite un valor.
+   * @param {number} stationId - Estación (mesa)
+   * @param {number} day - Día actual (días desde la época de numeración)
+   * @param {number} count - Cantidad de valores a reservar
+   * @returns {Object} { day, first } día asignado y primer valor reservado
    */
-  getTicketStats(dateFrom = null, dateTo = null) {
-    let whereClause = '';
-    const params = [];
+  allocateTicketSequence(stationId, day, count = 1) {
+    const row = this.prepareCached(`
+      INSERT INTO ticket_sequences (station_id, day, last_value) VALUES (?, ?, ?)
+      ON CONFLICT(station_id) DO UPDATE SET
+        last_value = CASE WHEN excluded.day > day THEN excluded.last_value ELSE last_value + excluded.last_value END,
+        day = MAX(day, excluded.day)
+      RETURNING day, last_value
+    `).get(stationId, day, count);
     
-    if (dateFrom && dateTo) {
-      whereClause = 'WHERE fecha_emision BETWEEN ? AND ?';
-      params.push(dateFrom, dateTo);
-    }
+    return { day: row.day, first: row.last_value - count + 1 };
+  }
+
+  /**
+   * Agrega un trabajo a la cola de impresión
+   * @param {string} ticketNumber - Número del ticket
+   * @param {Object} payload - Datos de impresión (serializables a JSON)
+   * @returns {number} ID del trabajo
+   */
+  enqueuePrintJob(ticketNumber, payload) {
+    const result = this.prepareCached(`
+      INSERT INTO print_jobs (ticket_number, payload) VALUES (?, ?)
+    `).run(ticketNumber, JSON.stringify(payload));
     
-    const stmt = this.db.prepare(`
-      SELECT 
-        estado,
-        moneda,
-        valor,
-        COUNT(*) as count,
-        SUM(valor) as total_valor
-      FROM tickets 
-      ${whereClause}
-      GROUP BY estado, moneda
-    `);
+    return Number(result.lastInsertRowid);
+  }
+
+  /**
+   * Obtiene el trabajo más antiguo sin terminar (la cola se procesa en orden)
+   * @returns {Object|undefined} Trabajo con payload ya parseado
+   */
+  getNextPrintJob() {
+    const job = this.prepareCached(`
+      SELECT * FROM print_jobs
+      WHERE estado IN ('pendiente', 'imprimiendo')
+      ORDER BY id ASC
+      LIMIT 1
+    `).get();
     
-    const results = stmt.all(...params);
+    if (job) {
+      job.payload = JSON.parse(job.payload);
+    }
     
-    // Calcular estadísticas
-    const stats = {
-      total_emitidos: 0,
-      total_canjeados: 0,
+    return job;
+  }
+
+  /**
+   * Marca un trabajo como en impresión y cuenta el intento
+   * @param {number} jobId - ID del trabajo
+   */
+  startPrintJob(jobId) {
+    this.prepareCached(`
+      UPDATE print_jobs SET estado = 'imprimiendo', attempts = attempts + 1 WHERE id = ?
+    `).run(jobId);
+  }
+
+  /**
+   * Marca un trabajo como impreso
+   * @param {number} jobId - ID del trabajo
+   */
+  completePrintJob(jobId) {
+    this.prepareCached(`
+      UPDATE print_jobs
+      SET estado = 'impreso', last_error = NULL, printed_at = CURRENT_TIMESTAMP
+      WHERE id = ?
+    `).run(jobId);
+  }
+
+  /**
+   * Registra un intento fallido
+   * @param {number} jobId - ID del trabajo
+   * @param {string} errorMessage - Error del intento
+   * @param {number|null} nextAttemptAt - Próximo intento (epoch ms); null lo marca como fallido
+   */
+  failPrintJob(jobId, errorMessage, nextAttemptAt) {
+    this.prepareCached(`
+      UPDATE print_jobs
+      SET estado = CASE WHEN ? IS NULL THEN 'fallido' ELSE 'pendiente' END,
+          last_error = ?,
+          next_attempt_at = COALESCE(?, next_attempt_at)
+      WHERE id = ?
+    `).run(nextAttemptAt, errorMessage, nextAttemptAt, jobId);
+  }
+
+  /**
+   * Vuelve a encolar un trabajo fallido (reimpresión manual)
+   * @param {number} jobId - ID del trabajo
+   * @returns {boolean} True si el trabajo estaba fallido
+   */
+  retryPrintJob(jobId) {
+    const result = this.prepareCached(`
+      UPDATE print_jobs
+      SET estado = 'pendiente', attempts = 0, next_attempt_at = 0
+      WHERE id = ? AND estado = 'fallido'
+    `).run(jobId);
+    
+    return result.changes > 0;
+  }
+
+  /**
+   * Devuelve a 'pendiente' los trabajos interrumpidos (cierre durante la impresión).
+   * El IN repite la condición de idx_print_jobs_pending para que SQLite pueda usarlo.
+   * @returns {number} Cantidad de trabajos recuperados
+   */
+  recoverPrintJobs() {
+    return this.prepareCached(`
+      UPDATE print_jobs SET estado = 'pendiente', next_attempt_at = 0
+      WHERE estado IN ('pendiente', 'imprimiendo') AND estado = 'imprimiendo'
+    `).run().changes;
+  }
+
+  /**
+   * Cantidad de trabajos sin imprimir
+   * @returns {number} Profundidad de la cola
+   */
+  getPrintQueueDepth() {
+    return this.prepareCached(`
+      SELECT COUNT(*) AS depth FROM print_jobs WHERE estado IN ('pendiente', 'imprimiendo')
+    `).get().depth;
+  }
+
+  /**
+   * Mueve al archivo un lote de tickets cerrados, ya sincronizados y sin cambios
+   * desde hace olderThanDays. Copia y borrado son dos sentencias: con WAL, una
+   * transacción que escribe main y archive no es atómica entre archivos (SQLite
+   * confirma main primero), así que una caída a mitad de confirmación perdería tickets.
+   * Confirmando la copia antes del borrado, una caída entre ambas deja el ticket
+   * en las dos tablas: las lecturas (selectHotAndArchived, rebuildDailyStats) lo
+   * cuentan una sola vez y la siguiente llamada completa el borrado.
+   * @param {Object} options - { olderThanDays, chunkSize, now }
+   * @returns {Object} { archived, more } (more: quedan candidatos para otra llamada)
+   */
+  archiveClosedTickets(options = {}) {
+    const {
+      olderThanDays = ARCHIVE_CONFIG.AFTER_DAYS,
+      chunkSize = ARCHIVE_CONFIG.CHUNK_SIZE,
+      now = Date.now()
+    } = options;
+    const cutoff = new Date(now - olderThanDays * 24 * 60 * 60 * 1000).toISOString();
+    
+    // Misma condición que idx_tickets_archivable
+    const ids = this.prepareCached(`
+      SELECT id FROM tickets
+      WHERE estado != 'emitido' AND synced = 1 AND updated_at < datetime(?)
+      ORDER BY updated_at
+      LIMIT ?
+    `).pluck().all(cutoff, chunkSize);
+    
+    if (ids.length === 0) {
+      return { archived: 0, more: false };
+    }
+    
+    const idsJson = JSON.stringify(ids);
+    
+    // IGNORE: tras una caída entre copia y borrado, la copia existente se conserva
+    this.prepareCached(`
+      INSERT OR IGNORE INTO archive.tickets (${TICKET_COLUMNS})
+      SELECT ${TICKET_COLUMNS} FROM main.tickets
+      WHERE id IN (SELECT value FROM json_each(?))
+    `).run(idsJson);
+    
+    // Solo se borran las filas que ya están en el archivo
+    const archived = this.prepareCached(`
+      DELETE FROM main.tickets
+      WHERE id IN (SELECT a.id FROM archive.tickets a JOIN json_each(?) j ON a.id = j.value)
+    `).run(idsJson).changes;
+    
+    return { archived, more: ids.length === chunkSize };
+  }
+
+  /**
+   * Obtiene estadísticas de tickets desde la tabla pre-agregada ticket_stats_daily.
+   * El rango se evalúa por día: se incluyen los días completos de dateFrom a dateTo.
+   * @param {string} dateFrom - Fecha desde (opcional)
+   * @param {string} dateTo - Fecha hasta (opcional)
+   * @returns {Object} Estadísticas calculadas
+   */
+  getTicketStats(dateFrom = null, dateTo = null) {
+    let whereClause = '';
+    const params = [];
+    
+    if (dateFrom && dateTo) {
+      whereClause = 'WHERE fecha BETWEEN date(?) AND date(?)';
+      params.push(dateFrom, dateTo);
+    }
+    
+    const stmt = this.prepareCached(`
+      SELECT 
+        estado,
+        moneda,
+        SUM(count) as count,
+        SUM(total) as total_valor
+      FROM ticket_stats_daily 
+      ${whereClause}
+      GROUP BY estado, moneda
+    `);
+    
+    const results = stmt.all(...params);
+    
+    // Calcular estadísticas
+    const stats = {
+      total_emitidos: 0,
+      total_canjeados: 0,
       total_anulados: 0,
       valor_total_dop: 0,
       valor_total_usd: 0,
@@ -297,31 +1107,105 @@ class SQLiteDB {
   }
 
   /**
-   * Obtiene tickets por rango de fechas
+   * Arma el SELECT de tickets activos y archivados con el mismo filtro.
+   * Con ORDER BY sobre columnas indexadas, SQLite mezcla ambos lados sin ordenar.
+   * Un ticket en ambas tablas (traslado interrumpido) se devuelve una vez, desde main.
+   * @param {string} whereClause - Condición aplicada a ambas tablas
+   * @returns {string} SELECT ... UNION ALL SELECT ... (los parámetros van dos veces)
+   */
+  selectHotAndArchived(whereClause) {
+    return `
+      SELECT ${TICKET_COLUMNS} FROM main.tickets WHERE ${whereClause}
+      UNION ALL
+      SELECT ${TICKET_COLUMNS} FROM archive.tickets a WHERE ${whereClause}
+        AND NOT EXISTS (SELECT 1 FROM main.tickets m WHERE m.id = a.id)
+    `;
+  }
+
+  /**
+   * Obtiene tickets por rango de fechas (incluye los archivados)
    * @param {string} dateFrom - Fecha desde
    * @param {string} dateTo - Fecha hasta
    * @param {string} estado - Estado específico (opcional)
    * @returns {Array} Lista de tickets
    */
   getTicketsByDateRange(dateFrom, dateTo, estado = null) {
-    let sql = 'SELECT * FROM tickets WHERE fecha_emision BETWEEN ? AND ?';
+    // datetime() normaliza fechas ISO ("...T...Z") al formato de CURRENT_TIMESTAMP
+    let where = 'fecha_emision BETWEEN datetime(?) AND datetime(?)';
+    const params = [dateFrom, dateTo];
+    
+    if (estado && Object.values(TICKET_STATES).includes(estado)) {
+      where += ' AND estado = ?';
+      params.push(estado);
+    }
+    
+    const sql = `${this.selectHotAndArchived(where)} ORDER BY fecha_emision DESC`;
+    
+    return this.prepareCached(sql).all(...params, ...params);
+  }
+
+  /**
+   * Obtiene una página de tickets por rango de fechas (keyset por fecha_emision, id),
+   * incluidos los archivados
+   * @param {string} dateFrom - Fecha desde
+   * @param {string} dateTo - Fecha hasta
+   * @param {Object} options - { estado, cursor, pageSize, order: 'asc'|'desc' }
+   * @returns {Object} { tickets, nextCursor } (nextCursor null al terminar)
+   */
+  getTicketsPageByDateRange(dateFrom, dateTo, options = {}) {
+    const { estado = null, cursor = null, pageSize = 500, order = 'asc' } = options;
+    const direction = order === 'desc' ? 'DESC' : 'ASC';
+    
+    let where = 'fecha_emision BETWEEN datetime(?) AND datetime(?)';
     const params = [dateFrom, dateTo];
     
     if (estado && Object.values(TICKET_STATES).includes(estado)) {
-      sql += ' AND estado = ?';
+      where += ' AND estado = ?';
       params.push(estado);
     }
     
-    sql += ' ORDER BY fecha_emision DESC';
+    if (cursor) {
+      where += ` AND (fecha_emision, id) ${direction === 'ASC' ? '>' : '<'} (?, ?)`;
+      params.push(cursor.fecha_emision, cursor.id);
+    }
+    
+    const sql = `${this.selectHotAndArchived(where)} ORDER BY fecha_emision ${direction}, id ${direction} LIMIT ?`;
+    
+    const tickets = this.prepareCached(sql).all(...params, ...params, pageSize);
+    const last = tickets[tickets.length - 1];
+    
+    return {
+      tickets,
+      nextCursor: tickets.length === pageSize ? { fecha_emision: last.fecha_emision, id: last.id } : null
+    };
+  }
+
+  /**
+   * Recorre tickets por rango de fechas página por página.
+   * La memoria queda acotada por pageSize y no por el tamaño del rango.
+   * @param {string} dateFrom - Fecha desde
+   * @param {string} dateTo - Fecha hasta
+   * @param {Object} options - { estado, pageSize, order }
+   * @returns {AsyncGenerator<Array>} Páginas de tickets
+   */
+  async *iterateTicketsByDateRange(dateFrom, dateTo, options = {}) {
+    let cursor = null;
     
-    const stmt = this.db.prepare(sql);
-    return stmt.all(...params);
+    do {
+      const page = this.getTicketsPageByDateRange(dateFrom, dateTo, { ...options, cursor });
+      if (page.tickets.length > 0) {
+        yield page.tickets;
+      }
+      cursor = page.nextCursor;
+    } while (cursor);
   }
 
   /**
    * Cierra la conexión a la base de datos
    */
   close() {
+    this.statements.clear();
+    
     if (this.db) {
       this.db.close();
     }
@@ -343,4 +1227,1347 @@ module.exports = SQLiteDB;
 with open('tito-casino-system/src/main/database/sqlite.js', 'w') as f:
     f.write(sqlite_js)
 
+# SQLiteDB en worker_threads: conexión de escritura + conexión de solo lectura
+sqlite_worker_js = '''// src/main/database/sqlite-worker.js
+// Hilo que aloja una conexión SQLiteDB (escritura o solo lectura) y atiende
+// lotes de llamadas del proceso principal (ver sqlite-client.js).
+const { parentPort, workerData } = require('worker_threads');
+const SQLiteDB = require('./sqlite');
+const CheckpointScheduler = require('./checkpoint-scheduler');
+
+// Filas por mensaje al transmitir iteradores (un elemento que es una página cuenta todas sus filas)
+const STREAM_CHUNK_ROWS = 1000;
+// Mensajes de un iterador enviados sin confirmación del cliente
+const STREAM_WINDOW = 2;
+
+let db;
+let scheduler = null;
+try {
+  db = new SQLiteDB(workerData.dbPath, workerData.options);
+
+  // Checkpoints del WAL en pausas, solo en la conexión de escritura (options.checkpoint = false lo desactiva)
+  const { checkpoint } = workerData.options || {};
+  if (!db.readonly && checkpoint !== false) {
+    scheduler = new CheckpointScheduler(db, checkpoint || {});
+    scheduler.start();
+  }
+
+  parentPort.postMessage({ ready: true, dbPath: db.dbPath });
+} catch (error) {
+  parentPort.postMessage({ ready: false, error: error.message });
+}
+
+// Métodos propios del worker (no de SQLiteDB)
+const WORKER_METHODS = {
+  getCheckpointStats: () => (scheduler ? scheduler.getStats() : null)
+};
+
+// Iteradores en curso: id -> { credits, cancelled, wake }
+const streams = new Map();
+
+/**
+ * Filas que aporta un elemento de un iterador
+ */
+function rowCount(value) {
+  return Array.isArray(value) ? value.length : 1;
+}
+
+/**
+ * Envía una parte de un iterador cuando el cliente tiene crédito disponible
+ * @returns {Promise<boolean>} False si el cliente canceló el recorrido
+ */
+async function sendChunk(id, state, chunk) {
+  while (state.credits === 0 && !state.cancelled) {
+    await new Promise(resolve => { state.wake = resolve; });
+  }
+  if (state.cancelled) {
+    return false;
+  }
+
+  state.credits--;
+  parentPort.postMessage({ id, chunk });
+  return true;
+}
+
+/**
+ * Ejecuta una llamada. Los iteradores se recorren completos antes de atender
+ * la siguiente llamada (la conexión queda ocupada mientras un iterador está abierto)
+ * y se envían por partes: como máximo STREAM_WINDOW partes sin consumir,
+ * cada parte consumida por el cliente habilita la siguiente.
+ */
+async function execute({ id, method, args, stream }) {
+  if (WORKER_METHODS[method]) {
+    return WORKER_METHODS[method](...args);
+  }
+
+  if (method === 'close' && scheduler) {
+    scheduler.stop();
+  }
+
+  if (typeof db[method] !== 'function') {
+    throw new Error(`Método no disponible en el worker SQLite: ${method}`);
+  }
+
+  if (!stream) {
+    return db[method](...args);
+  }
+
+  const state = { credits: STREAM_WINDOW, cancelled: false, wake: null };
+  streams.set(id, state);
+
+  try {
+    let chunk = [];
+    let rows = 0;
+    let count = 0;
+    for await (const value of db[method](...args)) {
+      chunk.push(value);
+      rows += rowCount(value);
+      count++;
+      if (rows >= STREAM_CHUNK_ROWS) {
+        if (!await sendChunk(id, state, chunk)) {
+          return count;
+        }
+        chunk = [];
+        rows = 0;
+      }
+    }
+    if (chunk.length > 0) {
+      await sendChunk(id, state, chunk);
+    }
+    return count;
+  } finally {
+    streams.delete(id);
+  }
+}
+
+/**
+ * Filas modificadas por la conexión desde que se abrió (total_changes de SQLite)
+ */
+function totalChanges() {
+  return db.prepareCached('SELECT total_changes() AS changes').get().changes;
+}
+
+/**
+ * Atiende un lote en orden y responde con un solo mensaje
+ */
+async function handleBatch(batch) {
+  const results = [];
+  const changesBefore = scheduler ? totalChanges() : 0;
+
+  for (const call of batch) {
+    try {
+      results.push({ id: call.id, result: await execute(call) });
+    } catch (error) {
+      results.push({ id: call.id, error: error.message });
+    }
+  }
+
+  parentPort.postMessage({ results });
+
+  // Solo los lotes que escribieron posponen el checkpoint: las lecturas del escritor no cuentan
+  if (scheduler && db.db.open && totalChanges() !== changesBefore) {
+    scheduler.noteActivity();
+  }
+}
+
+// Los lotes se encadenan: las escrituras quedan serializadas aunque haya métodos async.
+// Los créditos y cancelaciones de iteradores se atienden de inmediato.
+let queue = Promise.resolve();
+parentPort.on('message', ({ batch, credit, cancel }) => {
+  if (!batch) {
+    const state = streams.get(credit || cancel);
+    if (state) {
+      if (cancel) {
+        state.cancelled = true;
+      } else {
+        state.credits++;
+      }
+      if (state.wake) {
+        state.wake();
+        state.wake = null;
+      }
+    }
+    return;
+  }
+
+  queue = queue.then(() => handleBatch(batch));
+});
+'''
+
+with open('tito-casino-system/src/main/database/sqlite-worker.js', 'w') as f:
+    f.write(sqlite_worker_js)
+
+# Archivo de tickets cerrados: pasadas por lotes sobre SQLiteDB.archiveClosedTickets
+ticket_archiver_js = '''// src/main/database/ticket-archiver.js
+const { ARCHIVE_CONFIG } = require('../../shared/constants');
+
+/**
+ * Mueve al archivo los tickets cerrados antiguos, un lote por llamada a la base.
+ * Con SQLiteClient cada lote es un mensaje distinto al worker de escritura,
+ * así la emisión y el canje se intercalan entre lotes en lugar de esperar la pasada completa.
+ */
+class TicketArchiver {
+  constructor(db, options = {}) {
+    this.db = db;
+    this.olderThanDays = options.olderThanDays || ARCHIVE_CONFIG.AFTER_DAYS;
+    this.chunkSize = options.chunkSize || ARCHIVE_CONFIG.CHUNK_SIZE;
+    this.now = options.now || Date.now;
+    this.currentRun = null;
+  }
+
+  /**
+   * Ejecuta una pasada de archivo.
+   * Si ya hay una pasada en curso, devuelve la misma promesa.
+   * @returns {Promise<Object>} { archived, chunks }
+   */
+  run() {
+    if (!this.currentRun) {
+      this.currentRun = this.runPass().finally(() => {
+        this.currentRun = null;
+      });
+    }
+    return this.currentRun;
+  }
+
+  /**
+   * Archiva lotes hasta que no quedan candidatos
+   * @returns {Promise<Object>} Resumen de la pasada
+   */
+  async runPass() {
+    const summary = { archived: 0, chunks: 0 };
+    const now = this.now();
+
+    while (true) {
+      const { archived, more } = await this.db.archiveClosedTickets({
+        olderThanDays: this.olderThanDays,
+        chunkSize: this.chunkSize,
+        now
+      });
+
+      summary.archived += archived;
+      if (archived > 0) {
+        summary.chunks++;
+      }
+
+      if (!more || archived === 0) {
+        break;
+      }
+    }
+
+    return summary;
+  }
+}
+
+module.exports = TicketArchiver;
+'''
+
+with open('tito-casino-system/src/main/database/ticket-archiver.js', 'w') as f:
+    f.write(ticket_archiver_js)
+
+ticket_archive_test = '''// tests/integration/ticket-archive.test.js
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const SQLiteDB = require('../../src/main/database/sqlite');
+const TicketArchiver = require('../../src/main/database/ticket-archiver');
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+describe('Ticket archive (hot/archive split)', () => {
+  let db;
+  const later = (days) => Date.now() + days * DAY_MS;
+
+  const ticket = (number, valor = 100) => ({
+    ticket_number: number,
+    valor,
+    moneda: 'DOP',
+    qr_data: `${number}|${valor}|DOP`,
+    mesa_id: 1
+  });
+
+  // Emitidos, algunos cerrados y luego sincronizados
+  const seed = async () => {
+    await db.createTicketsBatch(['A1', 'A2', 'A3', 'A4', 'A5', 'A6'].map(n => ticket(n)));
+    db.updateTicketStatus('A1', 'canjeado', 'Caja1');
+    db.updateTicketStatus('A2', 'anulado');
+    db.updateTicketStatus('A3', 'canjeado', 'Caja1');
+    db.updateTicketStatus('A4', 'canjeado', 'Caja1');
+    db.markAsSynced(['A1', 'A2', 'A3', 'A5'].map(n => db.findTicketByNumber(n).id));
+  };
+
+  const hotCount = () => db.db.prepare('SELECT COUNT(*) AS c FROM main.tickets').get().c;
+  const archiveCount = () => db.db.prepare('SELECT COUNT(*) AS c FROM archive.tickets').get().c;
+
+  beforeEach(() => {
+    db = new SQLiteDB(':memory:');
+  });
+
+  afterEach(() => {
+    if (db) db.close();
+  });
+
+  test('should archive only closed, synced and old tickets', async () => {
+    await seed();
+
+    expect(db.archiveClosedTickets({ olderThanDays: 7, now: Date.now() })).toEqual({ archived: 0, more: false });
+
+    const result = db.archiveClosedTickets({ olderThanDays: 7, now: later(8) });
+
+    expect(result).toEqual({ archived: 3, more: false });
+    expect(hotCount()).toBe(3);
+    expect(archiveCount()).toBe(3);
+    // A4 cerrado pero sin sincronizar, A5 sincronizado pero abierto: quedan en la tabla activa
+    expect(db.db.prepare('SELECT ticket_number FROM main.tickets ORDER BY id').pluck().all()).toEqual(['A4', 'A5', 'A6']);
+  });
+
+  test('should keep archived tickets visible to lookups and reports', async () => {
+    await seed();
+    const before = db.getTicketsByDateRange('2000-01-01', '2100-01-01');
+    db.archiveClosedTickets({ now: later(8) });
+
+    expect(db.findTicketByNumber('A1')).toMatchObject({ estado: 'canjeado', usuario_canje: 'Caja1' });
+    expect(db.findTicketById(before.find(t => t.ticket_number === 'A2').id)).toMatchObject({ ticket_number: 'A2' });
+    const byId = (a, b) => a.id - b.id;
+    expect(db.getTicketsByDateRange('2000-01-01', '2100-01-01').sort(byId)).toEqual(before.sort(byId));
+    expect(db.getTicketsByDateRange('2000-01-01', '2100-01-01', 'canjeado').map(t => t.ticket_number).sort())
+      .toEqual(['A1', 'A3', 'A4']);
+    expect(db.countClosedTickets()).toBe(4);
+    expect([...db.iterateClosedTicketNumbers()].sort()).toEqual(['A1', 'A2', 'A3', 'A4']);
+  });
+
+  test('should page across both tables in keyset order', async () => {
+    await seed();
+    db.archiveClosedTickets({ now: later(8) });
+
+    const seen = [];
+    let cursor = null;
+    do {
+      const page = db.getTicketsPageByDateRange('2000-01-01', '2100-01-01', { pageSize: 4, cursor });
+      seen.push(...page.tickets.map(t => t.id));
+      cursor = page.nextCursor;
+    } while (cursor);
+
+    expect(seen).toHaveLength(6);
+    expect(seen).toEqual([...seen].sort((a, b) => a - b));
+  });
+
+  test('should not change stats, including after a rebuild', async () => {
+    await seed();
+    const before = db.getTicketStats();
+
+    db.archiveClosedTickets({ now: later(8) });
+    expect(db.getTicketStats()).toEqual(before);
+
+    db.rebuildDailyStats();
+    expect(db.getTicketStats()).toEqual(before);
+  });
+
+  test('should not re-import archived tickets from remote pages', async () => {
+    await seed();
+    const archived = db.findTicketByNumber('A1');
+    db.archiveClosedTickets({ now: later(8) });
+
+    const changes = db.applyRemoteTicketsPage([{ ...archived, fecha_canje: null }], 'pull_tickets_cursor', null);
+
+    expect(changes).toEqual([]);
+    expect(hotCount()).toBe(3);
+  });
+
+  test('should finish a move interrupted between copy and delete', async () => {
+    await seed();
+    const stats = db.getTicketStats();
+    const closed = [...db.iterateClosedTicketNumbers()].sort();
+    db.db.exec("INSERT INTO archive.tickets SELECT *, CURRENT_TIMESTAMP FROM main.tickets WHERE ticket_number = 'A1'");
+
+    // Mientras el ticket está en ambas tablas, las lecturas lo cuentan una vez
+    expect(db.getTicketsByDateRange('2000-01-01', '2100-01-01')).toHaveLength(6);
+    expect(db.getTicketsPageByDateRange('2000-01-01', '2100-01-01', { pageSize: 10 }).tickets).toHaveLength(6);
+    db.rebuildDailyStats();
+    expect(db.getTicketStats()).toEqual(stats);
+    expect(db.countClosedTickets()).toBe(closed.length);
+    expect([...db.iterateClosedTicketNumbers()].sort()).toEqual(closed);
+
+    expect(db.archiveClosedTickets({ now: later(8) }).archived).toBe(3);
+    expect(archiveCount()).toBe(3);
+    expect(db.getTicketsByDateRange('2000-01-01', '2100-01-01')).toHaveLength(6);
+  });
+
+  test('should archive in chunks until no candidates remain', async () => {
+    await db.createTicketsBatch(Array.from({ length: 5 }, (_, i) => ticket(`C${i}`)));
+    for (let i = 0; i < 5; i++) db.updateTicketStatus(`C${i}`, 'canjeado');
+    db.markAsSynced(db.getUnsyncedTickets().map(t => t.id));
+
+    const archiver = new TicketArchiver(db, { chunkSize: 2, now: () => later(30) });
+    const calls = jest.spyOn(db, 'archiveClosedTickets');
+
+    await expect(archiver.run()).resolves.toEqual({ archived: 5, chunks: 3 });
+    expect(calls).toHaveBeenCalledTimes(3);
+    expect(hotCount()).toBe(0);
+  });
+
+  test('should store the archive next to a file database', () => {
+    db.close();
+    const dbPath = path.join(os.tmpdir(), `archive-${process.pid}-${Date.now()}.db`);
+    db = new SQLiteDB(dbPath);
+
+    expect(db.archivePath).toBe(dbPath.replace(/\\.db$/, '-archive.db'));
+    expect(fs.existsSync(db.archivePath)).toBe(true);
+
+    db.close();
+    db = null;
+    for (const file of [dbPath, dbPath.replace(/\\.db$/, '-archive.db')]) {
+      for (const suffix of ['', '-wal', '-shm']) {
+        if (fs.existsSync(file + suffix)) fs.unlinkSync(file + suffix);
+      }
+    }
+  });
+});
+'''
+
+with open('tito-casino-system/tests/integration/ticket-archive.test.js', 'w') as f:
+    f.write(ticket_archive_test)
+
+# Checkpoints del WAL en momentos ociosos (conexión de escritura del worker)
+checkpoint_scheduler_js = '''// src/main/database/checkpoint-scheduler.js
+
+/**
+ * Programa checkpoints del WAL fuera del camino de emisión. Corre junto a la
+ * conexión de escritura (en el worker de SQLiteClient):
+ * - Tras idleMs sin escrituras ejecuta PASSIVE (no bloquea a nadie).
+ * - Si el WAL quedó grande (truncatePages), TRUNCATE en la siguiente pausa para
+ *   devolver el archivo a cero.
+ * Durante un turno sin pausas, el wal_autocheckpoint del perfil pone el límite.
+ */
+class CheckpointScheduler {
+  /**
+   * @param {SQLiteDB} db - Conexión de escritura
+   * @param {Object} options - { idleMs, intervalMs, truncatePages, now }
+   */
+  constructor(db, options = {}) {
+    this.db = db;
+    this.idleMs = options.idleMs || 2000;
+    this.intervalMs = options.intervalMs || 1000;
+    this.truncatePages = options.truncatePages || 1000;
+    this.now = options.now || Date.now;
+
+    this.timer = null;
+    this.lastActivity = this.now();
+    this.walPages = 0;         // Páginas en el WAL según el último checkpoint
+    this.dirty = false;        // Hubo escrituras desde el último checkpoint
+    this.stats = { passive: 0, truncate: 0, busy: 0, lastDurationMs: 0 };
+  }
+
+  start() {
+    if (this.timer) return;
+
+    this.timer = setInterval(() => this.tick(), this.intervalMs);
+    // No mantener vivo el proceso/worker solo por el programador
+    if (this.timer.unref) this.timer.unref();
+  }
+
+  stop() {
+    if (this.timer) {
+      clearInterval(this.timer);
+      this.timer = null;
+    }
+  }
+
+  /**
+   * Registra escrituras en la conexión (cada lote que modificó filas)
+   */
+  noteActivity() {
+    this.lastActivity = this.now();
+    this.dirty = true;
+  }
+
+  /**
+   * Decide y ejecuta el checkpoint que corresponda
+   * @returns {string|null} Modo ejecutado o null si no hizo falta
+   */
+  tick() {
+    if (this.now() - this.lastActivity < this.idleMs) {
+      return null;
+    }
+
+    if (this.dirty) {
+      this.dirty = Boolean(this.run('PASSIVE').busy);
+      return 'PASSIVE';
+    }
+
+    if (this.walPages >= this.truncatePages) {
+      this.run('TRUNCATE');
+      return 'TRUNCATE';
+    }
+
+    return null;
+  }
+
+  run(mode) {
+    const start = process.hrtime.bigint();
+    const result = this.db.checkpoint(mode);
+    this.stats.lastDurationMs = Number(process.hrtime.bigint() - start) / 1e6;
+
+    // Un lector retiene el WAL: se reintenta en la próxima pausa
+    if (result.busy) {
+      this.stats.busy++;
+      return result;
+    }
+
+    this.stats[mode.toLowerCase()]++;
+    this.walPages = mode === 'TRUNCATE' ? 0 : Math.max(result.log, 0);
+    return result;
+  }
+
+  getStats() {
+    return {
+      ...this.stats,
+      walPages: this.walPages,
+      idleForMs: this.now() - this.lastActivity
+    };
+  }
+}
+
+module.exports = CheckpointScheduler;
+'''
+
+with open('tito-casino-system/src/main/database/checkpoint-scheduler.js', 'w') as f:
+    f.write(checkpoint_scheduler_js)
+
+checkpoint_scheduler_test = '''// tests/unit/checkpoint-scheduler.test.js
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const SQLiteDB = require('../../src/main/database/sqlite');
+const CheckpointScheduler = require('../../src/main/database/checkpoint-scheduler');
+
+describe('SQLite storage profiles and CheckpointScheduler', () => {
+  let dbPath;
+  let db;
+
+  const createTickets = (prefix, count) => db.createTicketsBatch(
+    Array.from({ length: count }, (_, i) => ({
+      ticket_number: `${prefix}${i}`,
+      valor: 100,
+      moneda: 'DOP',
+      qr_data: `${prefix}${i}|100|DOP`,
+      mesa_id: 1
+    }))
+  );
+
+  const walSize = () => fs.statSync(`${dbPath}-wal`).size;
+
+  beforeEach(() => {
+    dbPath = path.join(os.tmpdir(), `checkpoint-${process.pid}-${Date.now()}.db`);
+  });
+
+  afterEach(() => {
+    if (db) db.close();
+    db = null;
+    for (const file of [dbPath, dbPath.replace(/\\.db$/, '-archive.db')]) {
+      for (const suffix of ['', '-wal', '-shm']) {
+        if (fs.existsSync(file + suffix)) fs.unlinkSync(file + suffix);
+      }
+    }
+  });
+
+  test('should default to the durable profile', () => {
+    db = new SQLiteDB(dbPath);
+
+    expect(db.getStorageSettings()).toMatchObject({
+      profile: 'durable',
+      journal_mode: 'wal',
+      synchronous: 2,
+      wal_autocheckpoint: 4000
+    });
+  });
+
+  test('should apply every pragma of the selected profile', () => {
+    db = new SQLiteDB(dbPath, { profile: 'fast-read' });
+
+    expect(db.getStorageSettings()).toMatchObject({
+      profile: 'fast-read',
+      synchronous: 1,
+      cache_size: -128 * 1024,
+      temp_store: 2,
+      wal_autocheckpoint: 20000
+    });
+  });
+
+  test('should apply read pragmas on read-only connections', () => {
+    db = new SQLiteDB(dbPath);
+    const reader = new SQLiteDB(dbPath, { readonly: true, profile: 'balanced' });
+
+    expect(reader.getStorageSettings()).toMatchObject({ cache_size: -64 * 1024, temp_store: 2 });
+    reader.close();
+  });
+
+  test('should reject unknown profiles', () => {
+    expect(() => new SQLiteDB(dbPath, { profile: 'turbo' }))
+      .toThrow('Perfil de almacenamiento desconocido: turbo');
+  });
+
+  test('should wait for an idle period before checkpointing', async () => {
+    db = new SQLiteDB(dbPath);
+    let clock = 0;
+    const scheduler = new CheckpointScheduler(db, { idleMs: 2000, truncatePages: 1, now: () => clock });
+
+    await createTickets('A', 50);
+    scheduler.noteActivity();
+
+    clock = 1500;
+    expect(scheduler.tick()).toBeNull();
+
+    clock = 2000;
+    expect(scheduler.tick()).toBe('PASSIVE');
+    expect(scheduler.getStats().walPages).toBeGreaterThan(0);
+  });
+
+  test('should truncate a large WAL on the next idle tick', async () => {
+    db = new SQLiteDB(dbPath);
+    let clock = 0;
+    const scheduler = new CheckpointScheduler(db, { idleMs: 100, truncatePages: 1, now: () => clock });
+
+    await createTickets('B', 200);
+    scheduler.noteActivity();
+    clock = 100;
+    scheduler.tick();
+    expect(walSize()).toBeGreaterThan(0);
+
+    expect(scheduler.tick()).toBe('TRUNCATE');
+    expect(walSize()).toBe(0);
+    expect(scheduler.getStats()).toMatchObject({ passive: 1, truncate: 1, walPages: 0 });
+    expect(scheduler.tick()).toBeNull();
+  });
+
+  test('should not block when a reader holds the WAL', async () => {
+    db = new SQLiteDB(dbPath);
+    await createTickets('C', 20);
+
+    const reader = new SQLiteDB(dbPath, { readonly: true });
+    const iterator = reader.db.prepare('SELECT id FROM tickets').iterate();
+    iterator.next(); // Transacción de lectura abierta
+    await createTickets('D', 20);
+
+    const result = db.checkpoint('TRUNCATE');
+    expect(result.busy).toBe(1);
+
+    iterator.return();
+    reader.close();
+    expect(db.checkpoint('TRUNCATE').busy).toBe(0);
+  });
+
+  test('should reject invalid checkpoint modes', () => {
+    db = new SQLiteDB(dbPath);
+    expect(() => db.checkpoint('NOW')).toThrow('Modo de checkpoint inválido: NOW');
+  });
+});
+'''
+
+with open('tito-casino-system/tests/unit/checkpoint-scheduler.test.js', 'w') as f:
+    f.write(checkpoint_scheduler_test)
+
+sqlite_client_js = '''// src/main/database/sqlite-client.js
+const path = require('path');
+const { Worker } = require('worker_threads');
+
+// Escrituras y lecturas del camino crítico (emisión, canje, cola, sincronización):
+// conexión de escritura, en orden, para leer siempre lo último confirmado
+const WRITER_METHODS = [
+  'createTicket',
+  'createTicketWithPrintJob',
+  'createTicketsWithPrintJobs',
+  'createTicketsBatch',
+  'findTicketByNumber',
+  'updateTicketStatus',
+  'redeemTicket',
+  'getUnsyncedTicketsPage',
+  'getSyncState',
+  'setSyncState',
+  'commitSyncPage',
+  'markAsSynced',
+  'markPushedAsSynced',
+  'applyRemoteTicketsPage',
+  'applyRemoteTickets',
+  'allocateTicketSequence',
+  'enqueuePrintJob',
+  'getNextPrintJob',
+  'startPrintJob',
+  'completePrintJob',
+  'failPrintJob',
+  'retryPrintJob',
+  'recoverPrintJobs',
+  'getPrintQueueDepth',
+  'rebuildDailyStats',
+  'archiveClosedTickets',
+  'checkpoint',
+  'getCheckpointStats',
+  'getStorageSettings'
+];
+
+// Consultas pesadas (reportes, estadísticas, carga del índice): conexión de solo lectura
+const READER_METHODS = [
+  'findTicketById',
+  'getOpenTickets',
+  'countClosedTickets',
+  'getUnsyncedTickets',
+  'getTicketStats',
+  'getTicketsByDateRange',
+  'getTicketsPageByDateRange'
+];
+
+// Iteradores: se reciben por partes y se exponen como AsyncGenerator
+const READER_STREAMS = [
+  'iterateClosedTicketNumbers',
+  'iterateTicketsByDateRange'
+];
+
+/**
+ * Proxy asíncrono de SQLiteDB. La base vive en dos worker_threads:
+ * uno de escritura (llamadas serializadas) y uno de solo lectura para consultas
+ * pesadas, así un reporte nunca bloquea el event loop ni la emisión de tickets.
+ * Las llamadas hechas en el mismo tick se envían en un solo mensaje por worker.
+ * Mismos métodos que SQLiteDB, pero todos devuelven Promise
+ * (los iteradores, AsyncGenerator). transaction() no está disponible.
+ */
+class SQLiteClient {
+  /**
+   * @param {string} dbPath - Ruta del archivo (no admite ':memory:')
+   * @param {Object} options - Opciones de SQLiteDB (profile) y checkpoint:
+   *   { idleMs, intervalMs, truncatePages } del CheckpointScheduler, o false para desactivarlo
+   */
+  constructor(dbPath = null, options = {}) {
+    if (dbPath === ':memory:') {
+      throw new Error('SQLiteClient requiere una base de datos en archivo');
+    }
+
+    this.nextId = 1;
+    this.pending = new Map();   // id -> { resolve, reject, onChunk, target }
+    this.batches = { writer: [], reader: [] };
+    this.stats = { calls: 0, messages: 0 };
+    this.closed = false;
+
+    // El lector se abre después de que el escritor creó el esquema
+    this.writer = this.spawn('writer', dbPath, options);
+    this.reader = this.writer.then(({ dbPath: resolvedPath }) => (
+      this.spawn('reader', resolvedPath, { ...options, readonly: true })
+    ));
+
+    // Los errores de apertura se informan en cada llamada, no como rechazo sin manejar
+    this.writer.catch(() => {});
+    this.reader.catch(() => {});
+  }
+
+  /**
+   * Inicia un worker y espera a que abra la base
+   * @param {string} target - 'writer' | 'reader'
+   * @returns {Promise<Object>} { worker, dbPath }
+   */
+  spawn(target, dbPath, options) {
+    return new Promise((resolve, reject) => {
+      const worker = new Worker(path.join(__dirname, 'sqlite-worker.js'), {
+        workerData: { dbPath, options }
+      });
+
+      worker.once('message', (message) => {
+        if (!message.ready) {
+          worker.terminate();
+          reject(new Error(`Error abriendo SQLite en worker: ${message.error}`));
+          return;
+        }
+
+        worker.on('message', (reply) => this.handleReply(reply));
+        resolve({ worker, dbPath: message.dbPath });
+      });
+
+      worker.on('error', (error) => {
+        this.rejectAll(error, target);
+        reject(error);
+      });
+
+      // Si el worker termina, sus llamadas pendientes y las siguientes fallan en lugar de esperar para siempre
+      worker.on('exit', (code) => {
+        const error = new Error(`Worker SQLite (${target}) terminado con código ${code}`);
+        reject(error);
+        this.rejectAll(error, target);
+
+        if (!this.closed) {
+          this[target] = Promise.reject(error);
+          this[target].catch(() => {});
+        }
+      });
+    });
+  }
+
+  /**
+   * Espera a que ambas conexiones estén abiertas
+   * @returns {Promise<string>} Ruta de la base de datos
+   */
+  async ready() {
+    const [{ dbPath }] = await Promise.all([this.writer, this.reader]);
+    return dbPath;
+  }
+
+  /**
+   * Encola una llamada; el lote se envía al final del tick actual
+   */
+  call(target, method, args, onChunk = null) {
+    if (this.closed) {
+      return Promise.reject(new Error('Base de datos cerrada'));
+    }
+
+    const id = this.nextId++;
+    this.stats.calls++;
+
+    return new Promise((resolve, reject) => {
+      this.pending.set(id, { resolve, reject, onChunk, target });
+
+      const batch = this.batches[target];
+      batch.push({ id, method, args, stream: Boolean(onChunk) });
+      if (batch.length === 1) {
+        queueMicrotask(() => this.flush(target));
+      }
+    });
+  }
+
+  /**
+   * Envía el lote acumulado de un worker
+   */
+  flush(target) {
+    const batch = this.batches[target];
+    this.batches[target] = [];
+
+    this[target].then(({ worker }) => {
+      this.stats.messages++;
+      worker.postMessage({ batch });
+    }, (error) => {
+      batch.forEach(({ id }) => this.settle(id, error));
+    });
+  }
+
+  /**
+   * Procesa una respuesta (resultados de un lote o una parte de un iterador)
+   */
+  handleReply(reply) {
+    if (reply.chunk) {
+      const entry = this.pending.get(reply.id);
+      if (entry) entry.onChunk(reply.chunk, reply.id);
+      return;
+    }
+
+    for (const { id, result, error } of reply.results) {
+      this.settle(id, error ? new Error(error) : null, result);
+    }
+  }
+
+  settle(id, error, result) {
+    const entry = this.pending.get(id);
+    if (!entry) return;
+
+    this.pending.delete(id);
+    if (error) {
+      entry.reject(error);
+    } else {
+      entry.resolve(result);
+    }
+  }
+
+  /**
+   * Rechaza las llamadas pendientes (de un worker, o de ambos si no se indica)
+   */
+  rejectAll(error, target = null) {
+    for (const [id, entry] of [...this.pending]) {
+      if (!target || entry.target === target) {
+        this.settle(id, error);
+      }
+    }
+  }
+
+  /**
+   * Envía un mensaje de control a un worker (fuera de los lotes)
+   */
+  signal(target, message) {
+    this[target].then(({ worker }) => worker.postMessage(message), () => {});
+  }
+
+  /**
+   * Recorre un iterador del worker de lectura. Cada parte consumida
+   * devuelve un crédito al worker, que no adelanta más de STREAM_WINDOW partes;
+   * abandonar el recorrido (break) lo cancela y libera la conexión de lectura.
+   * @returns {AsyncGenerator} Elementos en el mismo orden que en SQLiteDB
+   */
+  async *stream(method, args) {
+    const chunks = [];
+    let streamId = null;
+    let finished = false;
+    let failure = null;
+    let wake = null;
+
+    const done = this.call('reader', method, args, (chunk, id) => {
+      streamId = id;
+      chunks.push(chunk);
+      if (wake) wake();
+    });
+    done.then(() => { finished = true; }, (error) => { finished = true; failure = error; })
+      .then(() => { if (wake) wake(); });
+
+    try {
+      while (true) {
+        if (chunks.length > 0) {
+          yield* chunks.shift();
+          this.signal('reader', { credit: streamId });
+        } else if (finished) {
+          if (failure) throw failure;
+          return;
+        } else {
+          await new Promise(resolve => { wake = resolve; });
+          wake = null;
+        }
+      }
+    } finally {
+      if (!finished && streamId !== null) {
+        this.signal('reader', { cancel: streamId });
+      }
+    }
+  }
+
+  /**
+   * Cierra ambas conexiones y termina los workers
+   */
+  async close() {
+    if (this.closed) return;
+
+    const workers = await Promise.allSettled([this.writer, this.reader]);
+    await Promise.allSettled([this.call('writer', 'close', []), this.call('reader', 'close', [])]);
+    this.closed = true;
+
+    await Promise.all(workers
+      .filter(entry => entry.status === 'fulfilled')
+      .map(entry => entry.value.worker.terminate()));
+  }
+
+  /**
+   * @returns {Object} { calls, messages } (mensajes < llamadas cuando se agrupan)
+   */
+  getStats() {
+    return { ...this.stats };
+  }
+}
+
+WRITER_METHODS.forEach((method) => {
+  SQLiteClient.prototype[method] = function (...args) {
+    return this.call('writer', method, args);
+  };
+});
+
+READER_METHODS.forEach((method) => {
+  SQLiteClient.prototype[method] = function (...args) {
+    return this.call('reader', method, args);
+  };
+});
+
+READER_STREAMS.forEach((method) => {
+  SQLiteClient.prototype[method] = function (...args) {
+    return this.stream(method, args);
+  };
+});
+
+module.exports = SQLiteClient;
+'''
+
+with open('tito-casino-system/src/main/database/sqlite-client.js', 'w') as f:
+    f.write(sqlite_client_js)
+
+sqlite_worker_test = '''// tests/integration/sqlite-worker.test.js
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const SQLiteClient = require('../../src/main/database/sqlite-client');
+
+describe('SQLiteClient (worker_threads)', () => {
+  let dbPath;
+  let db;
+
+  const ticket = (number, valor = 100) => ({
+    ticket_number: number,
+    valor,
+    moneda: 'DOP',
+    qr_data: `${number}|${valor}|DOP`,
+    mesa_id: 1
+  });
+
+  beforeEach(async () => {
+    dbPath = path.join(os.tmpdir(), `sqlite-client-${process.pid}-${Date.now()}.db`);
+    db = new SQLiteClient(dbPath);
+    await db.ready();
+  });
+
+  afterEach(async () => {
+    await db.close();
+    for (const file of [dbPath, dbPath.replace(/\\.db$/, '-archive.db')]) {
+      for (const suffix of ['', '-wal', '-shm']) {
+        if (fs.existsSync(file + suffix)) fs.unlinkSync(file + suffix);
+      }
+    }
+  });
+
+  test('should expose SQLiteDB methods as promises', async () => {
+    const created = await db.createTicket(ticket('W1'));
+
+    expect(created).toMatchObject({ ticket_number: 'W1', estado: 'emitido' });
+    await expect(db.findTicketByNumber('W1')).resolves.toMatchObject({ id: created.id });
+  });
+
+  test('should batch calls made in the same tick into one message per worker', async () => {
+    const before = db.getStats();
+
+    await Promise.all(['B1', 'B2', 'B3', 'B4'].map(number => db.createTicket(ticket(number))));
+
+    const after = db.getStats();
+    expect(after.calls - before.calls).toBe(4);
+    expect(after.messages - before.messages).toBe(1);
+  });
+
+  test('should keep writes in call order', async () => {
+    await db.createTicket(ticket('S1'));
+
+    const results = await Promise.all([
+      db.updateTicketStatus('S1', 'canjeado', 'Caja1'),
+      db.updateTicketStatus('S1', 'anulado', 'Caja2')
+    ]);
+
+    expect(results.map(result => result.changes)).toEqual([1, 1]);
+    await expect(db.findTicketByNumber('S1')).resolves.toMatchObject({ estado: 'anulado', usuario_canje: 'Caja2' });
+  });
+
+  test('should read committed writes from the read-only connection', async () => {
+    await db.createTicket(ticket('R1', 50));
+    await db.createTicket(ticket('R2', 70));
+
+    const stats = await db.getTicketStats();
+    expect(stats.total_emitidos).toBe(2);
+    expect(await db.getOpenTickets()).toHaveLength(2);
+  });
+
+  test('should stream iterators across several messages', async () => {
+    const tickets = Array.from({ length: 2500 }, (_, i) => ticket(`C${i}`));
+    await db.createTicketsBatch(tickets);
+    await Promise.all(['C0', 'C1', 'C2499'].map(number => db.updateTicketStatus(number, 'anulado')));
+
+    const closed = [];
+    for await (const number of db.iterateClosedTicketNumbers()) {
+      closed.push(number);
+    }
+    expect(closed.sort()).toEqual(['C0', 'C1', 'C2499']);
+
+    let count = 0;
+    for await (const page of db.iterateTicketsByDateRange('2000-01-01', '2100-01-01', { pageSize: 1000 })) {
+      count += page.length;
+    }
+    expect(count).toBe(2500);
+  });
+
+  test('should keep at most the stream window of chunks in flight', async () => {
+    await db.createTicketsBatch(Array.from({ length: 3000 }, (_, i) => ticket(`F${i}`)));
+
+    // Páginas de 100 filas: cada mensaje agrupa 1000 filas, no 1000 páginas
+    const iterator = db.iterateTicketsByDateRange('2000-01-01', '2100-01-01', { pageSize: 100 });
+    await iterator.next();
+    await new Promise(resolve => setTimeout(resolve, 100));
+
+    const messages = [];
+    const { worker } = await db.reader;
+    const onMessage = (reply) => { if (reply.chunk) messages.push(reply.chunk.length); };
+    worker.on('message', onMessage);
+
+    let pages = 1;
+    for await (const page of iterator) {
+      expect(page).toHaveLength(100);
+      pages++;
+    }
+    worker.off('message', onMessage);
+
+    expect(pages).toBe(30);
+    // Dos partes (la ventana) llegaron antes de consumir; la tercera esperó el crédito
+    expect(messages).toEqual([10]);
+  });
+
+  test('should release the reader when a stream is abandoned', async () => {
+    await db.createTicketsBatch(Array.from({ length: 3000 }, (_, i) => ticket(`A${i}`)));
+
+    for await (const page of db.iterateTicketsByDateRange('2000-01-01', '2100-01-01', { pageSize: 10 })) {
+      expect(page).toHaveLength(10);
+      break;
+    }
+
+    await expect(db.getTicketStats()).resolves.toMatchObject({ total_emitidos: 3000 });
+  });
+
+  test('should reject pending calls when a worker exits', async () => {
+    await db.createTicketsBatch(Array.from({ length: 3000 }, (_, i) => ticket(`X${i}`)));
+
+    // El iterador sin consumir ocupa el lector: la consulta siguiente queda pendiente
+    const iterator = db.iterateTicketsByDateRange('2000-01-01', '2100-01-01', { pageSize: 10 });
+    await iterator.next();
+    const pending = db.getTicketStats();
+
+    const { worker } = await db.reader;
+    await worker.terminate();
+
+    await expect(pending).rejects.toThrow('Worker SQLite (reader) terminado');
+    await expect(db.getOpenTickets()).rejects.toThrow('Worker SQLite (reader) terminado');
+    await expect(db.createTicket(ticket('Y1'))).resolves.toMatchObject({ ticket_number: 'Y1' });
+  });
+
+  test('should only postpone checkpoints for batches that wrote', async () => {
+    await db.createTicket(ticket('K1'));
+    await new Promise(resolve => setTimeout(resolve, 50));
+
+    await Promise.all([db.findTicketByNumber('K1'), db.getSyncState('push_tickets_cursor')]);
+    expect((await db.getCheckpointStats()).idleForMs).toBeGreaterThanOrEqual(50);
+
+    await db.createTicket(ticket('K2'));
+    expect((await db.getCheckpointStats()).idleForMs).toBeLessThan(50);
+  });
+
+  test('should reject with the worker error message', async () => {
+    await db.createTicket(ticket('E1'));
+
+    await expect(db.createTicket(ticket('E1'))).rejects.toThrow('Ticket con número E1 ya existe');
+    await expect(db.findTicketByNumber('E1')).resolves.toBeTruthy();
+  });
+
+  test('should refuse in-memory databases', () => {
+    expect(() => new SQLiteClient(':memory:')).toThrow('SQLiteClient requiere una base de datos en archivo');
+  });
+});
+'''
+
+with open('tito-casino-system/tests/integration/sqlite-worker.test.js', 'w') as f:
+    f.write(sqlite_worker_test)
+
+# Micro-benchmark de inserción (antes/después de la caché de statements)
+sqlite_bench_js = '''// tests/benchmarks/sqlite-insert.bench.js
+// Uso: node tests/benchmarks/sqlite-insert.bench.js [cantidad] [tamañoLote]
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const SQLiteDB = require('../../src/main/database/sqlite');
+
+const TOTAL = parseInt(process.argv[2], 10) || 100000;
+const BATCH_SIZE = parseInt(process.argv[3], 10) || 100;
+
+function ticketAt(i) {
+  const ticketNumber = `B${String(i).padStart(9, '0')}`;
+  return {
+    ticket_number: ticketNumber,
+    valor: (i % 500) + 1,
+    moneda: i % 2 === 0 ? 'DOP' : 'USD',
+    qr_data: `${ticketNumber}|${(i % 500) + 1}|DOP|2025-10-12T08:02:00Z|0123456789abcdef`,
+    mesa_id: (i % 3) + 1,
+    usuario_emision: 'bench',
+    hash_seguridad: '0123456789abcdef'
+  };
+}
+
+/**
+ * Ruta anterior: prepare() en cada llamada + SELECT adicional por id
+ */
+function legacyCreateTicket(sqlite, data) {
+  const stmt = sqlite.db.prepare(`
+    INSERT INTO tickets (ticket_number, valor, moneda, qr_data, mesa_id, usuario_emision, hash_seguridad)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+  `);
+  const result = stmt.run(
+    data.ticket_number, data.valor, data.moneda, data.qr_data,
+    data.mesa_id, data.usuario_emision, data.hash_seguridad
+  );
+  return sqlite.db.prepare('SELECT * FROM tickets WHERE id = ?').get(result.lastInsertRowid);
+}
+
+async function runCase(name, fn) {
+  const dbPath = path.join(os.tmpdir(), `tito-bench-${process.pid}-${Date.now()}.db`);
+  const sqlite = new SQLiteDB(dbPath);
+
+  const start = process.hrtime.bigint();
+  await fn(sqlite);
+  const elapsedMs = Number(process.hrtime.bigint() - start) / 1e6;
+
+  const count = sqlite.db.prepare('SELECT COUNT(*) AS c FROM tickets').get().c;
+  sqlite.close();
+  for (const file of [dbPath, dbPath.replace(/\\.db$/, '-archive.db')]) {
+    for (const suffix of ['', '-wal', '-shm']) {
+      fs.rmSync(file + suffix, { force: true });
+    }
+  }
+
+  const perSecond = Math.round(count / (elapsedMs / 1000));
+  console.log(`${name.padEnd(34)} ${String(count).padStart(8)} tickets  ${elapsedMs.toFixed(0).padStart(7)} ms  ${String(perSecond).padStart(8)} inserts/s`);
+  return perSecond;
+}
+
+async function main() {
+  console.log(`Benchmark inserción SQLite: ${TOTAL} tickets, base de datos en archivo\\n`);
+
+  const before = await runCase('antes (prepare + SELECT por ticket)', async (sqlite) => {
+    for (let i = 0; i < TOTAL; i++) {
+      legacyCreateTicket(sqlite, ticketAt(i));
+    }
+  });
+
+  const single = await runCase('createTicket (caché + RETURNING)', async (sqlite) => {
+    for (let i = 0; i < TOTAL; i++) {
+      await sqlite.createTicket(ticketAt(i));
+    }
+  });
+
+  const batched = await runCase(`createTicketsBatch (lotes de ${BATCH_SIZE})`, async (sqlite) => {
+    for (let i = 0; i < TOTAL; i += BATCH_SIZE) {
+      const batch = [];
+      for (let j = i; j < Math.min(i + BATCH_SIZE, TOTAL); j++) {
+        batch.push(ticketAt(j));
+      }
+      await sqlite.createTicketsBatch(batch);
+    }
+  });
+
+  console.log(`\\nMejora createTicket: x${(single / before).toFixed(2)}  |  createTicketsBatch: x${(batched / before).toFixed(2)}`);
+}
+
+main().catch(error => {
+  console.error('Error en benchmark:', error.message);
+  process.exit(1);
+});
+'''
+
+with open('tito-casino-system/tests/benchmarks/sqlite-insert.bench.js', 'w') as f:
+    f.write(sqlite_bench_js)
+
+# Benchmark de perfiles de almacenamiento (durable / balanced / fast-read)
+sqlite_profiles_bench_js = '''// tests/benchmarks/sqlite-profiles.bench.js
+// Uso: node tests/benchmarks/sqlite-profiles.bench.js [cantidad] [ráfaga]
+// Compara los perfiles de almacenamiento: latencia de emisión (un commit por ticket,
+// como en caja), stalls de checkpoint y una consulta de reporte sobre la base resultante.
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const SQLiteDB = require('../../src/main/database/sqlite');
+const CheckpointScheduler = require('../../src/main/database/checkpoint-scheduler');
+
+const TOTAL = parseInt(process.argv[2], 10) || 20000;
+const BURST = parseInt(process.argv[3], 10) || 50;
+const PROFILES = ['durable', 'balanced', 'fast-read'];
+
+function ticketAt(i) {
+  const ticketNumber = `P${String(i).padStart(9, '0')}`;
+  return {
+    ticket_number: ticketNumber,
+    valor: (i % 500) + 1,
+    moneda: i % 2 === 0 ? 'DOP' : 'USD',
+    qr_data: `${ticketNumber}|${(i % 500) + 1}|DOP|2025-10-12T08:02:00Z|0123456789abcdef`,
+    mesa_id: (i % 3) + 1,
+    usuario_emision: 'bench',
+    hash_seguridad: '0123456789abcdef'
+  };
+}
+
+function percentile(sorted, p) {
+  return sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * p))];
+}
+
+function elapsedMs(start) {
+  return Number(process.hrtime.bigint() - start) / 1e6;
+}
+
+/**
+ * Emite TOTAL tickets en ráfagas de BURST. Con programador, entre ráfagas hay una
+ * pausa simulada (tick con el reloj adelantado), como entre clientes en caja.
+ */
+async function runCase(profile, withScheduler) {
+  const dbPath = path.join(os.tmpdir(), `tito-profile-${process.pid}-${Date.now()}.db`);
+  const sqlite = new SQLiteDB(dbPath, { profile });
+  let clock = 0;
+  const scheduler = withScheduler
+    ? new CheckpointScheduler(sqlite, { idleMs: 1, truncatePages: 1000, now: () => clock })
+    : null;
+
+  const latencies = [];
+  let checkpointMs = 0;
+  const start = process.hrtime.bigint();
+
+  for (let i = 0; i < TOTAL; i++) {
+    const callStart = process.hrtime.bigint();
+    await sqlite.createTicket(ticketAt(i));
+    latencies.push(elapsedMs(callStart));
+
+    if (scheduler && (i + 1) % BURST === 0) {
+      scheduler.noteActivity();
+      clock += 1;
+      const tickStart = process.hrtime.bigint();
+      scheduler.tick();
+      scheduler.tick();
+      checkpointMs += elapsedMs(tickStart);
+    }
+  }
+  const totalMs = elapsedMs(start);
+
+  const reportStart = process.hrtime.bigint();
+  let rows = 0;
+  for await (const page of sqlite.iterateTicketsByDateRange('2000-01-01', '2100-01-01', { pageSize: 1000 })) {
+    rows += page.length;
+  }
+  sqlite.getTicketStats();
+  const reportMs = elapsedMs(reportStart);
+
+  const walBytes = fs.existsSync(`${dbPath}-wal`) ? fs.statSync(`${dbPath}-wal`).size : 0;
+  sqlite.close();
+  for (const file of [dbPath, dbPath.replace(/\\.db$/, '-archive.db')]) {
+    for (const suffix of ['', '-wal', '-shm']) {
+      fs.rmSync(file + suffix, { force: true });
+    }
+  }
+
+  latencies.sort((a, b) => a - b);
+  return {
+    name: `${profile}${withScheduler ? ' + programador' : ''}`,
+    perSecond: Math.round(TOTAL / (totalMs / 1000)),
+    p50: percentile(latencies, 0.5),
+    p99: percentile(latencies, 0.99),
+    max: latencies[latencies.length - 1],
+    checkpointMs,
+    reportMs,
+    rows,
+    walMiB: walBytes / (1024 * 1024)
+  };
+}
+
+async function main() {
+  console.log(`Benchmark perfiles SQLite: ${TOTAL} tickets (un commit por ticket), ráfagas de ${BURST}\\n`);
+  console.log(
+    `${'perfil'.padEnd(26)} ${'emisión/s'.padStart(10)} ${'p50 ms'.padStart(8)} ${'p99 ms'.padStart(8)} ` +
+    `${'máx ms'.padStart(8)} ${'ckpt ms'.padStart(8)} ${'reporte ms'.padStart(11)} ${'WAL MiB'.padStart(8)}`
+  );
+
+  for (const profile of PROFILES) {
+    for (const withScheduler of [false, true]) {
+      const r = await runCase(profile, withScheduler);
+      console.log(
+        `${r.name.padEnd(26)} ${String(r.perSecond).padStart(10)} ${r.p50.toFixed(3).padStart(8)} ` +
+        `${r.p99.toFixed(3).padStart(8)} ${r.max.toFixed(2).padStart(8)} ${r.checkpointMs.toFixed(0).padStart(8)} ` +
+        `${r.reportMs.toFixed(0).padStart(11)} ${r.walMiB.toFixed(1).padStart(8)}`
+      );
+    }
+  }
+
+  console.log('\\nmáx: peor emisión (incluye checkpoints automáticos en el commit); ckpt: tiempo en pausas');
+}
+
+main().catch(error => {
+  console.error('Error en benchmark:', error.message);
+  process.exit(1);
+});
+'''
+
+with open('tito-casino-system/tests/benchmarks/sqlite-profiles.bench.js', 'w') as f:
+    f.write(sqlite_profiles_bench_js)
+
 print("✅ SQLite Database implementado (TDD - Implementation after test)")
\ No newline at end of file
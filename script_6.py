@@ -2,7 +2,8 @@
 import os
 
 pdf_generator_test = '''// tests/unit/pdf-generator.test.js
-const { generateTicketPDF } = require('../../src/main/utils/pdf-generator');
+const { generateTicketPDF, clearTicketTemplateCache } = require('../../src/main/utils/pdf-generator');
+const { PDFDocument, PDFDict, PDFName } = require('pdf-lib');
 
 describe('PDF Generator', () => {
   const mockTicketData = {
@@ -44,6 +45,19 @@ describe('PDF Generator', () => {
       expect(pdfBuffer.length).toBeGreaterThan(1000);
     });
 
+    test('should draw the QR from its module matrix without a PNG', async () => {
+      const { generateTicketQR } = require('../../src/main/utils/qr-generator');
+      const { qrMatrix } = await generateTicketQR(
+        { id: 'T1', valor: 534, moneda: 'DOP', fecha: '2025-10-12T08:02:00Z' },
+        { preview: false }
+      );
+      
+      const pdfBuffer = await generateTicketPDF({ ...mockTicketData, qr_code: null, qr_matrix: qrMatrix });
+      
+      expect(pdfBuffer.toString('ascii', 0, 4)).toBe('%PDF');
+      expect(pdfBuffer.toString('latin1')).not.toContain('/Subtype /Image');
+    });
+
     test('should handle ticket without QR code', async () => {
       const ticketWithoutQR = { ...mockTicketData, qr_code: null };
       const pdfBuffer = await generateTicketPDF(ticketWithoutQR);
@@ -93,6 +107,44 @@ describe('PDF Generator', () => {
     });
   });
 
+  describe('Template cache', () => {
+    beforeEach(() => {
+      clearTicketTemplateCache();
+    });
+
+    test('should produce equivalent tickets with and without the cached template', async () => {
+      const cached = await PDFDocument.load(await generateTicketPDF(mockTicketData));
+      const uncached = await PDFDocument.load(await generateTicketPDF(mockTicketData, { useTemplateCache: false }));
+      
+      expect(cached.getPageCount()).toBe(1);
+      expect(cached.getPage(0).getSize()).toEqual(uncached.getPage(0).getSize());
+    });
+
+    test('should build the static layer once per casino and locale', async () => {
+      const createSpy = jest.spyOn(PDFDocument, 'create');
+      const loadSpy = jest.spyOn(PDFDocument, 'load');
+      
+      await generateTicketPDF(mockTicketData, { casinoName: 'CASINO A' });
+      await generateTicketPDF({ ...mockTicketData, ticket_number: 'T2' }, { casinoName: 'CASINO A' });
+      await generateTicketPDF(mockTicketData, { casinoName: 'CASINO B' });
+      
+      // 2 plantillas (CASINO A y CASINO B); cada ticket parte de los bytes de la suya
+      expect(createSpy).toHaveBeenCalledTimes(2);
+      expect(loadSpy).toHaveBeenCalledTimes(3);
+      createSpy.mockRestore();
+      loadSpy.mockRestore();
+    });
+
+    test('should reuse the template fonts instead of embedding them per ticket', async () => {
+      const doc = await PDFDocument.load(await generateTicketPDF(mockTicketData));
+      const fonts = doc.context.enumerateIndirectObjects()
+        .filter(([, object]) => object instanceof PDFDict && object.get(PDFName.of('Type')) === PDFName.of('Font'));
+      
+      // Helvetica y Helvetica-Bold, una vez cada una
+      expect(fonts).toHaveLength(2);
+    });
+  });
+
   describe('PDF Content Validation', () => {
     test('should include all required TITO elements', async () => {
       const pdfBuffer = await generateTicketPDF(mockTicketData);
@@ -2,72 +2,200 @@
 import os
 
 pdf_generator_js = '''// src/main/utils/pdf-generator.js
-const { PDFDocument, rgb, StandardFonts } = require('pdf-lib');
+const { PDFDocument, PDFFont, StandardFontEmbedder, rgb, StandardFonts } = require('pdf-lib');
 const { TICKET_DIMENSIONS } = require('../../shared/constants');
 
+// Colores
+const blackColor = rgb(0, 0, 0);
+const grayColor = rgb(0.5, 0.5, 0.5);
+
+const leftMargin = 15;
+
+// Plantillas (capa estática) por nombre de casino y locale
+const templateCache = new Map();
+
+/**
+ * Construye la capa estática del ticket: encabezado, separador y términos.
+ * Se guarda serializada junto con las referencias de sus fuentes: cada ticket
+ * carga estos bytes y dibuja con las mismas fuentes, sin volver a incrustarlas.
+ * @param {string} casinoName - Nombre del casino
+ * @param {string} locale - Locale de la plantilla
+ * @returns {Promise<Object>} { bytes, boldRef, regularRef }
+ */
+async function buildTicketTemplate(casinoName, locale) {
+  const templateDoc = await PDFDocument.create();
+  templateDoc.setLanguage(locale);
+  
+  // Agregar página con dimensiones TITO estándar
+  const page = templateDoc.addPage([
+    TICKET_DIMENSIONS.WIDTH_POINTS,
+    TICKET_DIMENSIONS.HEIGHT_POINTS
+  ]);
+  
+  const { width: pageWidth, height: pageHeight } = page.getSize();
+  
+  // Cargar fuentes
+  const boldFont = await templateDoc.embedFont(StandardFonts.HelveticaBold);
+  const regularFont = await templateDoc.embedFont(StandardFonts.Helvetica);
+  
+  // ENCABEZADO DEL CASINO
+  page.drawText(casinoName, {
+    x: pageWidth / 2 - (casinoName.length * 4), // Centrado aproximado
+    y: pageHeight - 25,
+    size: 14,
+    font: boldFont,
+    color: blackColor
+  });
+  
+  // Subtítulo
+  page.drawText('CASH OUT TICKET', {
+    x: pageWidth / 2 - 50, // Centrado aproximado
+    y: pageHeight - 45,
+    size: 12,
+    font: boldFont,
+    color: blackColor
+  });
+  
+  // Línea separadora
+  page.drawLine({
+    start: { x: 10, y: pageHeight - 55 },
+    end: { x: pageWidth - 10, y: pageHeight - 55 },
+    thickness: 1,
+    color: grayColor
+  });
+  
+  // TEXTO LEGAL Y TÉRMINOS
+  let yPosition = 50; // Posición fija cerca del final
+  
+  page.drawText('TÉRMINOS Y CONDICIONES:', {
+    x: leftMargin,
+    y: yPosition,
+    size: 8,
+    font: boldFont,
+    color: blackColor
+  });
+  yPosition -= 12;
+  
+  const terminos = [
+    '• Este ticket representa valor monetario real.',
+    '• Válido únicamente en cajas autorizadas.',
+    '• No transferible. Conserve hasta el canje.',
+    '• Sujeto a verificación y términos del casino.'
+  ];
+  
+  terminos.forEach(termino => {
+    page.drawText(termino, {
+      x: leftMargin,
+      y: yPosition,
+      size: 7,
+      font: regularFont,
+      color: blackColor
+    });
+    yPosition -= 10;
+  });
+  
+  return {
+    bytes: await templateDoc.save(),
+    boldRef: boldFont.ref,
+    regularRef: regularFont.ref
+  };
+}
+
+/**
+ * Obtiene la plantilla cacheada para un casino y locale, construyéndola una sola vez
+ * @param {string} casinoName - Nombre del casino
+ * @param {string} locale - Locale de la plantilla
+ * @returns {Promise<Object>} Plantilla { bytes, boldRef, regularRef }
+ */
+function getTicketTemplate(casinoName, locale) {
+  const key = `${casinoName}|${locale}`;
+  let template = templateCache.get(key);
+  
+  if (!template) {
+    // Se cachea la promesa para que emisiones simultáneas compartan la construcción
+    template = buildTicketTemplate(casinoName, locale);
+    templateCache.set(key, template);
+    template.catch(() => templateCache.delete(key));
+  }
+  
+  return template;
+}
+
+/**
+ * Vacía la caché de plantillas (p. ej. al cambiar CASINO_NAME)
+ */
+function clearTicketTemplateCache() {
+  templateCache.clear();
+}
+
+/**
+ * Dibuja la matriz de módulos de un QR como un único path vectorial.
+ * Los módulos oscuros contiguos de cada fila se unen en un solo rectángulo.
+ * @param {PDFPage} page - Página destino
+ * @param {Object} matrix - Matriz { size, data } de QRCode.create().modules
+ * @param {Object} box - { x, y, size, margin } en puntos (x, y = esquina inferior izquierda)
+ */
+function drawQRMatrix(page, matrix, { x, y, size, margin = 2 }) {
+  const modules = matrix.size;
+  let path = '';
+  
+  for (let row = 0; row < modules; row++) {
+    let col = 0;
+    while (col < modules) {
+      if (!matrix.data[row * modules + col]) {
+        col++;
+        continue;
+      }
+      const start = col;
+      while (col < modules && matrix.data[row * modules + col]) {
+        col++;
+      }
+      path += `M${start + margin} ${row + margin}h${col - start}v1h${start - col}z`;
+    }
+  }
+  
+  // drawSvgPath usa coordenadas SVG (y hacia abajo) desde la esquina superior izquierda
+  page.drawSvgPath(path, {
+    x,
+    y: y + size,
+    scale: size / (modules + margin * 2),
+    color: blackColor
+  });
+}
+
 /**
- * Genera un PDF para un ticket TITO
+ * Genera un PDF para un ticket TITO copiando la plantilla estática
+ * y dibujando encima solo los datos del ticket
  * @param {Object} ticketData - Datos del ticket
+ * @param {Object} options - { casinoName, locale, useTemplateCache }
  * @returns {Promise<Buffer>} Buffer del PDF generado
  */
-async function generateTicketPDF(ticketData) {
+async function generateTicketPDF(ticketData, options = {}) {
   try {
     // Validar datos requeridos
     if (!ticketData.ticket_number || !ticketData.valor || !ticketData.moneda) {
       throw new Error('Datos requeridos faltantes para generar PDF');
     }
 
-    // Crear documento PDF
-    const pdfDoc = await PDFDocument.create();
-    
-    // Agregar página con dimensiones TITO estándar
-    const page = pdfDoc.addPage([
-      TICKET_DIMENSIONS.WIDTH_POINTS,
-      TICKET_DIMENSIONS.HEIGHT_POINTS
-    ]);
+    const casinoName = options.casinoName || process.env.CASINO_NAME || 'CASINO EL PARAÍSO';
+    const locale = options.locale || 'es-DO';
+    const template = options.useTemplateCache === false
+      ? await buildTicketTemplate(casinoName, locale)
+      : await getTicketTemplate(casinoName, locale);
+
+    // Crear documento PDF a partir de la plantilla (página y fuentes ya incluidas)
+    const pdfDoc = await PDFDocument.load(template.bytes, { updateMetadata: false });
+    const page = pdfDoc.getPage(0);
     
     const { width: pageWidth, height: pageHeight } = page.getSize();
     
-    // Cargar fuentes
-    const boldFont = await pdfDoc.embedFont(StandardFonts.HelveticaBold);
-    const regularFont = await pdfDoc.embedFont(StandardFonts.Helvetica);
-    const smallFont = await pdfDoc.embedFont(StandardFonts.Helvetica);
-    
-    // Colores
-    const blackColor = rgb(0, 0, 0);
-    const grayColor = rgb(0.5, 0.5, 0.5);
-    
-    // ENCABEZADO DEL CASINO
-    const casinoName = process.env.CASINO_NAME || 'CASINO EL PARAÍSO';
-    page.drawText(casinoName, {
-      x: pageWidth / 2 - (casinoName.length * 4), // Centrado aproximado
-      y: pageHeight - 25,
-      size: 14,
-      font: boldFont,
-      color: blackColor
-    });
-    
-    // Subtítulo
-    page.drawText('CASH OUT TICKET', {
-      x: pageWidth / 2 - 50, // Centrado aproximado
-      y: pageHeight - 45,
-      size: 12,
-      font: boldFont,
-      color: blackColor
-    });
-    
-    // Línea separadora
-    page.drawLine({
-      start: { x: 10, y: pageHeight - 55 },
-      end: { x: pageWidth - 10, y: pageHeight - 55 },
-      thickness: 1,
-      color: grayColor
-    });
+    // Fuentes de la plantilla para la capa variable (las referencias se conservan al cargar)
+    const boldFont = PDFFont.of(template.boldRef, pdfDoc, StandardFontEmbedder.for(StandardFonts.HelveticaBold));
+    const regularFont = PDFFont.of(template.regularRef, pdfDoc, StandardFontEmbedder.for(StandardFonts.Helvetica));
     
     // INFORMACIÓN DEL TICKET
     let yPosition = pageHeight - 75;
     const lineHeight = 15;
-    const leftMargin = 15;
     
     // Número de ticket
     page.drawText(`Ticket No: ${ticketData.ticket_number}`, {
@@ -80,7 +208,7 @@ async function generateTicketPDF(ticketData) {
     yPosition -= lineHeight;
     
     // Fecha y hora
-    const fechaFormateada = new Date(ticketData.fecha_emision).toLocaleString('es-DO', {
+    const fechaFormateada = new Date(ticketData.fecha_emision).toLocaleString(locale, {
       year: 'numeric',
       month: '2-digit',
       day: '2-digit',
@@ -127,10 +255,19 @@ async function generateTicketPDF(ticketData) {
       font: boldFont,
       color: blackColor
     });
-    yPosition -= 25;
     
-    // CÓDIGO QR
-    if (ticketData.qr_code) {
+    // CÓDIGO QR (parte derecha)
+    const qrSize = 75;
+    const qrX = pageWidth - qrSize - 15;
+    const qrY = pageHeight - 130;
+    let qrDrawn = false;
+    
+    if (ticketData.qr_matrix) {
+      // Ruta vectorial: módulos dibujados directamente, sin PNG
+      drawQRMatrix(page, ticketData.qr_matrix, { x: qrX, y: qrY, size: qrSize });
+      qrDrawn = true;
+      
+    } else if (ticketData.qr_code) {
       try {
         // Extraer datos base64 del data URL
         const base64Data = ticketData.qr_code.split(',')[1];
@@ -151,26 +288,13 @@ async function generateTicketPDF(ticketData) {
           }
           
           if (qrImage) {
-            // Posicionar QR en la parte derecha
-            const qrSize = 75;
-            const qrX = pageWidth - qrSize - 15;
-            const qrY = pageHeight - 130;
-            
             page.drawImage(qrImage, {
               x: qrX,
               y: qrY,
               width: qrSize,
               height: qrSize
             });
-            
-            // Etiqueta para el QR
-            page.drawText('Código QR', {
-              x: qrX + 10,
-              y: qrY - 15,
-              size: 8,
-              font: regularFont,
-              color: grayColor
-            });
+            qrDrawn = true;
           }
         }
       } catch (error) {
@@ -179,35 +303,16 @@ async function generateTicketPDF(ticketData) {
       }
     }
     
-    // TEXTO LEGAL Y TÉRMINOS
-    yPosition = 50; // Posición fija cerca del final
-    
-    page.drawText('TÉRMINOS Y CONDICIONES:', {
-      x: leftMargin,
-      y: yPosition,
-      size: 8,
-      font: boldFont,
-      color: blackColor
-    });
-    yPosition -= 12;
-    
-    const terminos = [
-      '• Este ticket representa valor monetario real.',
-      '• Válido únicamente en cajas autorizadas.',
-      '• No transferible. Conserve hasta el canje.',
-      '• Sujeto a verificación y términos del casino.'
-    ];
-    
-    terminos.forEach(termino => {
-      page.drawText(termino, {
-        x: leftMargin,
-        y: yPosition,
-        size: 7,
+    if (qrDrawn) {
+      // Etiqueta para el QR
+      page.drawText('Código QR', {
+        x: qrX + 10,
+        y: qrY - 15,
+        size: 8,
         font: regularFont,
-        color: blackColor
+        color: grayColor
       });
-      yPosition -= 10;
-    });
+    }
     
     // INFORMACIÓN ADICIONAL
     if (ticketData.usuario_emision) {
@@ -314,11 +419,124 @@ function validateTicketData(ticketData) {
 module.exports = {
   generateTicketPDF,
   generateTestPDF,
-  validateTicketData
+  validateTicketData,
+  clearTicketTemplateCache
 };
 '''
 
 with open('tito-casino-system/src/main/utils/pdf-generator.js', 'w') as f:
     f.write(pdf_generator_js)
 
+# Benchmark de generación de tickets PDF (plantilla cacheada vs. sin caché)
+pdf_bench_js = '''// tests/benchmarks/pdf-ticket.bench.js
+// Uso: node tests/benchmarks/pdf-ticket.bench.js [cantidad]
+// Mide la parte CPU del handler 'generate-ticket' (QR + PDF), sin DB ni impresora.
+const { generateTicketQR, generateTicketNumber } = require('../../src/main/utils/qr-generator');
+const { PDFDocument, PDFDict, PDFName } = require('pdf-lib');
+const { generateTicketPDF, clearTicketTemplateCache } = require('../../src/main/utils/pdf-generator');
+
+const TOTAL = parseInt(process.argv[2], 10) || 500;
+
+function percentile(sorted, p) {
+  return sorted[Math.min(sorted.length - 1, Math.ceil((p / 100) * sorted.length) - 1)];
+}
+
+async function emitTicket({ useTemplateCache, vectorQR }) {
+  const ticketNumber = generateTicketNumber(1);
+  const fechaEmision = new Date().toISOString();
+  const valor = 534;
+
+  const qrResult = await generateTicketQR(
+    { id: ticketNumber, valor, moneda: 'DOP', fecha: fechaEmision },
+    { preview: !vectorQR }
+  );
+
+  return generateTicketPDF({
+    ticket_number: ticketNumber,
+    valor,
+    moneda: 'DOP',
+    fecha_emision: fechaEmision,
+    qr_matrix: vectorQR ? qrResult.qrMatrix : null,
+    qr_code: vectorQR ? null : qrResult.qrCode,
+    mesa_id: 1,
+    usuario_emision: 'Mesa1'
+  }, { useTemplateCache });
+}
+
+async function runCase(name, options) {
+  clearTicketTemplateCache();
+
+  // Calentamiento (JIT, métricas de fuentes estándar)
+  for (let i = 0; i < 20; i++) {
+    await emitTicket(options);
+  }
+
+  const latencies = [];
+  const start = process.hrtime.bigint();
+
+  for (let i = 0; i < TOTAL; i++) {
+    const t0 = process.hrtime.bigint();
+    await emitTicket(options);
+    latencies.push(Number(process.hrtime.bigint() - t0) / 1e6);
+  }
+
+  const elapsedMs = Number(process.hrtime.bigint() - start) / 1e6;
+  latencies.sort((a, b) => a - b);
+
+  const sample = await emitTicket(options);
+  const fonts = await countFonts(sample);
+  const perSecond = TOTAL / (elapsedMs / 1000);
+  console.log(
+    `${name.padEnd(32)} ${perSecond.toFixed(1).padStart(8)} tickets/s  ` +
+    `p50 ${percentile(latencies, 50).toFixed(2)} ms  p99 ${percentile(latencies, 99).toFixed(2)} ms  ` +
+    `${sample.length} bytes  ${fonts} fuentes`
+  );
+  return { perSecond, p99: percentile(latencies, 99), bytes: sample.length, fonts };
+}
+
+/**
+ * Cuenta los diccionarios /Type /Font de un PDF
+ */
+async function countFonts(pdfBuffer) {
+  const doc = await PDFDocument.load(pdfBuffer);
+  return doc.context.enumerateIndirectObjects()
+    .filter(([, object]) => object instanceof PDFDict && object.get(PDFName.of('Type')) === PDFName.of('Font'))
+    .length;
+}
+
+async function main() {
+  console.log(`Benchmark generate-ticket (QR + PDF): ${TOTAL} tickets\\n`);
+
+  const before = await runCase('sin caché + QR PNG', { useTemplateCache: false, vectorQR: false });
+  await runCase('plantilla cacheada + QR PNG', { useTemplateCache: true, vectorQR: false });
+  const after = await runCase('plantilla cacheada + QR vectorial', { useTemplateCache: true, vectorQR: true });
+
+  console.log(`\\nMejora: x${(after.perSecond / before.perSecond).toFixed(2)} tickets/s, p99 ${before.p99.toFixed(2)} -> ${after.p99.toFixed(2)} ms`);
+
+  // La plantilla cacheada debe ser más rápida y no duplicar fuentes ni tamaño
+  const failures = [];
+  if (after.fonts !== 2) {
+    failures.push(`se esperaban 2 fuentes por ticket, hay ${after.fonts}`);
+  }
+  if (after.bytes > before.bytes) {
+    failures.push(`ticket con plantilla más grande (${after.bytes} > ${before.bytes} bytes)`);
+  }
+  if (after.perSecond <= before.perSecond) {
+    failures.push('la plantilla cacheada no es más rápida que construir el ticket completo');
+  }
+  if (failures.length > 0) {
+    failures.forEach(failure => console.error(`❌ ${failure}`));
+    process.exit(1);
+  }
+}
+
+main().catch(error => {
+  console.error('Error en benchmark:', error.message);
+  process.exit(1);
+});
+'''
+
+with open('tito-casino-system/tests/benchmarks/pdf-ticket.bench.js', 'w') as f:
+    f.write(pdf_bench_js)
+
 print("✅ Generador PDF implementado (TDD - Implementation after test)")
\ No newline at end of file
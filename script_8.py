@@ -4,16 +4,26 @@ import os
 printer_service_js = '''// src/main/hardware/printer.js
 const { exec } = require('child_process');
 const fs = require('fs');
+const net = require('net');
 const path = require('path');
 const os = require('os');
 const { PRINTER_CONFIG } = require('../../shared/constants');
+const { encodeTicket, encodeTestPage } = require('./escpos');
 
 /**
  * Servicio para manejar la impresión de tickets
  */
 class PrinterService {
-  constructor(printerName = null) {
+  /**
+   * @param {string} printerName - Nombre de la impresora en el sistema (backend pdf)
+   * @param {Object} options - { backend, devicePath, host, port } (backend escpos)
+   */
+  constructor(printerName = null, options = {}) {
     this.printerName = printerName || process.env.PRINTER_NAME || PRINTER_CONFIG.NAME;
+    this.backend = options.backend || process.env.PRINTER_BACKEND || PRINTER_CONFIG.BACKEND;
+    this.devicePath = options.devicePath || process.env.PRINTER_DEVICE || PRINTER_CONFIG.DEVICE;
+    this.host = options.host || process.env.PRINTER_HOST || PRINTER_CONFIG.HOST;
+    this.port = Number(options.port || process.env.PRINTER_PORT || PRINTER_CONFIG.PORT);
     this.tempDir = path.join(os.tmpdir(), 'tito-tickets');
     this.isInitialized = false;
     
@@ -25,13 +35,22 @@ class PrinterService {
    */
   init() {
     try {
-      // Crear directorio temporal si no existe
-      if (!fs.existsSync(this.tempDir)) {
-        fs.mkdirSync(this.tempDir, { recursive: true });
+      if (this.backend === 'escpos') {
+        // ESC/POS escribe bytes directos: no usa archivos temporales
+        if (!this.host && !this.devicePath) {
+          throw new Error('Backend escpos requiere PRINTER_DEVICE o PRINTER_HOST');
+        }
+      } else if (this.backend === 'pdf') {
+        // Crear directorio temporal si no existe
+        if (!fs.existsSync(this.tempDir)) {
+          fs.mkdirSync(this.tempDir, { recursive: true });
+        }
+      } else {
+        throw new Error(`Backend de impresión no soportado: ${this.backend}`);
       }
 
       this.isInitialized = true;
-      console.log(`PrinterService inicializado para impresora: ${this.printerName}`);
+      console.log(`PrinterService (${this.backend}) inicializado para impresora: ${this.describeTarget()}`);
       
     } catch (error) {
       console.error('Error inicializando PrinterService:', error.message);
@@ -39,6 +58,90 @@ class PrinterService {
     }
   }
 
+  /**
+   * Describe el destino de impresión para los logs
+   * @returns {string} Destino
+   */
+  describeTarget() {
+    if (this.backend !== 'escpos') {
+      return this.printerName;
+    }
+    return this.host ? `${this.host}:${this.port}` : this.devicePath;
+  }
+
+  /**
+   * Imprime un ticket a partir de sus datos con el backend configurado.
+   * pdf: genera el PDF y lo envía al spooler; escpos: genera el flujo ESC/POS
+   * (texto + QR nativo) y lo escribe directamente en la impresora.
+   * @param {Object} ticketData - Datos del ticket (incluye qr_data para escpos y qr_matrix/qr_code para pdf)
+   * @param {Object} options - Opciones de impresión ({ casinoName, locale } y opciones de printTicket)
+   * @returns {Promise<boolean>} True si la impresión fue exitosa
+   */
+  async printTicketData(ticketData, options = {}) {
+    if (this.backend !== 'escpos') {
+      const { generateTicketPDF } = require('../utils/pdf-generator');
+      // Trabajos de la cola persistente solo traen qr_data: regenerar la matriz
+      if (!ticketData.qr_matrix && !ticketData.qr_code && ticketData.qr_data) {
+        const { createQRMatrix } = require('../utils/qr-generator');
+        ticketData = { ...ticketData, qr_matrix: createQRMatrix(ticketData.qr_data) };
+      }
+      const pdfBuffer = await generateTicketPDF(ticketData, options);
+      return this.printTicket(pdfBuffer, options);
+    }
+
+    if (!this.isInitialized) {
+      throw new Error('PrinterService no inicializado');
+    }
+
+    try {
+      const data = encodeTicket(ticketData, options);
+      await this.writeRaw(data);
+      console.log(`Ticket impreso exitosamente (ESC/POS): ${ticketData.ticket_number}`);
+      return true;
+      
+    } catch (error) {
+      throw new Error(`Error imprimiendo ticket: ${error.message}`);
+    }
+  }
+
+  /**
+   * Escribe bytes ESC/POS en la impresora (socket TCP o ruta de dispositivo)
+   * @param {Buffer} data - Flujo ESC/POS
+   * @returns {Promise<void>}
+   */
+  writeRaw(data) {
+    if (this.host) {
+      return this.writeToSocket(data);
+    }
+    return fs.promises.writeFile(this.devicePath, data);
+  }
+
+  /**
+   * Envía bytes a una impresora en red (puerto RAW, normalmente 9100)
+   * @param {Buffer} data - Flujo ESC/POS
+   * @returns {Promise<void>}
+   */
+  writeToSocket(data) {
+    return new Promise((resolve, reject) => {
+      const timeout = PRINTER_CONFIG.TIMEOUT || 30000;
+      const socket = net.createConnection({ host: this.host, port: this.port });
+      let failed = false;
+
+      socket.setTimeout(timeout);
+      socket.on('connect', () => socket.end(data));
+      socket.on('timeout', () => {
+        socket.destroy(new Error(`Tiempo de espera agotado con ${this.host}:${this.port}`));
+      });
+      socket.on('error', (error) => {
+        failed = true;
+        reject(error);
+      });
+      socket.on('close', () => {
+        if (!failed) resolve();
+      });
+    });
+  }
+
   /**
    * Imprime un ticket desde un buffer PDF
    * @param {Buffer} pdfBuffer - Buffer del PDF a imprimir
@@ -198,11 +301,17 @@ class PrinterService {
    */
   async testPrinter() {
     try {
-      const { generateTestPDF } = require('../utils/pdf-generator');
-      const testPdfBuffer = await generateTestPDF();
-      
       console.log('Ejecutando prueba de impresora...');
-      const result = await this.printTicket(testPdfBuffer);
+      let result;
+      
+      if (this.backend === 'escpos') {
+        await this.writeRaw(encodeTestPage());
+        result = true;
+      } else {
+        const { generateTestPDF } = require('../utils/pdf-generator');
+        const testPdfBuffer = await generateTestPDF();
+        result = await this.printTicket(testPdfBuffer);
+      }
       
       if (result) {
         console.log('✅ Prueba de impresora exitosa');
@@ -291,6 +400,14 @@ class PrinterService {
    * @returns {Promise<boolean>} True si está disponible
    */
   async isPrinterAvailable() {
+    if (this.backend === 'escpos') {
+      if (this.host) {
+        // Conexión sin datos: solo comprueba que el puerto acepta conexiones
+        return this.writeToSocket(Buffer.alloc(0)).then(() => true, () => false);
+      }
+      return fs.existsSync(this.devicePath);
+    }
+
     try {
       const printers = await this.listPrinters();
       return printers.some(printer => 
@@ -340,4 +457,652 @@ module.exports = PrinterService;
 with open('tito-casino-system/src/main/hardware/printer.js', 'w') as f:
     f.write(printer_service_js)
 
+escpos_js = '''// src/main/hardware/escpos.js
+const { PRINTER_CONFIG } = require('../../shared/constants');
+
+const ESC = 0x1b;
+const GS = 0x1d;
+const LF = 0x0a;
+
+// Niveles de corrección de error de GS ( k (función 169)
+const QR_ERROR_LEVELS = { L: 48, M: 49, Q: 50, H: 51 };
+
+/**
+ * Construye un flujo de bytes ESC/POS
+ */
+class EscPosBuilder {
+  constructor(options = {}) {
+    this.lineWidth = options.lineWidth || PRINTER_CONFIG.LINE_WIDTH;
+    this.chunks = [];
+  }
+
+  /**
+   * Agrega bytes sin procesar
+   * @param {Array<number>|Buffer} bytes - Bytes a agregar
+   * @returns {EscPosBuilder} this
+   */
+  raw(bytes) {
+    this.chunks.push(Buffer.isBuffer(bytes) ? bytes : Buffer.from(bytes));
+    return this;
+  }
+
+  /**
+   * ESC @ + ESC t 16: reinicia la impresora y selecciona la página de códigos WPC1252
+   */
+  init() {
+    return this.raw([ESC, 0x40, ESC, 0x74, 16]);
+  }
+
+  /**
+   * ESC a n: alineación ('left' | 'center' | 'right')
+   */
+  align(position) {
+    const values = { left: 0, center: 1, right: 2 };
+    return this.raw([ESC, 0x61, values[position] || 0]);
+  }
+
+  /**
+   * ESC E n: negrita
+   */
+  bold(enabled) {
+    return this.raw([ESC, 0x45, enabled ? 1 : 0]);
+  }
+
+  /**
+   * GS ! n: multiplicador de ancho y alto del carácter (1-8)
+   */
+  size(width = 1, height = 1) {
+    return this.raw([GS, 0x21, ((width - 1) << 4) | (height - 1)]);
+  }
+
+  /**
+   * Texto en WPC1252 (cubre los caracteres del español) terminado en salto de línea
+   */
+  line(text = '') {
+    // Espacios Unicode (p. ej. los de toLocaleString) a espacio simple; resto fuera de WPC1252 a '?'
+    const printable = `${text}`
+      .replace(/[\\u2000-\\u200b\\u202f\\u205f]/g, ' ')
+      .replace(/[^\\x00-\\xff]/g, '?');
+    this.chunks.push(Buffer.from(printable, 'latin1'));
+    return this.raw([LF]);
+  }
+
+  /**
+   * Línea separadora del ancho del papel
+   */
+  separator(char = '-') {
+    return this.line(char.repeat(this.lineWidth));
+  }
+
+  /**
+   * Código QR nativo (GS ( k, modelo 2): la impresora genera los módulos
+   * @param {string} data - Contenido del QR
+   * @param {Object} options - { moduleSize, errorLevel }
+   */
+  qr(data, options = {}) {
+    const moduleSize = options.moduleSize || PRINTER_CONFIG.QR_MODULE_SIZE;
+    const errorLevel = QR_ERROR_LEVELS[options.errorLevel || 'M'];
+    const payload = Buffer.from(data, 'latin1');
+    const storeLength = payload.length + 3;
+
+    return this
+      .raw([GS, 0x28, 0x6b, 4, 0, 0x31, 0x41, 0x32, 0x00])           // Modelo 2
+      .raw([GS, 0x28, 0x6b, 3, 0, 0x31, 0x43, moduleSize])           // Tamaño del módulo
+      .raw([GS, 0x28, 0x6b, 3, 0, 0x31, 0x45, errorLevel])           // Corrección de error
+      .raw([GS, 0x28, 0x6b, storeLength & 0xff, storeLength >> 8, 0x31, 0x50, 0x30])
+      .raw(payload)                                                  // Almacenar datos
+      .raw([GS, 0x28, 0x6b, 3, 0, 0x31, 0x51, 0x30]);                // Imprimir
+  }
+
+  /**
+   * ESC d n + GS V 66 n: avanza el papel y hace corte parcial
+   */
+  cut(feedLines = 3) {
+    return this.raw([ESC, 0x64, feedLines, GS, 0x56, 66, 0]);
+  }
+
+  /**
+   * @returns {Buffer} Flujo ESC/POS completo
+   */
+  build() {
+    return Buffer.concat(this.chunks);
+  }
+}
+
+/**
+ * Genera el flujo ESC/POS de un ticket TITO (mismo contenido que el PDF)
+ * @param {Object} ticketData - Datos del ticket (ticket_number, valor, moneda, fecha_emision, qr_data, ...)
+ * @param {Object} options - { casinoName, locale, lineWidth }
+ * @returns {Buffer} Bytes listos para enviar a la impresora
+ */
+function encodeTicket(ticketData, options = {}) {
+  if (!ticketData.ticket_number || !ticketData.valor || !ticketData.moneda || !ticketData.qr_data) {
+    throw new Error('Datos requeridos faltantes para generar ticket ESC/POS');
+  }
+
+  const casinoName = options.casinoName || process.env.CASINO_NAME || 'CASINO EL PARAÍSO';
+  const locale = options.locale || 'es-DO';
+  const fechaFormateada = new Date(ticketData.fecha_emision).toLocaleString(locale, {
+    year: 'numeric',
+    month: '2-digit',
+    day: '2-digit',
+    hour: '2-digit',
+    minute: '2-digit',
+    second: '2-digit'
+  });
+
+  const builder = new EscPosBuilder(options)
+    .init()
+    // ENCABEZADO
+    .align('center')
+    .bold(true)
+    .size(2, 2)
+    .line(casinoName)
+    .size(1, 1)
+    .line('CASH OUT TICKET')
+    .bold(false)
+    .separator()
+    // INFORMACIÓN DEL TICKET
+    .align('left')
+    .line(`Ticket No: ${ticketData.ticket_number}`)
+    .line(`Fecha: ${fechaFormateada}`);
+
+  if (ticketData.mesa_id) {
+    builder.line(`Mesa: ${ticketData.mesa_id}`);
+  }
+
+  builder
+    .align('center')
+    .bold(true)
+    .size(2, 2)
+    .line(`${ticketData.moneda} $${ticketData.valor.toFixed(2)}`)
+    .size(1, 1)
+    .bold(false)
+    .line()
+    .qr(ticketData.qr_data)
+    .line(`#${ticketData.ticket_number}`)
+    .align('left');
+
+  if (ticketData.usuario_emision) {
+    builder.line(`Emisor: ${ticketData.usuario_emision}`);
+  }
+
+  return builder
+    .separator()
+    .bold(true)
+    .line('TÉRMINOS Y CONDICIONES:')
+    .bold(false)
+    .line('- Este ticket representa valor monetario real.')
+    .line('- Válido únicamente en cajas autorizadas.')
+    .line('- No transferible. Conserve hasta el canje.')
+    .line('- Sujeto a verificación y términos del casino.')
+    .cut()
+    .build();
+}
+
+/**
+ * Genera una página de prueba ESC/POS
+ * @returns {Buffer} Bytes de la página de prueba
+ */
+function encodeTestPage() {
+  return new EscPosBuilder()
+    .init()
+    .align('center')
+    .bold(true)
+    .line('PRUEBA DE IMPRESIÓN')
+    .bold(false)
+    .line('Sistema TITO - Test Print')
+    .line(new Date().toLocaleString())
+    .qr('TEST')
+    .cut()
+    .build();
+}
+
+module.exports = {
+  EscPosBuilder,
+  encodeTicket,
+  encodeTestPage
+};
+'''
+
+with open('tito-casino-system/src/main/hardware/escpos.js', 'w') as f:
+    f.write(escpos_js)
+
+escpos_test = '''// tests/unit/escpos.test.js
+const { EscPosBuilder, encodeTicket } = require('../../src/main/hardware/escpos');
+
+describe('ESC/POS encoder', () => {
+  const mockTicketData = {
+    ticket_number: 'T1234567890',
+    valor: 100.50,
+    moneda: 'DOP',
+    fecha_emision: '2025-10-12T08:02:00Z',
+    qr_data: 'T1234567890|100.5|DOP|2025-10-12T08:02:00Z|abc123',
+    mesa_id: 1,
+    usuario_emision: 'Mesa1'
+  };
+
+  test('should start with ESC @ and end with a partial cut', () => {
+    const data = encodeTicket(mockTicketData);
+    
+    expect([...data.subarray(0, 2)]).toEqual([0x1b, 0x40]);
+    expect([...data.subarray(-4)]).toEqual([0x1d, 0x56, 66, 0]);
+  });
+
+  test('should store the QR payload with GS ( k and print it', () => {
+    const data = encodeTicket(mockTicketData);
+    const payload = Buffer.from(mockTicketData.qr_data, 'latin1');
+    const length = payload.length + 3;
+    const store = Buffer.concat([
+      Buffer.from([0x1d, 0x28, 0x6b, length & 0xff, length >> 8, 0x31, 0x50, 0x30]),
+      payload
+    ]);
+    
+    expect(data.indexOf(store)).toBeGreaterThan(0);
+    expect(data.indexOf(Buffer.from([0x1d, 0x28, 0x6b, 3, 0, 0x31, 0x51, 0x30]))).toBeGreaterThan(data.indexOf(store));
+  });
+
+  test('should encode ticket text in WPC1252', () => {
+    const data = encodeTicket(mockTicketData, { casinoName: 'CASINO EL PARAÍSO' });
+    
+    expect(data.indexOf(Buffer.from('PARAÍSO', 'latin1'))).toBeGreaterThan(0);
+    expect(data.includes('DOP $100.50')).toBe(true);
+    expect(data.includes('Mesa: 1')).toBe(true);
+  });
+
+  test('should throw error for missing qr_data', () => {
+    expect(() => encodeTicket({ ...mockTicketData, qr_data: null }))
+      .toThrow('Datos requeridos faltantes para generar ticket ESC/POS');
+  });
+
+  test('should build the separator to the configured line width', () => {
+    const data = new EscPosBuilder({ lineWidth: 32 }).separator().build();
+    
+    expect(data.toString('latin1')).toBe('-'.repeat(32) + '\\n');
+  });
+});
+'''
+
+with open('tito-casino-system/tests/unit/escpos.test.js', 'w') as f:
+    f.write(escpos_test)
+
+print_queue_js = '''// src/main/hardware/print-queue.js
+const EventEmitter = require('events');
+const { PRINTER_CONFIG } = require('../../shared/constants');
+
+/**
+ * Worker de la cola persistente de impresión (tabla print_jobs).
+ * Imprime los trabajos en orden, reintenta con backoff exponencial y
+ * emite 'status' en cada cambio de estado de un trabajo.
+ */
+class PrintQueue extends EventEmitter {
+  /**
+   * @param {SQLiteDB|SQLiteClient} db - Base de datos local (síncrona o en worker)
+   * @param {PrinterService} printer - Servicio de impresión
+   * @param {Object} options - { maxDepth, maxAttempts, retryBaseMs, retryMaxMs }
+   */
+  constructor(db, printer, options = {}) {
+    super();
+    this.db = db;
+    this.printer = printer;
+    this.maxDepth = options.maxDepth || PRINTER_CONFIG.QUEUE_MAX_DEPTH;
+    this.maxAttempts = options.maxAttempts || PRINTER_CONFIG.QUEUE_MAX_ATTEMPTS;
+    this.retryBaseMs = options.retryBaseMs || PRINTER_CONFIG.QUEUE_RETRY_BASE_MS;
+    this.retryMaxMs = options.retryMaxMs || PRINTER_CONFIG.QUEUE_RETRY_MAX_MS;
+    this.stopped = true;
+    this.draining = null;
+    this.retryTimer = null;
+  }
+
+  /**
+   * Recupera trabajos interrumpidos y empieza a procesar la cola
+   * @returns {Promise<number>} Trabajos recuperados de una ejecución anterior
+   */
+  async start() {
+    const recovered = await this.db.recoverPrintJobs();
+    this.stopped = false;
+    this.kick();
+    return recovered;
+  }
+
+  /**
+   * Detiene el worker (el trabajo en curso termina; lo pendiente queda en la tabla)
+   */
+  stop() {
+    this.stopped = true;
+    clearTimeout(this.retryTimer);
+    this.retryTimer = null;
+  }
+
+  /**
+   * @returns {Promise<number>} Trabajos sin imprimir
+   */
+  async getDepth() {
+    return this.db.getPrintQueueDepth();
+  }
+
+  /**
+   * @param {number} count - Trabajos que se quieren encolar
+   * @returns {Promise<boolean>} True si caben sin superar la profundidad máxima
+   */
+  async hasRoom(count = 1) {
+    return (await this.getDepth()) + count <= this.maxDepth;
+  }
+
+  /**
+   * @returns {Promise<boolean>} True si la cola alcanzó su profundidad máxima
+   */
+  async isFull() {
+    return !(await this.hasRoom(1));
+  }
+
+  /**
+   * Despierta al worker (p. ej. tras encolar un trabajo)
+   */
+  kick() {
+    if (this.stopped || this.draining) {
+      return;
+    }
+
+    clearTimeout(this.retryTimer);
+    this.retryTimer = null;
+    this.draining = this.drain()
+      .catch(error => console.error('Error procesando cola de impresión:', error.message))
+      .finally(() => {
+        this.draining = null;
+      });
+  }
+
+  /**
+   * Espera a que termine la pasada en curso
+   * @returns {Promise<void>}
+   */
+  async idle() {
+    while (this.draining) {
+      await this.draining;
+    }
+  }
+
+  /**
+   * Procesa trabajos en orden hasta vaciar la cola o encontrar uno en espera de reintento
+   */
+  async drain() {
+    while (!this.stopped) {
+      const job = await this.db.getNextPrintJob();
+      if (!job) {
+        return;
+      }
+
+      // El primero de la cola bloquea a los siguientes para conservar el orden
+      const wait = job.next_attempt_at - Date.now();
+      if (wait > 0) {
+        this.retryTimer = setTimeout(() => this.kick(), wait);
+        return;
+      }
+
+      await this.processJob(job);
+    }
+  }
+
+  /**
+   * Imprime un trabajo y registra el resultado
+   * @param {Object} job - Fila de print_jobs
+   */
+  async processJob(job) {
+    const attempts = job.attempts + 1;
+    const start = Date.now();
+    await this.db.startPrintJob(job.id);
+    await this.emitStatus(job, 'imprimiendo', { attempts });
+
+    let printError = null;
+    try {
+      await this.printer.printTicketData(job.payload);
+    } catch (error) {
+      printError = error;
+    }
+
+    if (!printError) {
+      await this.db.completePrintJob(job.id);
+      await this.emitStatus(job, 'impreso', { attempts, durationMs: Date.now() - start });
+      return;
+    }
+
+    if (attempts >= this.maxAttempts) {
+      await this.db.failPrintJob(job.id, printError.message, null);
+      await this.emitStatus(job, 'fallido', { attempts, error: printError.message });
+      return;
+    }
+
+    const retryInMs = Math.min(this.retryMaxMs, this.retryBaseMs * 2 ** (attempts - 1));
+    await this.db.failPrintJob(job.id, printError.message, Date.now() + retryInMs);
+    await this.emitStatus(job, 'pendiente', { attempts, error: printError.message, retryInMs });
+  }
+
+  /**
+   * Emite el estado de un trabajo junto con la profundidad de la cola
+   */
+  async emitStatus(job, estado, extra = {}) {
+    this.emit('status', {
+      job_id: job.id,
+      ticket_number: job.ticket_number,
+      estado,
+      depth: await this.getDepth(),
+      ...extra
+    });
+  }
+}
+
+module.exports = PrintQueue;
+'''
+
+with open('tito-casino-system/src/main/hardware/print-queue.js', 'w') as f:
+    f.write(print_queue_js)
+
+print_queue_test = '''// tests/unit/print-queue.test.js
+const SQLiteDB = require('../../src/main/database/sqlite');
+const PrintQueue = require('../../src/main/hardware/print-queue');
+
+describe('PrintQueue', () => {
+  let db;
+  let printer;
+  let queue;
+  let events;
+
+  const createTicket = (number) => db.createTicketWithPrintJob(
+    { ticket_number: number, valor: 100, moneda: 'DOP', qr_data: `${number}|100|DOP` },
+    { ticket_number: number, valor: 100, moneda: 'DOP', qr_data: `${number}|100|DOP` }
+  );
+
+  beforeEach(() => {
+    db = new SQLiteDB(':memory:');
+    printer = { printTicketData: jest.fn().mockResolvedValue(true) };
+    queue = new PrintQueue(db, printer, { maxDepth: 3, maxAttempts: 2, retryBaseMs: 10, retryMaxMs: 10 });
+    events = [];
+    queue.on('status', status => events.push(status));
+  });
+
+  afterEach(() => {
+    queue.stop();
+    db.close();
+  });
+
+  test('should create the ticket and its print job atomically', async () => {
+    const { ticket, jobId } = await createTicket('T1');
+    
+    expect(ticket.ticket_number).toBe('T1');
+    expect(db.getNextPrintJob()).toMatchObject({ id: jobId, ticket_number: 'T1', estado: 'pendiente' });
+    
+    await expect(createTicket('T1')).rejects.toThrow('Ticket con número T1 ya existe');
+    await expect(queue.getDepth()).resolves.toBe(1);
+  });
+
+  test('should print jobs in order and report completion', async () => {
+    await createTicket('T1');
+    await createTicket('T2');
+    
+    await queue.start();
+    await queue.idle();
+    
+    expect(printer.printTicketData.mock.calls.map(call => call[0].ticket_number)).toEqual(['T1', 'T2']);
+    expect(events.filter(e => e.estado === 'impreso').map(e => e.ticket_number)).toEqual(['T1', 'T2']);
+    await expect(queue.getDepth()).resolves.toBe(0);
+  });
+
+  test('should retry with backoff and mark the job failed after maxAttempts', async () => {
+    printer.printTicketData.mockRejectedValue(new Error('Sin papel'));
+    await createTicket('T1');
+    
+    await queue.start();
+    await queue.idle();
+    expect(events.pop()).toMatchObject({ estado: 'pendiente', attempts: 1, retryInMs: 10, depth: 1 });
+    
+    await new Promise(resolve => setTimeout(resolve, 20));
+    await queue.idle();
+    expect(events.pop()).toMatchObject({ estado: 'fallido', attempts: 2, error: 'Sin papel', depth: 0 });
+    
+    printer.printTicketData.mockResolvedValue(true);
+    expect(db.retryPrintJob(1)).toBe(true);
+    queue.kick();
+    await queue.idle();
+    expect(events.pop()).toMatchObject({ estado: 'impreso', ticket_number: 'T1' });
+  });
+
+  test('should resume jobs interrupted by a restart', async () => {
+    await createTicket('T1');
+    db.startPrintJob(1); // Cierre de la aplicación durante la impresión
+    
+    await expect(queue.start()).resolves.toBe(1);
+    await queue.idle();
+    
+    expect(printer.printTicketData).toHaveBeenCalledTimes(1);
+    expect(events.pop()).toMatchObject({ estado: 'impreso', attempts: 2 });
+  });
+
+  test('should report when the queue is full', async () => {
+    await createTicket('T1');
+    await createTicket('T2');
+    await expect(queue.isFull()).resolves.toBe(false);
+    
+    await expect(queue.hasRoom(2)).resolves.toBe(false);
+    
+    await createTicket('T3');
+    await expect(queue.isFull()).resolves.toBe(true);
+  });
+});
+'''
+
+with open('tito-casino-system/tests/unit/print-queue.test.js', 'w') as f:
+    f.write(print_queue_test)
+
+os.makedirs('tito-casino-system/tests/integration/helpers', exist_ok=True)
+
+fake_printer_js = '''// tests/integration/helpers/fake-printer.js
+const net = require('net');
+
+/**
+ * Impresora ESC/POS en red simulada (puerto RAW): guarda los bytes de cada conexión
+ */
+class FakePrinter {
+  constructor() {
+    this.jobs = [];
+    this.server = net.createServer((socket) => {
+      const chunks = [];
+      socket.on('data', chunk => chunks.push(chunk));
+      socket.on('end', () => {
+        this.jobs.push(Buffer.concat(chunks));
+        socket.end();
+      });
+    });
+  }
+
+  /**
+   * @returns {Promise<number>} Puerto asignado
+   */
+  start() {
+    return new Promise((resolve) => {
+      this.server.listen(0, '127.0.0.1', () => resolve(this.server.address().port));
+    });
+  }
+
+  stop() {
+    return new Promise(resolve => this.server.close(resolve));
+  }
+}
+
+module.exports = FakePrinter;
+'''
+
+with open('tito-casino-system/tests/integration/helpers/fake-printer.js', 'w') as f:
+    f.write(fake_printer_js)
+
+escpos_printer_test = '''// tests/integration/escpos-printer.test.js
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const FakePrinter = require('./helpers/fake-printer');
+const PrinterService = require('../../src/main/hardware/printer');
+const { encodeTicket } = require('../../src/main/hardware/escpos');
+
+describe('PrinterService backend escpos', () => {
+  const mockTicketData = {
+    ticket_number: 'T1234567890',
+    valor: 534,
+    moneda: 'DOP',
+    fecha_emision: '2025-10-12T08:02:00Z',
+    qr_data: 'T1234567890|534|DOP|2025-10-12T08:02:00Z|abc123',
+    mesa_id: 1
+  };
+
+  let fakePrinter;
+  let port;
+
+  beforeEach(async () => {
+    fakePrinter = new FakePrinter();
+    port = await fakePrinter.start();
+  });
+
+  afterEach(async () => {
+    await fakePrinter.stop();
+  });
+
+  test('should send the ESC/POS stream over TCP without temp files', async () => {
+    const printer = new PrinterService(null, { backend: 'escpos', host: '127.0.0.1', port });
+    const writeSpy = jest.spyOn(fs, 'writeFileSync');
+    
+    const result = await printer.printTicketData(mockTicketData, { casinoName: 'CASINO TEST' });
+    
+    expect(result).toBe(true);
+    expect(fakePrinter.jobs).toHaveLength(1);
+    expect(fakePrinter.jobs[0].equals(encodeTicket(mockTicketData, { casinoName: 'CASINO TEST' }))).toBe(true);
+    expect(writeSpy).not.toHaveBeenCalled();
+    writeSpy.mockRestore();
+  });
+
+  test('should write the stream to a device path', async () => {
+    const devicePath = path.join(os.tmpdir(), `escpos-device-${Date.now()}.bin`);
+    const printer = new PrinterService(null, { backend: 'escpos', devicePath });
+    
+    await printer.printTicketData(mockTicketData);
+    
+    expect(fs.readFileSync(devicePath).includes('T1234567890')).toBe(true);
+    fs.unlinkSync(devicePath);
+  });
+
+  test('should report availability and connection errors', async () => {
+    const printer = new PrinterService(null, { backend: 'escpos', host: '127.0.0.1', port });
+    expect(await printer.isPrinterAvailable()).toBe(true);
+    
+    await fakePrinter.stop();
+    fakePrinter = new FakePrinter();
+    await fakePrinter.start();
+    
+    expect(await printer.isPrinterAvailable()).toBe(false);
+    await expect(printer.printTicketData(mockTicketData)).rejects.toThrow('Error imprimiendo ticket');
+  });
+});
+'''
+
+with open('tito-casino-system/tests/integration/escpos-printer.test.js', 'w') as f:
+    f.write(escpos_printer_test)
+
 print("✅ Servicio de impresión creado")
\ No newline at end of file
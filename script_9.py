@@ -4,6 +4,9 @@ import os
 qr_reader_service_js = '''// src/main/hardware/qr-reader.js
 const HID = require('node-hid');
 const EventEmitter = require('events');
+const HIDScanFramer = require('./hid-framer');
+const ScanDedupCache = require('../utils/scan-dedup');
+const { isTitoQrString } = require('../../shared/qr-format');
 
 /**
  * Servicio para manejar el lector de códigos QR
@@ -16,17 +19,33 @@ class QRReaderService extends EventEmitter {
     this.productId = options.productId || null;
     this.device = null;
     this.isConnected = false;
-    this.buffer = '';
-    this.lastScanTime = 0;
-    this.scanCooldown = 1000; // 1 segundo entre escaneos
     
     // Configuración del lector
     this.config = {
       timeout: options.timeout || 5000,
-      encoding: options.encoding || 'ascii',
+      reportFormat: options.reportFormat || 'keyboard', // 'keyboard' (keycodes HID) | 'ascii'
+      interByteTimeoutMs: options.interByteTimeoutMs || 50,
       minLength: options.minLength || 10,
-      maxLength: options.maxLength || 500
+      maxLength: options.maxLength || 500,
+      dedupWindowMs: options.dedupWindowMs || 3000,  // Mismo QR dentro de la ventana: se ignora
+      dedupMaxEntries: options.dedupMaxEntries || 256
     };
+    
+    this.dedup = new ScanDedupCache({
+      windowMs: this.config.dedupWindowMs,
+      maxEntries: this.config.dedupMaxEntries
+    });
+    
+    // Los marcos se arman en un buffer circular; el patrón TITO se evalúa una vez por marco
+    this.framer = new HIDScanFramer({
+      capacity: this.config.maxLength,
+      reportFormat: this.config.reportFormat,
+      interByteTimeoutMs: this.config.interByteTimeoutMs
+    });
+    this.framer.on('frame', (frame) => this.handleFrame(frame));
+    this.framer.on('discard', (event) => {
+      console.warn(`Escaneo descartado (${event.reason})`);
+    });
   }
 
   /**
@@ -141,37 +160,39 @@ class QRReaderService extends EventEmitter {
 
   /**
    * Maneja datos recibidos del dispositivo HID
-   * @param {Buffer} data - Datos recibidos
+   * @param {Buffer} data - Reporte recibido
    */
   handleHIDData(data) {
     try {
-      const text = data.toString(this.config.encoding).trim();
-      
-      if (text) {
-        this.buffer += text;
-        
-        // Verificar si tenemos un escaneo completo
-        if (this.isCompleteScan(this.buffer)) {
-          this.processScan(this.buffer);
-          this.buffer = '';
-        }
-      }
-      
+      this.framer.push(data);
     } catch (error) {
       console.error('Error procesando datos HID:', error.message);
     }
   }
 
+  /**
+   * Maneja un marco completo (fin de línea o silencio entre bytes)
+   * @param {Object} frame - { data, length, terminatedBy, latencyMs }
+   */
+  handleFrame(frame) {
+    if (!this.isCompleteScan(frame.data)) {
+      console.warn(`Escaneo ignorado: no es un código TITO (${frame.length} caracteres)`);
+      return;
+    }
+    
+    this.processScan(frame.data, frame.latencyMs);
+  }
+
   /**
    * Verifica si un escaneo está completo
    * @param {string} data - Datos del buffer
    * @returns {boolean} True si está completo
    */
   isCompleteScan(data) {
-    // Para códigos QR TITO, buscar el patrón: T[...]|[...]|[...]|[...]|[...]
-    const titoPattern = /^T[A-Z0-9]+\\|[0-9.]+\\|[A-Z]{3}\\|[0-9T:-]+\\|[a-f0-9]+$/;
+    // Códigos QR TITO: formato compacto (TC1 + base45) o legacy (T...|...|...|...|hash)
+    const isTito = isTitoQrString(data);
     
-    return titoPattern.test(data) && 
+    return isTito && 
            data.length >= this.config.minLength && 
            data.length <= this.config.maxLength;
   }
@@ -179,22 +200,22 @@ class QRReaderService extends EventEmitter {
   /**
    * Procesa un escaneo completo
    * @param {string} scanData - Datos escaneados
+   * @param {number} latencyMs - Primer byte a marco completo (null si no aplica)
    */
-  processScan(scanData) {
-    const now = Date.now();
-    
-    // Verificar cooldown para evitar escaneos duplicados
-    if (now - this.lastScanTime < this.scanCooldown) {
+  processScan(scanData, latencyMs = null) {
+    // Relecturas del mismo QR (ticket frente al lector); QRs distintos pasan sin espera
+    if (this.dedup.isDuplicate(scanData)) {
       return;
     }
     
-    this.lastScanTime = now;
+    const now = Date.now();
     
     // Emitir evento de escaneo
     this.emit('scan', {
       data: scanData,
       timestamp: now,
-      source: 'hid'
+      source: 'hid',
+      latencyMs
     });
     
     console.log('QR escaneado:', scanData);
@@ -259,7 +280,8 @@ class QRReaderService extends EventEmitter {
       productId: this.productId,
       isConnected: this.isConnected,
       mode: this.device ? 'hid' : 'keyboard',
-      config: this.config
+      config: this.config,
+      metrics: { ...this.framer.getMetrics(), ...this.dedup.getStats() }
     };
   }
 
@@ -300,6 +322,9 @@ class QRReaderService extends EventEmitter {
    */
   configure(newConfig) {
     this.config = { ...this.config, ...newConfig };
+    this.framer.configure(this.config);
+    this.dedup.windowMs = this.config.dedupWindowMs;
+    this.dedup.maxEntries = this.config.dedupMaxEntries;
     console.log('Configuración del lector QR actualizada:', this.config);
   }
 
@@ -313,6 +338,8 @@ class QRReaderService extends EventEmitter {
         this.device = null;
       }
       
+      this.framer.reset();
+      
       this.isConnected = false;
       this.emit('disconnected');
       console.log('Lector QR desconectado');
@@ -338,4 +365,692 @@ module.exports = QRReaderService;
 with open('tito-casino-system/src/main/hardware/qr-reader.js', 'w') as f:
     f.write(qr_reader_service_js)
 
+# Deduplicación de escaneos por contenido
+scan_dedup_js = '''// src/main/utils/scan-dedup.js
+const crypto = require('crypto');
+
+/**
+ * Caché de escaneos por contenido. Reemplaza el cooldown global del lector:
+ * - isDuplicate(): el mismo QR leído otra vez dentro de la ventana se descarta,
+ *   mientras que QRs distintos pasan sin espera.
+ * - run(): lecturas simultáneas del mismo QR comparten la validación en curso.
+ * Las claves son hashes del contenido; el tamaño está acotado (se descartan los más antiguos).
+ */
+class ScanDedupCache {
+  /**
+   * @param {Object} options - { windowMs, maxEntries, now }
+   */
+  constructor(options = {}) {
+    this.windowMs = options.windowMs || 3000;
+    this.maxEntries = options.maxEntries || 256;
+    this.now = options.now || Date.now;
+
+    this.seen = new Map();      // clave -> último escaneo (ms)
+    this.inFlight = new Map();  // clave -> Promise
+    this.stats = { duplicates: 0, coalesced: 0 };
+  }
+
+  /**
+   * Clave del contenido de un escaneo
+   * @param {string} payload - Contenido del QR
+   * @returns {string} Hash SHA-256 truncado (base64)
+   */
+  key(payload) {
+    return crypto.createHash('sha256').update(payload).digest('base64').slice(0, 22);
+  }
+
+  /**
+   * Registra un escaneo e indica si repite uno reciente. Cada repetición
+   * renueva la ventana: un ticket que sigue frente al lector no se reprocesa.
+   * @param {string} payload - Contenido del QR
+   * @returns {boolean} True si el mismo contenido se leyó dentro de la ventana
+   */
+  isDuplicate(payload) {
+    const key = this.key(payload);
+    const now = this.now();
+    const lastSeen = this.seen.get(key);
+
+    // Reinsertar para mantener el orden de la Map por último uso
+    this.seen.delete(key);
+    this.seen.set(key, now);
+    this.evict(now);
+
+    if (lastSeen !== undefined && now - lastSeen < this.windowMs) {
+      this.stats.duplicates++;
+      return true;
+    }
+
+    return false;
+  }
+
+  /**
+   * Ejecuta una tarea por contenido; si ya hay una en curso para el mismo QR, devuelve esa
+   * @param {string} payload - Contenido del QR
+   * @param {Function} task - Función que devuelve una Promise
+   * @returns {Promise} Resultado de la tarea (compartido entre lecturas simultáneas)
+   */
+  run(payload, task) {
+    const key = this.key(payload);
+    const pending = this.inFlight.get(key);
+    if (pending) {
+      this.stats.coalesced++;
+      return pending;
+    }
+
+    const promise = Promise.resolve()
+      .then(task)
+      .finally(() => this.inFlight.delete(key));
+
+    this.inFlight.set(key, promise);
+    return promise;
+  }
+
+  /**
+   * Descarta entradas vencidas y, si hace falta, las más antiguas
+   */
+  evict(now) {
+    for (const [key, lastSeen] of this.seen) {
+      if (this.seen.size <= this.maxEntries && now - lastSeen < this.windowMs) break;
+      this.seen.delete(key);
+    }
+  }
+
+  /**
+   * Olvida todos los escaneos registrados
+   */
+  clear() {
+    this.seen.clear();
+  }
+
+  getStats() {
+    return {
+      ...this.stats,
+      entries: this.seen.size,
+      inFlight: this.inFlight.size
+    };
+  }
+}
+
+module.exports = ScanDedupCache;
+'''
+
+with open('tito-casino-system/src/main/utils/scan-dedup.js', 'w') as f:
+    f.write(scan_dedup_js)
+
+scan_dedup_test = '''// tests/unit/scan-dedup.test.js
+const ScanDedupCache = require('../../src/main/utils/scan-dedup');
+
+describe('ScanDedupCache', () => {
+  let clock;
+  let cache;
+
+  beforeEach(() => {
+    clock = 0;
+    cache = new ScanDedupCache({ windowMs: 2000, maxEntries: 3, now: () => clock });
+  });
+
+  test('should let distinct tickets through back to back', () => {
+    expect(cache.isDuplicate('TC1AAA')).toBe(false);
+    expect(cache.isDuplicate('TC1BBB')).toBe(false);
+    expect(cache.isDuplicate('TC1CCC')).toBe(false);
+  });
+
+  test('should drop repeats of the same ticket within the window', () => {
+    expect(cache.isDuplicate('TC1AAA')).toBe(false);
+    clock = 1100;
+    expect(cache.isDuplicate('TC1AAA')).toBe(true);
+    expect(cache.getStats().duplicates).toBe(1);
+  });
+
+  test('should renew the window while the ticket keeps being read', () => {
+    cache.isDuplicate('TC1AAA');
+    clock = 1500;
+    cache.isDuplicate('TC1AAA');
+    clock = 3000;
+    expect(cache.isDuplicate('TC1AAA')).toBe(true);
+    clock = 5001;
+    expect(cache.isDuplicate('TC1AAA')).toBe(false);
+  });
+
+  test('should keep at most maxEntries payloads', () => {
+    ['TC1AAA', 'TC1BBB', 'TC1CCC', 'TC1DDD'].forEach(payload => cache.isDuplicate(payload));
+
+    expect(cache.getStats().entries).toBe(3);
+    expect(cache.isDuplicate('TC1AAA')).toBe(false);
+    expect(cache.isDuplicate('TC1DDD')).toBe(true);
+  });
+
+  test('should coalesce concurrent runs of the same payload', async () => {
+    let release;
+    const task = jest.fn(() => new Promise(resolve => { release = resolve; }));
+
+    const first = cache.run('TC1AAA', task);
+    const second = cache.run('TC1AAA', task);
+    await Promise.resolve();
+    release({ success: true });
+
+    await expect(first).resolves.toEqual({ success: true });
+    await expect(second).resolves.toEqual({ success: true });
+    expect(task).toHaveBeenCalledTimes(1);
+    expect(cache.getStats()).toMatchObject({ coalesced: 1, inFlight: 0 });
+  });
+
+  test('should run again once the previous run settled', async () => {
+    const task = jest.fn()
+      .mockRejectedValueOnce(new Error('falla'))
+      .mockResolvedValueOnce('ok');
+
+    await expect(cache.run('TC1AAA', task)).rejects.toThrow('falla');
+    await expect(cache.run('TC1AAA', task)).resolves.toBe('ok');
+    expect(task).toHaveBeenCalledTimes(2);
+  });
+});
+'''
+
+with open('tito-casino-system/tests/unit/scan-dedup.test.js', 'w') as f:
+    f.write(scan_dedup_test)
+
+# Armado de escaneos HID (buffer circular + decodificación de keycodes)
+hid_framer_js = '''// src/main/hardware/hid-framer.js
+const EventEmitter = require('events');
+const { performance } = require('perf_hooks');
+
+// Teclado HID (usage page 0x07): keycode -> carácter sin y con Shift
+const KEYCODES = {};
+'abcdefghijklmnopqrstuvwxyz'.split('').forEach((char, i) => {
+  KEYCODES[0x04 + i] = [char, char.toUpperCase()];
+});
+'1234567890'.split('').forEach((char, i) => {
+  KEYCODES[0x1E + i] = [char, '!@#$%^&*()'[i]];
+});
+Object.assign(KEYCODES, {
+  0x28: ['\\r', '\\r'],   // Enter
+  0x2B: ['\\t', '\\t'],   // Tab
+  0x2C: [' ', ' '],
+  0x2D: ['-', '_'],
+  0x2E: ['=', '+'],
+  0x2F: ['[', '{'],
+  0x30: [']', '}'],
+  0x31: ['\\\\', '|'],
+  0x33: [';', ':'],
+  0x34: ['\\'', '"'],
+  0x35: ['`', '~'],
+  0x36: [',', '<'],
+  0x37: ['.', '>'],
+  0x38: ['/', '?'],
+  0x58: ['\\r', '\\r']    // Enter del teclado numérico
+});
+
+const SHIFT_MASK = 0x22;       // Shift izquierdo o derecho
+const ERROR_ROLLOVER = 0x01;   // Demasiadas teclas a la vez: el reporte no es fiable
+const BOOT_REPORT_LENGTH = 8;
+const TERMINATORS = new Set([0x0D, 0x0A, 0x09]);
+
+/**
+ * Arma escaneos a partir de reportes HID. Los caracteres se guardan en un
+ * buffer circular de tamaño fijo y se decodifican una sola vez por marco;
+ * un marco termina con Enter/Tab o tras un silencio entre bytes.
+ *
+ * Eventos:
+ *   'frame'   { data, length, terminatedBy, latencyMs } (terminatedBy: 'terminator' | 'timeout')
+ *   'discard' { reason, length } (reason: 'overflow')
+ */
+class HIDScanFramer extends EventEmitter {
+  /**
+   * @param {Object} options - { capacity, interByteTimeoutMs, reportFormat, now }
+   *   reportFormat: 'keyboard' (reportes boot de teclado) | 'ascii' (bytes de texto)
+   */
+  constructor(options = {}) {
+    super();
+
+    this.capacity = options.capacity || 512;
+    this.ring = new Uint8Array(this.capacity);
+    this.head = 0;
+    this.length = 0;
+    this.overflowed = false;
+    this.previousKeys = [];
+
+    this.now = options.now || (() => performance.now());
+    this.timer = null;
+    this.firstByteAt = 0;
+    this.lastByteAt = 0;
+
+    this.configure(options);
+    this.resetMetrics();
+  }
+
+  /**
+   * Actualiza la configuración del armado de marcos
+   * @param {Object} options - { interByteTimeoutMs, reportFormat }
+   */
+  configure(options = {}) {
+    this.interByteTimeoutMs = options.interByteTimeoutMs || this.interByteTimeoutMs || 50;
+    this.reportFormat = options.reportFormat || this.reportFormat || 'keyboard';
+  }
+
+  /**
+   * Procesa un reporte HID
+   * @param {Buffer|Uint8Array} report - Datos recibidos del dispositivo
+   */
+  push(report) {
+    if (this.reportFormat === 'ascii') {
+      for (let i = 0; i < report.length; i++) {
+        if (report[i] !== 0) {
+          this.pushByte(report[i]);
+        }
+      }
+      return;
+    }
+
+    this.pushKeyboardReport(report);
+  }
+
+  /**
+   * Decodifica un reporte de teclado: solo cuentan las teclas que no estaban
+   * presionadas en el reporte anterior (una tecla mantenida no se repite)
+   */
+  pushKeyboardReport(report) {
+    // Reportes con ID (9 bytes): el primer byte es el ID
+    const offset = report.length > BOOT_REPORT_LENGTH ? report.length - BOOT_REPORT_LENGTH : 0;
+    const modifiers = report[offset];
+    const keys = [];
+
+    for (let i = offset + 2; i < report.length; i++) {
+      if (report[i] === ERROR_ROLLOVER) {
+        return;
+      }
+      if (report[i] !== 0) {
+        keys.push(report[i]);
+      }
+    }
+
+    const shifted = (modifiers & SHIFT_MASK) ? 1 : 0;
+    for (const keycode of keys) {
+      if (this.previousKeys.includes(keycode)) continue;
+
+      const chars = KEYCODES[keycode];
+      if (chars) {
+        this.pushByte(chars[shifted].charCodeAt(0));
+      }
+    }
+
+    this.previousKeys = keys;
+  }
+
+  /**
+   * Agrega un carácter al marco actual
+   * @param {number} byte - Código del carácter
+   */
+  pushByte(byte) {
+    const now = this.now();
+
+    // Silencio ya vencido (el timer pudo atrasarse): cerrar el marco anterior primero
+    if ((this.length > 0 || this.overflowed) && now - this.lastByteAt >= this.interByteTimeoutMs) {
+      this.completeFrame('timeout', this.lastByteAt + this.interByteTimeoutMs);
+    }
+
+    if (TERMINATORS.has(byte)) {
+      this.completeFrame('terminator', now);
+      return;
+    }
+
+    if (this.length === 0 && !this.overflowed) {
+      this.firstByteAt = now;
+    }
+    this.lastByteAt = now;
+
+    if (this.length === this.capacity) {
+      // Marco más largo que el buffer: se descarta entero hasta el próximo fin de marco
+      if (!this.overflowed) {
+        this.metrics.overflows++;
+        this.emit('discard', { reason: 'overflow', length: this.length });
+      }
+      this.overflowed = true;
+      this.head = (this.head + this.length) % this.capacity;
+      this.length = 0;
+    }
+
+    if (!this.overflowed) {
+      this.ring[(this.head + this.length) % this.capacity] = byte;
+      this.length++;
+    }
+
+    this.scheduleTimeout();
+  }
+
+  /**
+   * Programa el cierre del marco por silencio (un solo timer por marco)
+   */
+  scheduleTimeout() {
+    if (this.timer) return;
+
+    const check = () => {
+      const idle = this.now() - this.lastByteAt;
+      if (idle >= this.interByteTimeoutMs) {
+        this.timer = null;
+        this.completeFrame('timeout', this.now());
+      } else {
+        this.timer = setTimeout(check, this.interByteTimeoutMs - idle);
+      }
+    };
+
+    this.timer = setTimeout(check, this.interByteTimeoutMs);
+  }
+
+  /**
+   * Cierra el marco actual y lo emite (si no está vacío ni desbordado)
+   * @param {string} terminatedBy - 'terminator' | 'timeout'
+   * @param {number} now - Instante de cierre
+   */
+  completeFrame(terminatedBy, now) {
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+
+    const length = this.length;
+    const data = this.readFrame();
+    this.head = (this.head + length) % this.capacity;
+    this.length = 0;
+
+    if (this.overflowed) {
+      this.overflowed = false;
+      return;
+    }
+
+    if (length === 0) {
+      return;
+    }
+
+    const latencyMs = now - this.firstByteAt;
+    this.metrics.frames++;
+    if (terminatedBy === 'timeout') this.metrics.timeouts++;
+    this.metrics.lastLatencyMs = latencyMs;
+    this.metrics.maxLatencyMs = Math.max(this.metrics.maxLatencyMs, latencyMs);
+    this.metrics.totalLatencyMs += latencyMs;
+
+    this.emit('frame', { data, length, terminatedBy, latencyMs });
+  }
+
+  /**
+   * Decodifica el contenido del buffer circular (sin copiar a otro buffer)
+   * @returns {string} Marco como texto
+   */
+  readFrame() {
+    const end = this.head + this.length;
+    if (end <= this.capacity) {
+      return String.fromCharCode.apply(null, this.ring.subarray(this.head, end));
+    }
+
+    return String.fromCharCode.apply(null, this.ring.subarray(this.head)) +
+      String.fromCharCode.apply(null, this.ring.subarray(0, end - this.capacity));
+  }
+
+  /**
+   * Métricas de escaneo (latencia: primer byte a marco completo, en ms)
+   * @returns {Object} { frames, timeouts, overflows, lastLatencyMs, maxLatencyMs, avgLatencyMs }
+   */
+  getMetrics() {
+    const { frames, timeouts, overflows, lastLatencyMs, maxLatencyMs, totalLatencyMs } = this.metrics;
+    return {
+      frames,
+      timeouts,
+      overflows,
+      lastLatencyMs,
+      maxLatencyMs,
+      avgLatencyMs: frames > 0 ? totalLatencyMs / frames : null
+    };
+  }
+
+  resetMetrics() {
+    this.metrics = {
+      frames: 0,
+      timeouts: 0,
+      overflows: 0,
+      lastLatencyMs: null,
+      maxLatencyMs: 0,
+      totalLatencyMs: 0
+    };
+  }
+
+  /**
+   * Descarta el marco en curso
+   */
+  reset() {
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+    this.head = 0;
+    this.length = 0;
+    this.overflowed = false;
+    this.previousKeys = [];
+  }
+}
+
+module.exports = HIDScanFramer;
+'''
+
+with open('tito-casino-system/src/main/hardware/hid-framer.js', 'w') as f:
+    f.write(hid_framer_js)
+
+os.makedirs('tito-casino-system/tests/fixtures', exist_ok=True)
+
+hid_reports_fixture = '''// tests/fixtures/hid-reports.js
+// Reportes HID de teclado (boot protocol, 8 bytes) de escaneos de referencia:
+// [ms desde el primer reporte, reporte en hexadecimal]. Cada carácter llega como
+// tecla presionada (modificador, 0, keycode...) seguida del reporte de tecla liberada.
+
+module.exports = {
+  // QR compacto con sufijo Enter (0x28)
+  compactWithEnter: {
+    expected: 'TC1S34310H00000+GQ*BD 8CNH42VC4XBYX0',
+    reports: [
+      [0, '0200170000000000'], [1, '0000000000000000'], [2, '0200060000000000'], [3, '0000000000000000'],
+      [4, '00001e0000000000'], [5, '0000000000000000'], [6, '0200160000000000'], [7, '0000000000000000'],
+      [8, '0000200000000000'], [9, '0000000000000000'], [10, '0000210000000000'], [11, '0000000000000000'],
+      [12, '0000200000000000'], [13, '0000000000000000'], [14, '00001e0000000000'], [15, '0000000000000000'],
+      [16, '0000270000000000'], [17, '0000000000000000'], [18, '02000b0000000000'], [19, '0000000000000000'],
+      [20, '0000270000000000'], [21, '0000000000000000'], [22, '0000270000000000'], [23, '0000000000000000'],
+      [24, '0000270000000000'], [25, '0000000000000000'], [26, '0000270000000000'], [27, '0000000000000000'],
+      [28, '0000270000000000'], [29, '0000000000000000'], [30, '02002e0000000000'], [31, '0000000000000000'],
+      [32, '02000a0000000000'], [33, '0000000000000000'], [34, '0200140000000000'], [35, '0000000000000000'],
+      [36, '0200250000000000'], [37, '0000000000000000'], [38, '0200050000000000'], [39, '0000000000000000'],
+      [40, '0200070000000000'], [41, '0000000000000000'], [42, '00002c0000000000'], [43, '0000000000000000'],
+      [44, '0000250000000000'], [45, '0000000000000000'], [46, '0200060000000000'], [47, '0000000000000000'],
+      [48, '0200110000000000'], [49, '0000000000000000'], [50, '02000b0000000000'], [51, '0000000000000000'],
+      [52, '0000210000000000'], [53, '0000000000000000'], [54, '00001f0000000000'], [55, '0000000000000000'],
+      [56, '0200190000000000'], [57, '0000000000000000'], [58, '0200060000000000'], [59, '0000000000000000'],
+      [60, '0000210000000000'], [61, '0000000000000000'], [62, '02001b0000000000'], [63, '0000000000000000'],
+      [64, '0200050000000000'], [65, '0000000000000000'], [66, '02001c0000000000'], [67, '0000000000000000'],
+      [68, '02001b0000000000'], [69, '0000000000000000'], [70, '0000270000000000'], [71, '0000000000000000'],
+      [72, '0000280000000000'], [73, '0000000000000000']
+    ]
+  },
+
+  // QR legacy sin sufijo: el marco se cierra por tiempo entre bytes
+  legacyWithoutSuffix: {
+    expected: 'T08W03000HP|534.1|USD|2025-10-12T08:02:00.123Z|14fbcaa293c615e5',
+    reports: [
+      [0, '0200170000000000'], [1, '0000000000000000'], [2, '0000270000000000'], [3, '0000000000000000'],
+      [4, '0000250000000000'], [5, '0000000000000000'], [6, '02001a0000000000'], [7, '0000000000000000'],
+      [8, '0000270000000000'], [9, '0000000000000000'], [10, '0000200000000000'], [11, '0000000000000000'],
+      [12, '0000270000000000'], [13, '0000000000000000'], [14, '0000270000000000'], [15, '0000000000000000'],
+      [16, '0000270000000000'], [17, '0000000000000000'], [18, '02000b0000000000'], [19, '0000000000000000'],
+      [20, '0200130000000000'], [21, '0000000000000000'], [22, '0200310000000000'], [23, '0000000000000000'],
+      [24, '0000220000000000'], [25, '0000000000000000'], [26, '0000200000000000'], [27, '0000000000000000'],
+      [28, '0000210000000000'], [29, '0000000000000000'], [30, '0000370000000000'], [31, '0000000000000000'],
+      [32, '00001e0000000000'], [33, '0000000000000000'], [34, '0200310000000000'], [35, '0000000000000000'],
+      [36, '0200180000000000'], [37, '0000000000000000'], [38, '0200160000000000'], [39, '0000000000000000'],
+      [40, '0200070000000000'], [41, '0000000000000000'], [42, '0200310000000000'], [43, '0000000000000000'],
+      [44, '00001f0000000000'], [45, '0000000000000000'], [46, '0000270000000000'], [47, '0000000000000000'],
+      [48, '00001f0000000000'], [49, '0000000000000000'], [50, '0000220000000000'], [51, '0000000000000000'],
+      [52, '00002d0000000000'], [53, '0000000000000000'], [54, '00001e0000000000'], [55, '0000000000000000'],
+      [56, '0000270000000000'], [57, '0000000000000000'], [58, '00002d0000000000'], [59, '0000000000000000'],
+      [60, '00001e0000000000'], [61, '0000000000000000'], [62, '00001f0000000000'], [63, '0000000000000000'],
+      [64, '0200170000000000'], [65, '0000000000000000'], [66, '0000270000000000'], [67, '0000000000000000'],
+      [68, '0000250000000000'], [69, '0000000000000000'], [70, '0200330000000000'], [71, '0000000000000000'],
+      [72, '0000270000000000'], [73, '0000000000000000'], [74, '00001f0000000000'], [75, '0000000000000000'],
+      [76, '0200330000000000'], [77, '0000000000000000'], [78, '0000270000000000'], [79, '0000000000000000'],
+      [80, '0000270000000000'], [81, '0000000000000000'], [82, '0000370000000000'], [83, '0000000000000000'],
+      [84, '00001e0000000000'], [85, '0000000000000000'], [86, '00001f0000000000'], [87, '0000000000000000'],
+      [88, '0000200000000000'], [89, '0000000000000000'], [90, '02001d0000000000'], [91, '0000000000000000'],
+      [92, '0200310000000000'], [93, '0000000000000000'], [94, '00001e0000000000'], [95, '0000000000000000'],
+      [96, '0000210000000000'], [97, '0000000000000000'], [98, '0000090000000000'], [99, '0000000000000000'],
+      [100, '0000050000000000'], [101, '0000000000000000'], [102, '0000060000000000'], [103, '0000000000000000'],
+      [104, '0000040000000000'], [105, '0000000000000000'], [106, '0000040000000000'], [107, '0000000000000000'],
+      [108, '00001f0000000000'], [109, '0000000000000000'], [110, '0000260000000000'], [111, '0000000000000000'],
+      [112, '0000200000000000'], [113, '0000000000000000'], [114, '0000060000000000'], [115, '0000000000000000'],
+      [116, '0000230000000000'], [117, '0000000000000000'], [118, '00001e0000000000'], [119, '0000000000000000'],
+      [120, '0000220000000000'], [121, '0000000000000000'], [122, '0000080000000000'], [123, '0000000000000000'],
+      [124, '0000220000000000'], [125, '0000000000000000']
+    ]
+  },
+
+  // Lectura cortada (200 ms de silencio) seguida de un escaneo completo
+  truncatedThenComplete: {
+    expected: ['TC1S343', 'TC1S34310H00000+GQ*BD 8CNH42VC4XBYX0'],
+    reports: [
+      [0, '0200170000000000'], [1, '0000000000000000'], [2, '0200060000000000'], [3, '0000000000000000'],
+      [4, '00001e0000000000'], [5, '0000000000000000'], [6, '0200160000000000'], [7, '0000000000000000'],
+      [8, '0000200000000000'], [9, '0000000000000000'], [10, '0000210000000000'], [11, '0000000000000000'],
+      [12, '0000200000000000'], [13, '0000000000000000'], [214, '0200170000000000'], [215, '0000000000000000'],
+      [216, '0200060000000000'], [217, '0000000000000000'], [218, '00001e0000000000'], [219, '0000000000000000'],
+      [220, '0200160000000000'], [221, '0000000000000000'], [222, '0000200000000000'], [223, '0000000000000000'],
+      [224, '0000210000000000'], [225, '0000000000000000'], [226, '0000200000000000'], [227, '0000000000000000'],
+      [228, '00001e0000000000'], [229, '0000000000000000'], [230, '0000270000000000'], [231, '0000000000000000'],
+      [232, '02000b0000000000'], [233, '0000000000000000'], [234, '0000270000000000'], [235, '0000000000000000'],
+      [236, '0000270000000000'], [237, '0000000000000000'], [238, '0000270000000000'], [239, '0000000000000000'],
+      [240, '0000270000000000'], [241, '0000000000000000'], [242, '0000270000000000'], [243, '0000000000000000'],
+      [244, '02002e0000000000'], [245, '0000000000000000'], [246, '02000a0000000000'], [247, '0000000000000000'],
+      [248, '0200140000000000'], [249, '0000000000000000'], [250, '0200250000000000'], [251, '0000000000000000'],
+      [252, '0200050000000000'], [253, '0000000000000000'], [254, '0200070000000000'], [255, '0000000000000000'],
+      [256, '00002c0000000000'], [257, '0000000000000000'], [258, '0000250000000000'], [259, '0000000000000000'],
+      [260, '0200060000000000'], [261, '0000000000000000'], [262, '0200110000000000'], [263, '0000000000000000'],
+      [264, '02000b0000000000'], [265, '0000000000000000'], [266, '0000210000000000'], [267, '0000000000000000'],
+      [268, '00001f0000000000'], [269, '0000000000000000'], [270, '0200190000000000'], [271, '0000000000000000'],
+      [272, '0200060000000000'], [273, '0000000000000000'], [274, '0000210000000000'], [275, '0000000000000000'],
+      [276, '02001b0000000000'], [277, '0000000000000000'], [278, '0200050000000000'], [279, '0000000000000000'],
+      [280, '02001c0000000000'], [281, '0000000000000000'], [282, '02001b0000000000'], [283, '0000000000000000'],
+      [284, '0000270000000000'], [285, '0000000000000000'], [286, '0000280000000000'], [287, '0000000000000000']
+    ]
+  },
+
+  // Rollover: dos teclas en el mismo reporte, carácter repetido y reporte con ID (9 bytes)
+  rollover: {
+    expected: 'ab00A',
+    reports: [
+      [0, '0000040000000000'], [1, '0000040500000000'], [2, '0000050000000000'], [3, '0000000000000000'],
+      [4, '0000270000000000'], [5, '0000000000000000'], [6, '0000270000000000'], [7, '0000000000000000'],
+      [8, '010200040000000000'], [9, '010000000000000000'], [10, '0000280000000000'], [11, '0000000000000000']
+    ]
+  }
+};
+'''
+
+with open('tito-casino-system/tests/fixtures/hid-reports.js', 'w') as f:
+    f.write(hid_reports_fixture)
+
+hid_framer_test = '''// tests/unit/hid-framer.test.js
+const HIDScanFramer = require('../../src/main/hardware/hid-framer');
+const fixtures = require('../fixtures/hid-reports');
+
+describe('HIDScanFramer', () => {
+  let framer;
+  let frames;
+
+  /**
+   * Reproduce reportes en su tiempo relativo (ms), avanzando el reloj y los timers
+   */
+  function replay(reports, start = Date.now()) {
+    for (const [t, hex] of reports) {
+      jest.advanceTimersByTime(start + t - Date.now());
+      framer.push(Buffer.from(hex, 'hex'));
+    }
+  }
+
+  beforeEach(() => {
+    jest.useFakeTimers();
+    jest.setSystemTime(0);
+    frames = [];
+    framer = new HIDScanFramer({ now: () => Date.now(), interByteTimeoutMs: 50 });
+    framer.on('frame', frame => frames.push(frame));
+  });
+
+  afterEach(() => {
+    framer.reset();
+    jest.useRealTimers();
+  });
+
+  test('should decode keyboard reports and close the frame on Enter', () => {
+    replay(fixtures.compactWithEnter.reports);
+
+    expect(frames).toHaveLength(1);
+    expect(frames[0]).toMatchObject({
+      data: fixtures.compactWithEnter.expected,
+      terminatedBy: 'terminator',
+      latencyMs: 72
+    });
+  });
+
+  test('should close a frame without suffix after the inter-byte timeout', () => {
+    replay(fixtures.legacyWithoutSuffix.reports);
+    expect(frames).toHaveLength(0);
+
+    // Último carácter en t=124: el marco cierra en t=174
+    jest.advanceTimersByTime(48);
+    expect(frames).toHaveLength(0);
+
+    jest.advanceTimersByTime(1);
+    expect(frames).toHaveLength(1);
+    expect(frames[0].data).toBe(fixtures.legacyWithoutSuffix.expected);
+    expect(frames[0].terminatedBy).toBe('timeout');
+    expect(frames[0].latencyMs).toBe(174);
+  });
+
+  test('should not glue a truncated read to the next scan', () => {
+    replay(fixtures.truncatedThenComplete.reports);
+
+    expect(frames.map(frame => frame.data)).toEqual(fixtures.truncatedThenComplete.expected);
+    expect(frames.map(frame => frame.terminatedBy)).toEqual(['timeout', 'terminator']);
+  });
+
+  test('should handle rollover, repeated keys and report IDs', () => {
+    replay(fixtures.rollover.reports);
+
+    expect(frames.map(frame => frame.data)).toEqual([fixtures.rollover.expected]);
+  });
+
+  test('should discard frames longer than the ring buffer and recover', () => {
+    const small = new HIDScanFramer({ capacity: 8, reportFormat: 'ascii' });
+    const events = [];
+    small.on('frame', frame => events.push(frame.data));
+    small.on('discard', event => events.push(event.reason));
+
+    small.push(Buffer.from('0123456789ABC\\r'));
+    small.push(Buffer.from('abc\\rdefghij\\r'));
+
+    expect(events).toEqual(['overflow', 'abc', 'defghij']);
+    expect(small.getMetrics()).toMatchObject({ frames: 2, overflows: 1 });
+  });
+
+  test('should report scan latency metrics', () => {
+    replay(fixtures.compactWithEnter.reports);
+    replay(fixtures.rollover.reports, Date.now() + 1000);
+
+    expect(framer.getMetrics()).toEqual({
+      frames: 2,
+      timeouts: 0,
+      overflows: 0,
+      lastLatencyMs: 10,
+      maxLatencyMs: 72,
+      avgLatencyMs: 41
+    });
+  });
+});
+'''
+
+with open('tito-casino-system/tests/unit/hid-framer.test.js', 'w') as f:
+    f.write(hid_framer_test)
+
 print("✅ Servicio de lector QR creado")
\ No newline at end of file